@@ -7,15 +7,31 @@
  *
  * Serial protocol (9600 baud):
  *   MOVE,s1,s2,s3,s4,speed\n  — move servos to target angles at given speed
+ *   MOVESEQ,speed,n\n          — upload n waypoints (max MAX_SEQ_STEPS), one per
+ *     s1,s2,s3,s4,hold_ms\n    line, then run them back to back
+ *   STOP\n                     — abort a running MOVESEQ after the current step
+ *   TELEM,period_ms\n          — push POS frames every period_ms while moving (0 = off)
  *   READ\n                     — report current servo angles
  *   PING\n                     — health check
  *
  * Responses:
  *   READY\n                    — sent on boot
- *   ACK,a1,a2,a3,a4\n         — current angles (after MOVE or READ)
+ *   ACK,a1,a2,a3,a4\n         — current angles (after MOVE, MOVESEQ upload or READ)
  *   DONE\n                     — movement complete (after MOVE)
+ *   DONE,i,a1,a2,a3,a4\n      — MOVESEQ step i finished (move + hold), end angles
+ *   SEQDONE,k\n                — MOVESEQ finished after k steps (k < n if stopped)
+ *   TELEM,period_ms\n          — telemetry period confirmed
+ *   POS,t_ms,a1,a2,a3,a4\n    — angles written t_ms after the move started
  *   PONG\n                     — health check response
  *   ERR,reason\n               — error response
+ *
+ * Link negotiation (ASCII only, host-initiated after READY):
+ *   BAUD,rate\n  — reply BAUD,rate at the old rate, then switch. If no PING
+ *                  arrives at the new rate within 1s, fall back to 9600.
+ *   BIN\n        — reply BIN, then use binary frames in both directions:
+ *                  0xA5 type len payload crc8(type,len,payload).
+ *                  Frame types match accessware/backend/framing.py.
+ * A reset (the CH340 toggles DTR on every port open) returns to ASCII/9600.
  */
 
 #include "src/CokoinoArm.h"
@@ -23,6 +39,38 @@
 #define buzzerPin 9
 #define ANGLE_MIN 10
 #define ANGLE_MAX 170
+#define MAX_SEQ_STEPS 32
+#define BASE_BAUD 9600
+
+// Binary frame types (see framing.py)
+#define FRAME_SYNC     0xA5
+#define F_MOVE         0x01
+#define F_READ         0x02
+#define F_PING         0x03
+#define F_MOVESEQ      0x04
+#define F_STOP         0x05
+#define F_TELEM        0x06
+#define F_ACK          0x81
+#define F_DONE         0x82
+#define F_PONG         0x83
+#define F_STEPDONE     0x84
+#define F_SEQDONE      0x85
+#define F_POS          0x86
+#define F_ERR          0x8F
+
+#define POS_MAX_BYTES  27  // longest POS: "POS,65535,180,180,180,180\r\n"
+
+int seqTarget[MAX_SEQ_STEPS][4];
+unsigned int seqHold[MAX_SEQ_STEPS];  // 0-65535 ms on both framings
+
+bool binaryMode = false;
+uint8_t telemPeriod = 0;  // ms between POS frames while moving, 0 = off
+
+// One frame read while checking for STOP, handled after the sequence
+uint8_t pendingType = 0;
+uint8_t pendingLen = 0;
+uint8_t pendingPayload[2 + MAX_SEQ_STEPS * 6];
+bool havePending = false;
 
 CokoinoArm arm;
 
@@ -33,16 +81,119 @@ int clampAngle(int a) {
   return a;
 }
 
+// ---- Replies (ASCII or binary depending on binaryMode) ----
+
+uint8_t crc8(uint8_t crc, uint8_t b) {
+  crc ^= b;
+  for (int i = 0; i < 8; i++) {
+    crc = (crc & 0x80) ? (uint8_t)((crc << 1) ^ 0x07) : (uint8_t)(crc << 1);
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t type, const uint8_t *payload, uint8_t len) {
+  uint8_t crc = crc8(crc8(0, type), len);
+  Serial.write(FRAME_SYNC);
+  Serial.write(type);
+  Serial.write(len);
+  for (uint8_t i = 0; i < len; i++) {
+    Serial.write(payload[i]);
+    crc = crc8(crc, payload[i]);
+  }
+  Serial.write(crc);
+}
+
+void readAngles(uint8_t out[4]) {
+  out[0] = arm.servo1.read();
+  out[1] = arm.servo2.read();
+  out[2] = arm.servo3.read();
+  out[3] = arm.servo4.read();
+}
+
+void printAngles(const uint8_t a[4]) {
+  for (int i = 0; i < 4; i++) {
+    Serial.print(a[i]);
+    if (i < 3) Serial.print(",");
+  }
+  Serial.println();
+}
+
 // Send the current angles of all 4 servos as ACK,a1,a2,a3,a4
 void sendAngles() {
-  Serial.print("ACK,");
-  Serial.print(arm.servo1.read());
-  Serial.print(",");
-  Serial.print(arm.servo2.read());
-  Serial.print(",");
-  Serial.print(arm.servo3.read());
-  Serial.print(",");
-  Serial.println(arm.servo4.read());
+  uint8_t a[4];
+  readAngles(a);
+  if (binaryMode) {
+    sendFrame(F_ACK, a, 4);
+  } else {
+    Serial.print("ACK,");
+    printAngles(a);
+  }
+}
+
+void sendDone() {
+  if (binaryMode) sendFrame(F_DONE, NULL, 0);
+  else Serial.println("DONE");
+}
+
+void sendPong() {
+  if (binaryMode) sendFrame(F_PONG, NULL, 0);
+  else Serial.println("PONG");
+}
+
+void sendErr(const char *reason) {
+  if (binaryMode) {
+    sendFrame(F_ERR, (const uint8_t *)reason, strlen(reason));
+  } else {
+    Serial.print("ERR,");
+    Serial.println(reason);
+  }
+}
+
+void sendStepDone(uint8_t i) {
+  uint8_t p[5];
+  p[0] = i;
+  readAngles(p + 1);
+  if (binaryMode) {
+    sendFrame(F_STEPDONE, p, 5);
+  } else {
+    Serial.print("DONE,");
+    Serial.print(i);
+    Serial.print(",");
+    printAngles(p + 1);
+  }
+}
+
+void sendSeqDone(uint8_t k) {
+  if (binaryMode) {
+    sendFrame(F_SEQDONE, &k, 1);
+  } else {
+    Serial.print("SEQDONE,");
+    Serial.println(k);
+  }
+}
+
+void sendTelemConfirm() {
+  if (binaryMode) {
+    sendFrame(F_TELEM, &telemPeriod, 1);
+  } else {
+    Serial.print("TELEM,");
+    Serial.println(telemPeriod);
+  }
+}
+
+void sendPos(unsigned int t, const int S[4]) {
+  uint8_t p[6];
+  p[0] = t & 0xFF;
+  p[1] = t >> 8;
+  for (int i = 0; i < 4; i++) p[2 + i] = S[i];
+  if (binaryMode) {
+    sendFrame(F_POS, p, 6);
+  } else {
+    Serial.print("POS,");
+    Serial.print(t);
+    Serial.print(",");
+    printAngles(p + 2);
+  }
 }
 
 // Our movement function — fixes from CokoinoArm::do_action:
@@ -58,6 +209,9 @@ void moveServos(int target[4], int speed) {
     S[i] = servos[i]->read();
   }
   int count = 0;
+  unsigned long moveStart = millis();
+  unsigned long lastPos = 0;
+  bool firstPos = true;
   do {
     int doneCount = 0;
     for (int i = 0; i < 4; i++) {
@@ -71,20 +225,227 @@ void moveServos(int target[4], int speed) {
       servos[i]->write(S[i]);
     }
     count++;
+    if (telemPeriod) {
+      unsigned long t = millis() - moveStart;
+      // Skip a sample rather than block the tick loop on a full TX buffer
+      if ((firstPos || t - lastPos >= telemPeriod) && Serial.availableForWrite() >= POS_MAX_BYTES) {
+        sendPos(t, S);
+        lastPos = t;
+        firstPos = false;
+      }
+    }
     delay(speed);
     if (doneCount == 4) break;
   } while (count < 180);
   delay(speed * 20);
 }
 
+int clampSpeed(int speed) {
+  if (speed < 1) return 1;
+  if (speed > 50) return 50;
+  return speed;
+}
+
+// Parse "v1,v2,...,vn" into out[]; returns false if fewer than n fields
+bool parseInts(String params, int *out, int n) {
+  int start = 0;
+  for (int i = 0; i < n; i++) {
+    int idx = params.indexOf(',', start);
+    if (idx == -1) {
+      if (i != n - 1) return false;
+      idx = params.length();
+    }
+    out[i] = params.substring(start, idx).toInt();
+    start = idx + 1;
+  }
+  return true;
+}
+
+// Read one binary frame (SYNC already consumed). Returns false on timeout
+// or CRC mismatch.
+bool readFrame(uint8_t *type, uint8_t *payload, uint8_t *len) {
+  uint8_t hdr[2];
+  if (Serial.readBytes(hdr, 2) != 2) return false;
+  *type = hdr[0];
+  *len = hdr[1];
+  if (*len > sizeof(pendingPayload)) return false;
+  if (Serial.readBytes(payload, *len) != *len) return false;
+  uint8_t crc;
+  if (Serial.readBytes(&crc, 1) != 1) return false;
+  uint8_t expect = crc8(crc8(0, *type), *len);
+  for (uint8_t i = 0; i < *len; i++) expect = crc8(expect, payload[i]);
+  return crc == expect;
+}
+
+// True if the host sent STOP. Other queued commands are left for loop().
+bool stopRequested() {
+  if (binaryMode) {
+    if (havePending || !Serial.available() || Serial.peek() != FRAME_SYNC) return false;
+    Serial.read();
+    if (!readFrame(&pendingType, pendingPayload, &pendingLen)) return false;
+    if (pendingType == F_STOP) return true;
+    havePending = true;
+    return false;
+  }
+  if (Serial.available() && Serial.peek() == 'S') {
+    String line = Serial.readStringUntil('\n');
+    line.trim();
+    return line == "STOP";
+  }
+  return false;
+}
+
+// Move to target and report, shared by ASCII and binary MOVE
+void doMove(int target[4], int speed) {
+  // Acknowledge with current angles before moving
+  sendAngles();
+  // Execute movement with our fixed function
+  moveServos(target, clampSpeed(speed));
+  // Signal completion
+  sendDone();
+}
+
+// Run the uploaded waypoints, reporting each step
+void executeSequence(int speed, int n) {
+  // Acknowledge with current angles before moving
+  sendAngles();
+
+  int executed = 0;
+  for (int i = 0; i < n; i++) {
+    moveServos(seqTarget[i], speed);
+    delay(seqHold[i]);
+    sendStepDone(i);
+    executed++;
+    if (stopRequested()) break;
+  }
+  sendSeqDone(executed);
+}
+
+// Skip the rest of a rejected upload, so its waypoint lines are not
+// taken for commands (each would answer ERR). Stops early on a timeout.
+void drainLines(int count) {
+  for (int i = 0; i < count; i++) {
+    if (Serial.readStringUntil('\n').length() == 0) return;
+  }
+}
+
+// MOVESEQ (ASCII): read n waypoint lines, then execute
+void runSequence(String params) {
+  int header[2];
+  if (!parseInts(params, header, 2)) {
+    sendErr("BAD_SEQ_FORMAT");
+    return;
+  }
+  int speed = clampSpeed(header[0]);
+  int n = header[1];
+  if (n < 1 || n > MAX_SEQ_STEPS) {
+    drainLines(n);
+    sendErr("BAD_SEQ_LENGTH");
+    return;
+  }
+
+  for (int i = 0; i < n; i++) {
+    String line = Serial.readStringUntil('\n');
+    line.trim();
+    int fields[5];
+    if (!parseInts(line, fields, 5)) {
+      drainLines(n - i - 1);
+      sendErr("BAD_SEQ_FORMAT");
+      return;
+    }
+    for (int j = 0; j < 4; j++) seqTarget[i][j] = fields[j];
+    // An int is 16 bits here: parse the hold as long, clamp to the u16 slot
+    long hold = line.substring(line.lastIndexOf(',') + 1).toInt();
+    seqHold[i] = hold < 0 ? 0 : (hold > 65535 ? 65535 : hold);
+  }
+  executeSequence(speed, n);
+}
+
+// BAUD,rate: switch rates; revert unless the host PINGs at the new rate
+void negotiateBaud(long rate) {
+  if (rate != 19200 && rate != 38400 && rate != 57600 && rate != 115200) {
+    sendErr("BAD_BAUD");
+    return;
+  }
+  Serial.print("BAUD,");
+  Serial.println(rate);
+  Serial.flush();
+  Serial.end();
+  Serial.begin(rate);
+
+  unsigned long start = millis();
+  while (millis() - start < 1000) {
+    if (Serial.available()) {
+      String line = Serial.readStringUntil('\n');
+      line.trim();
+      if (line == "PING") {
+        Serial.println("PONG");
+        return;
+      }
+    }
+  }
+  Serial.end();
+  Serial.begin(BASE_BAUD);
+}
+
+void handleFrame(uint8_t type, uint8_t *p, uint8_t len) {
+  if (type == F_MOVE && len == 5) {
+    int target[4] = {p[0], p[1], p[2], p[3]};
+    doMove(target, p[4]);
+  } else if (type == F_MOVESEQ && len >= 2) {
+    int n = p[1];
+    if (n < 1 || n > MAX_SEQ_STEPS || len != 2 + n * 6) {
+      sendErr("BAD_SEQ_LENGTH");
+      return;
+    }
+    for (int i = 0; i < n; i++) {
+      uint8_t *rec = p + 2 + i * 6;
+      for (int j = 0; j < 4; j++) seqTarget[i][j] = rec[j];
+      seqHold[i] = rec[4] | (rec[5] << 8);
+    }
+    executeSequence(clampSpeed(p[0]), n);
+  } else if (type == F_READ) {
+    sendAngles();
+  } else if (type == F_PING) {
+    sendPong();
+  } else if (type == F_STOP) {
+    // No sequence running — nothing to stop
+  } else if (type == F_TELEM && len == 1) {
+    telemPeriod = p[0];
+    sendTelemConfirm();
+  } else {
+    sendErr("UNKNOWN_FRAME");
+  }
+}
+
+void binaryLoop() {
+  if (havePending) {
+    havePending = false;
+    handleFrame(pendingType, pendingPayload, pendingLen);
+    return;
+  }
+  if (!Serial.available()) return;
+  if (Serial.read() != FRAME_SYNC) return;  // resync on next SYNC byte
+  uint8_t type, len;
+  if (!readFrame(&type, pendingPayload, &len)) {
+    sendErr("BAD_FRAME");
+    return;
+  }
+  handleFrame(type, pendingPayload, len);
+}
+
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(BASE_BAUD);
   arm.ServoAttach(4, 5, 6, 7);
   pinMode(buzzerPin, OUTPUT);
   Serial.println("READY");
 }
 
 void loop() {
+  if (binaryMode) {
+    binaryLoop();
+    return;
+  }
   if (Serial.available()) {
     String line = Serial.readStringUntil('\n');
     line.trim();
@@ -95,43 +456,35 @@ void loop() {
 
     if (line.startsWith("MOVE,")) {
       // Parse: MOVE,s1,s2,s3,s4,speed
-      String params = line.substring(5); // everything after "MOVE,"
-
-      int idx1 = params.indexOf(',');
-      int idx2 = params.indexOf(',', idx1 + 1);
-      int idx3 = params.indexOf(',', idx2 + 1);
-      int idx4 = params.indexOf(',', idx3 + 1);
-
-      if (idx1 == -1 || idx2 == -1 || idx3 == -1 || idx4 == -1) {
-        Serial.println("ERR,BAD_MOVE_FORMAT");
+      int fields[5];
+      if (!parseInts(line.substring(5), fields, 5)) {
+        sendErr("BAD_MOVE_FORMAT");
         return;
       }
+      doMove(fields, fields[4]);
 
-      int target[4];
-      target[0] = params.substring(0, idx1).toInt();
-      target[1] = params.substring(idx1 + 1, idx2).toInt();
-      target[2] = params.substring(idx2 + 1, idx3).toInt();
-      target[3] = params.substring(idx3 + 1, idx4).toInt();
-      int speed  = params.substring(idx4 + 1).toInt();
+    } else if (line.startsWith("MOVESEQ,")) {
+      runSequence(line.substring(8));
 
-      // Validate speed
-      if (speed < 1) speed = 1;
-      if (speed > 50) speed = 50;
+    } else if (line.startsWith("BAUD,")) {
+      negotiateBaud(line.substring(5).toInt());
 
-      // Acknowledge with current angles before moving
-      sendAngles();
+    } else if (line == "BIN") {
+      Serial.println("BIN");
+      binaryMode = true;
 
-      // Execute movement with our fixed function
-      moveServos(target, speed);
+    } else if (line == "STOP") {
+      // No sequence running — nothing to stop
 
-      // Signal completion
-      Serial.println("DONE");
+    } else if (line.startsWith("TELEM,")) {
+      telemPeriod = constrain(line.substring(6).toInt(), 0, 255);
+      sendTelemConfirm();
 
     } else if (line == "READ") {
       sendAngles();
 
     } else if (line == "PING") {
-      Serial.println("PONG");
+      sendPong();
 
     } else {
       Serial.print("ERR,UNKNOWN_CMD:");
@@ -0,0 +1,464 @@
+"""Micro- and round-trip benchmarks with a stored baseline.
+
+Covers the hot paths of a run: trajectory prediction, metrics, ACK
+parsing, the test catalog, bridge round-trips (simulated arm), a full
+fast-forward run on the mock bridge and WebSocket fan-out through the hub
+and client outboxes. Every benchmark is timed in several rounds of
+auto-calibrated length and reported as the median time per operation, so
+results are stable enough to diff between commits::
+
+    python -m accessware.backend.bench                  # run, compare to baseline
+    python -m accessware.backend.bench interpolation    # only names starting with it
+    python -m accessware.backend.bench --json out.json  # machine-readable results
+    python -m accessware.backend.bench --save-baseline  # accept current numbers
+
+The exit status is 1 when any benchmark is more than ``--tolerance``
+slower than the baseline. Timings only compare on the same machine: the
+baseline records the host it was taken on, so regenerate it on the bench
+PC rather than trusting numbers from elsewhere.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "benchmarks" / "baseline.json"
+
+BENCH_ROUNDS = 7
+BENCH_ROUND_S = 0.05
+"""Target wall time of one round; the number of calls per round is
+calibrated to reach it."""
+
+REGRESSION_TOLERANCE = 0.25
+"""Relative slow-down over the baseline median that counts as a regression."""
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Any]  # returns the timed callable, or a (async) context manager yielding it
+    ops: int = 1  # operations per call, e.g. messages delivered
+    description: str = ""
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops: int
+    number: int  # calls per round
+    round_ns: list[float] = field(default_factory=list)  # per operation, one per round
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.round_ns)
+
+    @property
+    def min_ns(self) -> float:
+        return min(self.round_ns)
+
+    @property
+    def ops_per_s(self) -> float:
+        return 1e9 / self.median_ns if self.median_ns else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "median_ns": round(self.median_ns, 1),
+            "min_ns": round(self.min_ns, 1),
+            "ops_per_s": round(self.ops_per_s, 1),
+            "ops": self.ops,
+            "number": self.number,
+            "rounds": len(self.round_ns),
+        }
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, ops: int = 1) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Register *setup* under *name*."""
+
+    def register(setup: Callable[[], Any]) -> Callable[[], Any]:
+        BENCHMARKS[name] = Benchmark(name, setup, ops, (setup.__doc__ or "").strip())
+        return setup
+
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+
+async def _time_calls(fn: Callable[[], Any], number: int) -> float:
+    if inspect.iscoroutinefunction(fn):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await fn()
+    else:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+    return time.perf_counter_ns() - start
+
+
+async def _measure(bench: Benchmark, fn: Callable[[], Any], rounds: int, round_s: float) -> BenchResult:
+    await _time_calls(fn, 1)  # warm caches and lazy imports
+    number = 1
+    while True:
+        elapsed = await _time_calls(fn, number)
+        if elapsed >= round_s * 1e9 / 4 or number >= 1 << 24:
+            break
+        number *= 4
+    number = max(1, round(number * round_s * 1e9 / max(elapsed, 1)))
+    result = BenchResult(bench.name, bench.ops, number)
+    for _ in range(rounds):
+        result.round_ns.append(await _time_calls(fn, number) / (number * bench.ops))
+    return result
+
+
+async def _run(bench: Benchmark, rounds: int, round_s: float) -> BenchResult:
+    target = bench.setup()
+    if hasattr(target, "__aenter__"):
+        async with target as fn:
+            return await _measure(bench, fn, rounds, round_s)
+    if hasattr(target, "__enter__"):
+        with target as fn:
+            return await _measure(bench, fn, rounds, round_s)
+    return await _measure(bench, target, rounds, round_s)
+
+
+def run_benchmarks(
+    names: list[str] | None = None,
+    rounds: int = BENCH_ROUNDS,
+    round_s: float = BENCH_ROUND_S,
+) -> list[BenchResult]:
+    """Run the benchmarks whose names start with any of *names* (default: all)."""
+    selected = [
+        b for name, b in BENCHMARKS.items()
+        if not names or any(name.startswith(prefix) for prefix in names)
+    ]
+
+    async def run_all() -> list[BenchResult]:
+        return [await _run(b, rounds, round_s) for b in selected]
+
+    return asyncio.run(run_all())
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+def machine() -> dict[str, str]:
+    return {
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+
+
+def report(results: list[BenchResult]) -> dict[str, Any]:
+    """Machine-readable results, also the baseline file format."""
+    return {"machine": machine(), "results": {r.name: r.to_dict() for r in results}}
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results: list[BenchResult], path: Path = BASELINE_PATH) -> None:
+    """Merge *results* into the baseline (other entries are kept)."""
+    baseline = load_baseline(path) or {"results": {}}
+    current = report(results)
+    baseline["machine"] = current["machine"]
+    baseline["results"].update(current["results"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: dict[str, Any],
+    tolerance: float = REGRESSION_TOLERANCE,
+) -> list[Regression]:
+    """Benchmarks whose median is more than *tolerance* slower than the baseline."""
+    regressions = []
+    for r in results:
+        entry = baseline.get("results", {}).get(r.name)
+        if entry and r.median_ns > entry["median_ns"] * (1 + tolerance):
+            regressions.append(Regression(r.name, entry["median_ns"], r.median_ns))
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+FULL_SWEEP = ([10, 170, 10, 170], [170, 10, 170, 10])
+
+
+def _synthetic_result(n_steps: int, repeat_index: int = 0):
+    from .test_runner import StepResult, TestResult
+
+    result = TestResult(test_name="bench", repeat_index=repeat_index)
+    for i in range(n_steps):
+        target = [10 + (i * 37 + k * 53) % 160 for k in range(4)]
+        result.steps.append(StepResult(
+            label=f"step{i}",
+            target_angles=target,
+            actual_start_angles=[90, 90, 90, 90],
+            actual_end_angles=[a + (i + repeat_index) % 3 - 1 for a in target],
+            planned_duration_ms=1500,
+            actual_duration_ms=1510.0 + i % 7,
+            hold_ms=200 * (i % 4),
+        ))
+    return result
+
+
+@benchmark("interpolation.interpolate_poses")
+def _interpolate_poses():
+    """All ticks of a full-range move (160 poses)."""
+    from .interpolation import interpolate_poses
+
+    current, target = FULL_SWEEP
+    return lambda: list(interpolate_poses(current, target, 15))
+
+
+@benchmark("interpolation.predict_angle_at_time")
+def _predict_angle_at_time():
+    """Closed-form pose halfway through a full-range move."""
+    from .interpolation import predict_angle_at_time
+
+    current, target = FULL_SWEEP
+    return lambda: predict_angle_at_time(current, target, 15, 1234.0)
+
+
+@benchmark("metrics.compute_metrics")
+def _compute_metrics():
+    """Offline batch metrics of one 50-step repeat against a designed path."""
+    from .metrics import compute_metrics
+
+    result = _synthetic_result(50)
+    test = {"designed_path": [s.target_angles for s in result.steps]}
+
+    def run() -> None:
+        result.ergonomic_flags.clear()
+        compute_metrics(result, test)
+
+    return run
+
+
+@benchmark("metrics.online_repeat")
+def _online_repeat():
+    """Live scoring of one 50-step repeat, as the runner does it."""
+    from .metrics import OnlineMetrics
+
+    result = _synthetic_result(50)
+    online = OnlineMetrics([s.target_angles for s in result.steps])
+
+    def run() -> None:
+        result.ergonomic_flags.clear()
+        online.start_repeat()
+        for i, step in enumerate(result.steps):
+            online.add_step(i, step)
+        online.finish_repeat(result)
+
+    return run
+
+
+@benchmark("metrics.compute_repeatability")
+def _compute_repeatability():
+    """Repeatability over 10 repeats of 50 steps."""
+    from .metrics import compute_repeatability
+
+    results = [_synthetic_result(50, i) for i in range(10)]
+    return lambda: compute_repeatability(results)
+
+
+@benchmark("serial.parse_ack")
+def _parse_ack():
+    """Parse one ``ACK,a1,a2,a3,a4`` reply."""
+    from .serial_bridge import _parse_ack
+
+    return lambda: _parse_ack("ACK,90,45,120,170")
+
+
+@benchmark("catalog.list_tests")
+def _list_tests():
+    """List the catalog (indexed, no rescan)."""
+    from .test_runner import list_tests
+
+    return list_tests
+
+
+@benchmark("catalog.load_test")
+def _load_test():
+    """Load one bundled test by id (private copy of the parsed file)."""
+    from .test_runner import load_test
+
+    return lambda: load_test("repetitive-use-fatigue")
+
+
+@benchmark("catalog.rescan")
+def _rescan():
+    """Forced stat-only rescan of the bundled and custom directories."""
+    from .test_runner import test_catalog
+
+    return lambda: test_catalog.refresh(force=True)
+
+
+@benchmark("bridge.read_angles.sim")
+@asynccontextmanager
+async def _read_angles_sim():
+    """READ round-trip through SerialBridge and a simulated arm."""
+    from .serial_bridge import SerialBridge
+
+    bridge = SerialBridge("sim://bench?warp=1000")
+    await bridge.connect()
+    try:
+        yield bridge.read_angles
+    finally:
+        await bridge.disconnect()
+
+
+@benchmark("bridge.move.sim")
+@asynccontextmanager
+async def _move_sim():
+    """MOVE to ACK and DONE of a one-degree move on a simulated arm."""
+    from .serial_bridge import SerialBridge
+
+    bridge = SerialBridge("sim://bench?warp=1000")
+    await bridge.connect()
+    poses = [[91, 90, 90, 90], [90, 90, 90, 90]]
+    count = 0
+
+    async def move() -> None:
+        nonlocal count
+        count += 1
+        await bridge.move(poses[count % 2], 1)
+
+    try:
+        yield move
+    finally:
+        await bridge.disconnect()
+
+
+@benchmark("runner.run_test.mock")
+def _run_test_mock():
+    """Fast-forward run of grip-and-press on the mock bridge (runner overhead)."""
+    from .clock import VirtualClock
+    from .serial_bridge import MockSerialBridge
+    from .test_runner import TestRunner, load_test
+
+    test = load_test("grip-and-press")
+
+    async def run() -> None:
+        clock = VirtualClock()
+        bridge = MockSerialBridge(clock=clock)
+        await bridge.connect()
+        await TestRunner(bridge, clock=clock).run_test(test)
+
+    return run
+
+
+WS_CLIENTS = 8
+WS_BURST = 100
+
+
+@benchmark("ws.fanout", ops=WS_CLIENTS * WS_BURST)
+@asynccontextmanager
+async def _ws_fanout():
+    """Predicted-angle frames published to the hub and written by 8 client outboxes."""
+    from .hub import BroadcastHub
+    from .outbox import ClientOutbox
+
+    async def send(payload: str | bytes) -> None:
+        pass
+
+    hub = BroadcastHub()
+    outboxes = [ClientOutbox(send, maxsize=WS_BURST, name=f"bench-{i}") for i in range(WS_CLIENTS)]
+    for outbox in outboxes:
+        hub.subscribe("job", outbox)
+        outbox.start()
+    msg = {"type": "predicted_angles", "angles": [90, 91, 92, 93], "t": 1234.5, "step": 3}
+
+    async def burst() -> None:
+        target = outboxes[0].sent + WS_BURST
+        for _ in range(WS_BURST):
+            hub.publish("job", msg)
+        while any(o.sent < target for o in outboxes):
+            await asyncio.sleep(0)
+
+    try:
+        yield burst
+    finally:
+        for outbox in outboxes:
+            await outbox.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Run AccessWare benchmarks and compare with the baseline")
+    parser.add_argument("names", nargs="*", help="Name prefixes to run (default: all)")
+    parser.add_argument("--rounds", type=int, default=BENCH_ROUNDS, help=f"Rounds per benchmark (default: {BENCH_ROUNDS})")
+    parser.add_argument("--json", default=None, help="Write results as JSON to this file ('-' for stdout)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help=f"Allowed slow-down before failing (default: {REGRESSION_TOLERANCE})")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for b in BENCHMARKS.values():
+            print(f"{b.name:36} {b.description}")
+        sys.exit(0)
+
+    results = run_benchmarks(args.names, rounds=args.rounds)
+    baseline = load_baseline(args.baseline)
+    for r in results:
+        entry = (baseline or {}).get("results", {}).get(r.name)
+        delta = f"{(r.median_ns / entry['median_ns'] - 1) * 100:+6.1f}%" if entry else "   new"
+        print(f"{r.name:36} {r.median_ns:12.1f} ns/op {r.ops_per_s:14.1f} op/s  {delta}")
+
+    if args.json == "-":
+        json.dump(report(results), sys.stdout, indent=2)
+        print()
+    elif args.json:
+        Path(args.json).write_text(json.dumps(report(results), indent=2) + "\n")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+    elif baseline is not None:
+        if baseline.get("machine", {}).get("host") != machine()["host"]:
+            print(f"Note: baseline was taken on {baseline.get('machine', {}).get('host')!r}, not this host")
+        regressions = compare(results, baseline, args.tolerance)
+        for reg in regressions:
+            print(f"REGRESSION {reg.name}: {reg.baseline_ns:.1f} -> {reg.current_ns:.1f} ns/op ({reg.ratio:.2f}x)")
+        sys.exit(1 if regressions else 0)
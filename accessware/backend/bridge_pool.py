@@ -0,0 +1,309 @@
+"""Pool of arm bridges for driving several CKK0006 units at once.
+
+Each arm is one bridge (a SerialBridge on its own CH340 port or on a
+simulated ``sim://`` arm, or a MockSerialBridge stand-in) guarded by its
+own lock. Test runs lease an arm for their whole duration; when every arm
+is busy, callers queue in FIFO order until one is released, so throughput
+scales with the number of arms.
+
+Discovered serial arms are supervised (``supervisor.py``): a dropped link
+is reconnected in the background and the interrupted run resumes. While
+the link is down the arm reports disconnected, so new runs go to the
+other arms, and callers waiting for it are woken once it is back. A pool
+that fell back to mocks keeps looking for real arms in the background
+(:meth:`BridgePool.ensure_rediscovery`) and swaps them in when found.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+from .serial_bridge import DEFAULT_PORT, BridgeProtocol, MockSerialBridge, SerialBridge
+from .simulator import SimConfig
+from .supervisor import SupervisedBridge
+from .test_runner import StateCallback, TestResult, TestRunner
+
+logger = logging.getLogger(__name__)
+
+CH340_VID = 0x1A86
+"""USB vendor id of the WCH CH340/CH341 USB-serial chip on the Nano clone."""
+
+PORTS_ENV = os.environ.get("ACCESSWARE_PORTS", "")  # comma-separated; empty = auto-discover
+MOCK_ARMS = int(os.environ.get("ACCESSWARE_MOCK_ARMS", "1"))  # stand-ins when no arm connects
+REDISCOVER_INTERVAL_S = float(os.environ.get("ACCESSWARE_REDISCOVER_INTERVAL", "10"))
+"""Seconds between looks for real arms while running on fallback mocks."""
+
+
+@dataclass
+class Arm:
+    """One leasable arm in the pool."""
+
+    arm_id: str
+    bridge: BridgeProtocol
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    runs: int = 0
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+
+def discover_ports() -> list[str]:
+    """Serial ports to try: ``ACCESSWARE_PORTS``, else every CH340 device."""
+    if PORTS_ENV:
+        return [p.strip() for p in PORTS_ENV.split(",") if p.strip()]
+    try:
+        import serial.tools.list_ports  # type: ignore[import-untyped]
+    except ImportError:
+        return [DEFAULT_PORT]
+    ports = [p.device for p in serial.tools.list_ports.comports() if p.vid == CH340_VID]
+    return sorted(ports) or [DEFAULT_PORT]
+
+
+class BridgePool:
+    """Manages N bridges and schedules test runs onto free arms."""
+
+    def __init__(self, bridges: dict[str, BridgeProtocol]) -> None:
+        if not bridges:
+            raise ValueError("BridgePool needs at least one bridge")
+        self._arms: dict[str, Arm] = {}
+        self._released = asyncio.Condition()
+        self._waiting = 0
+        self.fallback = False  # running on mocks because no real arm connected
+        self._rediscover_task: asyncio.Task | None = None
+        for arm_id, bridge in bridges.items():
+            self._add_arm(arm_id, bridge)
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    async def discover(cls, ports: list[str] | None = None, mock_arms: int = MOCK_ARMS) -> BridgePool:
+        """Connect to every reachable arm; fall back to *mock_arms* mocks."""
+        connected = await _connect_ports(discover_ports() if ports is None else ports)
+        if connected:
+            logger.info("Using %d real serial bridge(s): %s", len(connected), ", ".join(connected))
+            return cls(connected)
+
+        logger.warning("No arm connected, falling back to %d mock bridge(s)", mock_arms)
+        pool = await cls.mock(max(1, mock_arms))
+        pool.fallback = True
+        return pool
+
+    @classmethod
+    async def mock(cls, count: int, **kwargs: Any) -> BridgePool:
+        """Pool of *count* connected MockSerialBridge arms (``mock-0`` ...)."""
+        bridges: dict[str, BridgeProtocol] = {}
+        for i in range(count):
+            bridge = MockSerialBridge(**kwargs)
+            await bridge.connect()
+            bridges[f"mock-{i}"] = bridge
+        return cls(bridges)
+
+    @classmethod
+    async def simulated(cls, count: int, config: SimConfig | None = None, **kwargs: Any) -> BridgePool:
+        """Pool of *count* SerialBridges on simulated arms (``sim-0`` ...).
+
+        Unlike :meth:`mock`, every run goes through the real bridge and the
+        firmware's tick-level timing, which makes it suitable for soak tests.
+        """
+        config = config or SimConfig()
+        bridges: dict[str, BridgeProtocol] = {}
+        for i in range(count):
+            bridge = SerialBridge(config.url(f"sim-{i}"), **kwargs)
+            await bridge.connect()
+            bridges[f"sim-{i}"] = bridge
+        return cls(bridges)
+
+    async def close(self) -> None:
+        task, self._rediscover_task = self._rediscover_task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await asyncio.gather(*(arm.bridge.disconnect() for arm in self._arms.values()))
+
+    def _add_arm(self, arm_id: str, bridge: BridgeProtocol) -> None:
+        if isinstance(bridge, SupervisedBridge):
+            bridge.on_reconnect = self._wake
+        self._arms[arm_id] = Arm(arm_id, bridge)
+
+    async def _wake(self) -> None:
+        """Let callers waiting in :meth:`lease` re-check for a free arm."""
+        async with self._released:
+            self._released.notify_all()
+
+    # -- rediscovery -------------------------------------------------------
+
+    def ensure_rediscovery(self, interval: float = REDISCOVER_INTERVAL_S) -> None:
+        """While on fallback mocks, look for real arms every *interval*
+        seconds on the running loop (idempotent)."""
+        if not self.fallback:
+            return
+        loop = asyncio.get_running_loop()
+        task = self._rediscover_task
+        if task is not None and task.get_loop() is loop and not task.done():
+            return
+        self._rediscover_task = loop.create_task(self._rediscover_loop(interval), name="rediscover-arms")
+
+    async def _rediscover_loop(self, interval: float) -> None:
+        while self.fallback:
+            await asyncio.sleep(interval)
+            try:
+                await self.rediscover()
+            except Exception:
+                logger.exception("Arm rediscovery failed")
+
+    async def rediscover(self, ports: list[str] | None = None) -> list[str]:
+        """Connect arms on *ports* (default: discovered) not in the pool yet.
+
+        Once a real arm joins a fallback pool, its idle mocks are retired
+        (busy ones finish their run first, on the next call). Returns the
+        ids of the arms added.
+        """
+        ports = discover_ports() if ports is None else ports
+        connected = await _connect_ports([p for p in ports if p not in self._arms], quiet=True)
+        for port, bridge in connected.items():
+            logger.info("Arm found on %s, adding it to the pool", port)
+            self._add_arm(port, bridge)
+        if self.fallback and any(not isinstance(arm.bridge, MockSerialBridge) for arm in self._arms.values()):
+            for arm in list(self._arms.values()):
+                if isinstance(arm.bridge, MockSerialBridge) and not arm.busy:
+                    del self._arms[arm.arm_id]
+                    await arm.bridge.disconnect()
+            self.fallback = any(isinstance(arm.bridge, MockSerialBridge) for arm in self._arms.values())
+        if connected:
+            await self._wake()
+        return list(connected)
+
+    # -- access ------------------------------------------------------------
+
+    @property
+    def arms(self) -> list[Arm]:
+        return list(self._arms.values())
+
+    @property
+    def default(self) -> Arm:
+        """First arm; used for single-arm endpoints (jog, read_angles, ...)."""
+        return next(iter(self._arms.values()))
+
+    def get(self, arm_id: str | None = None) -> Arm:
+        if arm_id is None:
+            return self.default
+        if not isinstance(arm_id, str):
+            raise KeyError(f"Unknown arm: {arm_id!r}")
+        try:
+            return self._arms[arm_id]
+        except KeyError:
+            raise KeyError(f"Unknown arm: {arm_id}") from None
+
+    def _free_arm(self, arm_id: str | None) -> Arm | None:
+        if arm_id is not None:
+            arm = self.get(arm_id)
+            return None if arm.busy else arm
+        for arm in self._arms.values():
+            if not arm.busy and arm.bridge.connected:
+                return arm
+        return None
+
+    @property
+    def queued(self) -> int:
+        """Number of callers waiting for an arm."""
+        return self._waiting
+
+    @asynccontextmanager
+    async def lease(self, arm_id: str | None = None) -> AsyncIterator[Arm]:
+        """Hold an arm (a specific one, or any free one) for a block.
+
+        Waits, in arrival order, until a matching arm is free.
+        """
+        async with self._released:
+            self._waiting += 1
+            try:
+                await self._released.wait_for(lambda: self._free_arm(arm_id) is not None)
+            finally:
+                self._waiting -= 1
+            arm = self._free_arm(arm_id)
+            await arm.lock.acquire()  # free, so this does not suspend
+        try:
+            arm.runs += 1
+            yield arm
+        finally:
+            arm.lock.release()
+            await self._wake()
+
+    @asynccontextmanager
+    async def hold_if_idle(self, arm: Arm) -> AsyncIterator[bool]:
+        """Hold *arm* for a short side operation (e.g. a health probe) if it
+        is free right now; yields False, without waiting, if it is busy.
+
+        Unlike :meth:`lease` this does not queue and is not counted as a run.
+        """
+        if arm.busy:
+            yield False
+            return
+        await arm.lock.acquire()  # free, so this does not suspend
+        try:
+            yield True
+        finally:
+            arm.lock.release()
+            await self._wake()
+
+    # -- scheduling --------------------------------------------------------
+
+    async def run_test(
+        self,
+        test_data: dict[str, Any],
+        arm_id: str | None = None,
+        on_state_change: StateCallback | None = None,
+        on_runner: Callable[[TestRunner], None] | None = None,
+        **runner_kwargs: Any,
+    ) -> list[TestResult]:
+        """Run one test on the next free arm (or *arm_id*).
+
+        Every emitted message is tagged with the ``arm`` it ran on.
+        *on_runner* receives the TestRunner once an arm is assigned, so the
+        caller can pause/stop it.
+        """
+        async with self.lease(arm_id) as arm:
+            async def tagged(msg: dict[str, Any]) -> None:
+                if on_state_change:
+                    await on_state_change({**msg, "arm": arm.arm_id})
+
+            runner = TestRunner(arm.bridge, on_state_change=tagged, **runner_kwargs)
+            if on_runner:
+                on_runner(runner)
+            return await runner.run_test(test_data)
+
+    async def run_many(self, tests: list[dict[str, Any]], **runner_kwargs: Any) -> list[list[TestResult]]:
+        """Run *tests* concurrently across all arms; results keep input order."""
+        return list(await asyncio.gather(*(self.run_test(t, **runner_kwargs) for t in tests)))
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "arm": arm.arm_id,
+                "bridge_type": arm.bridge.bridge_type,
+                "connected": arm.bridge.connected,
+                "busy": arm.busy,
+                "runs": arm.runs,
+            }
+            for arm in self._arms.values()
+        ]
+
+
+async def _connect_ports(ports: list[str], quiet: bool = False) -> dict[str, BridgeProtocol]:
+    """Supervised bridges of the *ports* that connect (others are logged,
+    at debug level if *quiet*)."""
+    bridges = [SerialBridge(port) for port in ports]
+    outcomes = await asyncio.gather(*(b.connect() for b in bridges), return_exceptions=True)
+    connected: dict[str, BridgeProtocol] = {}
+    for port, bridge, outcome in zip(ports, bridges, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.log(logging.DEBUG if quiet else logging.WARNING, "Serial unavailable on %s (%s)", port, outcome)
+        else:
+            connected[port] = SupervisedBridge(lambda port=port: SerialBridge(port), bridge)
+    return connected
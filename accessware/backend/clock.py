@@ -0,0 +1,77 @@
+"""Injectable time sources for the runner, the mock bridge and streaming.
+
+Everything that paces a run reads time through a :class:`Clock`:
+
+- :data:`SYSTEM_CLOCK`: ``time.monotonic`` / ``asyncio.sleep`` (default).
+- :class:`WarpClock`: wall clock sped up by a factor, to pace a runner
+  against a ``sim://`` arm running with the same ``warp``.
+- :class:`VirtualClock`: fast-forward. ``sleep`` returns immediately and
+  advances virtual time, so a test that takes minutes on the bench runs in
+  milliseconds against a MockSerialBridge sharing the clock, with the same
+  messages and result structure (durations are virtual milliseconds).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Protocol
+
+
+class Clock(Protocol):
+    """Monotonic seconds plus a matching async sleep."""
+
+    def monotonic(self) -> float: ...
+    async def sleep(self, seconds: float) -> None: ...
+
+
+class SystemClock:
+    """The wall clock."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class WarpClock:
+    """Wall clock running *factor* times faster."""
+
+    def __init__(self, factor: float) -> None:
+        if factor <= 0:
+            raise ValueError("factor must be positive")
+        self.factor = factor
+        self._origin = time.monotonic()
+
+    def monotonic(self) -> float:
+        return (time.monotonic() - self._origin) * self.factor
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds / self.factor)
+
+
+class VirtualClock:
+    """Fast-forward clock: sleeping advances time instead of waiting.
+
+    A sleep still yields to the event loop once, and its deadline is taken
+    before yielding, so tasks sleeping concurrently on one clock overlap
+    (time advances to the latest deadline, not the sum).
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = start
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += max(seconds, 0.0)
+
+    async def sleep(self, seconds: float) -> None:
+        deadline = self._now + max(seconds, 0.0)
+        await asyncio.sleep(0)
+        self._now = max(self._now, deadline)
@@ -0,0 +1,210 @@
+"""Wire framing for the serial protocol.
+
+Messages are handled everywhere else in their canonical ASCII form
+(``MOVE,90,90,90,90,15``, ``ACK,90,90,90,90``, ...). This module turns
+them into bytes and back, in one of two framings:
+
+- **ASCII** (default, what the firmware boots in): one message per
+  ``\\n``-terminated line.
+- **Binary** (opt-in after a ``BIN`` handshake): ``SYNC type len payload
+  crc8`` frames. Angles and counters are single bytes, holds are
+  little-endian ``u16``. The CRC-8 (poly 0x07) covers type, len and
+  payload; frames that fail it are dropped and the decoder resyncs on the
+  next SYNC byte.
+
+Both directions use the same tables, so the same codec serves the host
+bridge, the mock bridge and test doubles of the firmware.
+"""
+
+from __future__ import annotations
+
+import struct
+
+FRAME_SYNC = 0xA5
+"""First byte of every binary frame."""
+
+MAX_PAYLOAD = 255
+
+# name -> (frame type, number of u8 fields)
+_FIXED: dict[str, tuple[int, int]] = {
+    # host -> firmware
+    "MOVE": (0x01, 5),
+    "READ": (0x02, 0),
+    "PING": (0x03, 0),
+    "STOP": (0x05, 0),
+    "TELEM": (0x06, 1),  # also the firmware's confirmation
+    # firmware -> host
+    "READY": (0x80, 0),
+    "ACK": (0x81, 4),
+    "DONE": (0x82, 0),
+    "PONG": (0x83, 0),
+    "STEPDONE": (0x84, 5),  # text form is DONE,i,a1,a2,a3,a4
+    "SEQDONE": (0x85, 1),
+}
+_MOVESEQ = 0x04
+_POS = 0x86  # POS,t_ms,a1,a2,a3,a4 with t_ms as u16
+_ERR = 0x8F
+_TYPE_NAMES = {code: name for name, (code, _) in _FIXED.items()}
+
+
+class FramingError(ValueError):
+    """A message cannot be represented in (or decoded from) a framing."""
+
+
+def crc8(data: bytes) -> int:
+    """CRC-8, polynomial 0x07, init 0 (matches ``crc8`` in the sketch)."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+def encode_ascii(msg: str) -> bytes:
+    return (msg + "\n").encode("ascii")
+
+
+def _frame(type_: int, payload: bytes) -> bytes:
+    if len(payload) > MAX_PAYLOAD:
+        raise FramingError(f"Payload too long ({len(payload)} bytes)")
+    body = bytes((type_, len(payload))) + payload
+    return bytes((FRAME_SYNC,)) + body + bytes((crc8(body),))
+
+
+def _u8s(values: list[str], msg: str) -> bytes:
+    try:
+        return bytes(int(v) for v in values)
+    except ValueError:
+        raise FramingError(f"Field out of u8 range in {msg!r}") from None
+
+
+def encode_binary(msg: str) -> bytes:
+    """Encode one canonical message (MOVESEQ may span lines) as a frame."""
+    if msg.startswith("MOVESEQ,"):
+        header, *lines = msg.split("\n")
+        speed, count = header[8:].split(",")
+        if int(count) != len(lines):
+            raise FramingError(f"MOVESEQ declares {count} steps, got {len(lines)}")
+        payload = bytearray(_u8s([speed, count], msg))
+        for line in lines:
+            *angles, hold = line.split(",")
+            payload += _u8s(angles, msg)
+            try:
+                payload += struct.pack("<H", int(hold))
+            except (ValueError, struct.error):
+                raise FramingError(f"Hold {hold!r} out of u16 range in {msg!r}") from None
+        return _frame(_MOVESEQ, bytes(payload))
+    if msg.startswith("ERR"):
+        return _frame(_ERR, msg[4:].encode("ascii"))
+    if msg.startswith("POS,"):
+        t_ms, *angles = msg[4:].split(",")
+        try:
+            return _frame(_POS, struct.pack("<H", int(t_ms)) + _u8s(angles, msg))
+        except struct.error:
+            raise FramingError(f"Timestamp out of u16 range in {msg!r}") from None
+
+    name, *fields = msg.split(",")
+    if name == "DONE" and fields:
+        name = "STEPDONE"
+    if name not in _FIXED:
+        raise FramingError(f"No binary frame for {msg!r}")
+    type_, nfields = _FIXED[name]
+    if len(fields) != nfields:
+        raise FramingError(f"{name} takes {nfields} fields, got {msg!r}")
+    return _frame(type_, _u8s(fields, msg))
+
+
+def _decode_frame(type_: int, payload: bytes) -> str:
+    if type_ == _ERR:
+        return "ERR," + payload.decode("ascii", errors="replace")
+    if type_ == _MOVESEQ:
+        speed, count = payload[0], payload[1]
+        lines = [f"MOVESEQ,{speed},{count}"]
+        for i in range(count):
+            rec = payload[2 + 6 * i:8 + 6 * i]
+            (hold,) = struct.unpack("<H", rec[4:6])
+            lines.append(f"{rec[0]},{rec[1]},{rec[2]},{rec[3]},{hold}")
+        return "\n".join(lines)
+    if type_ == _POS:
+        (t_ms,) = struct.unpack("<H", payload[:2])
+        if len(payload) != 6:
+            raise FramingError(f"Bad POS frame length {len(payload)}")
+        return ",".join(["POS", str(t_ms), *map(str, payload[2:])])
+    name = _TYPE_NAMES.get(type_)
+    if name is None or len(payload) != _FIXED[name][1]:
+        raise FramingError(f"Bad frame type 0x{type_:02x} / length {len(payload)}")
+    if name == "STEPDONE":
+        name = "DONE"
+    return ",".join([name, *map(str, payload)])
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+class LineDecoder:
+    """Incremental ASCII decoder: bytes in, stripped non-empty lines out."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+
+    def feed(self, data: bytes) -> None:
+        self._buf += data
+
+    def next_message(self) -> str | None:
+        while True:
+            idx = self._buf.find(b"\n")
+            if idx < 0:
+                return None
+            raw = bytes(self._buf[:idx])
+            del self._buf[:idx + 1]
+            line = raw.decode("ascii", errors="replace").strip()
+            if line:
+                return line
+
+    def take_buffer(self) -> bytes:
+        """Hand over undecoded bytes (used when switching to binary)."""
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+class FrameDecoder:
+    """Incremental binary decoder with CRC check and SYNC resync."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self.bad_frames = 0
+
+    def feed(self, data: bytes) -> None:
+        self._buf += data
+
+    def next_message(self) -> str | None:
+        buf = self._buf
+        while True:
+            start = buf.find(FRAME_SYNC)
+            if start < 0:
+                buf.clear()
+                return None
+            del buf[:start]
+            if len(buf) < 3:
+                return None
+            end = 3 + buf[2] + 1
+            if len(buf) < end:
+                return None
+            body = bytes(buf[1:end - 1])
+            if crc8(body) != buf[end - 1]:
+                self.bad_frames += 1
+                del buf[:1]  # skip this SYNC and look for the next one
+                continue
+            del buf[:end]
+            try:
+                return _decode_frame(body[0], body[2:])
+            except (FramingError, IndexError, struct.error):
+                self.bad_frames += 1
+                continue
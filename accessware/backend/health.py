@@ -0,0 +1,142 @@
+"""Background liveness monitoring of the arms in a BridgePool.
+
+``GET /health`` and the WebSocket ``ping`` used to send a live PING per
+request, interleaving it with whatever the arm was doing. The
+:class:`HealthMonitor` instead checks every arm once per interval and
+caches the outcome:
+
+- An arm that is leased (running a test or a jog) is never probed. Its
+  liveness comes from the serial traffic the run already produces (the
+  bridge's ``last_rx``), so monitoring adds no bytes to a busy link.
+- An idle arm is held (not leased) for one PING, so no run can start in
+  the middle of the probe; the reply time is recorded as its RTT.
+
+Readers get the cached :class:`ArmHealth` and never touch the serial port.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .bridge_pool import Arm, BridgePool
+
+logger = logging.getLogger(__name__)
+
+HEALTH_INTERVAL_S = float(os.environ.get("ACCESSWARE_HEALTH_INTERVAL", "5"))
+"""Seconds between health checks of each arm."""
+
+
+@dataclass
+class ArmHealth:
+    arm: str
+    healthy: bool | None = None  # None until the first check
+    rtt_ms: float | None = None  # of the last successful PING
+    source: str = ""  # "ping", "traffic" (busy arm, recent serial reply) or "disconnected"
+    checked_at: float | None = None  # time.monotonic() of the last update
+    last_ok_at: float | None = None
+    failures: int = 0  # consecutive failed checks
+    skipped: int = 0  # probes skipped because the arm was busy
+
+    def to_dict(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "arm": self.arm,
+            "healthy": self.healthy,
+            "rtt_ms": None if self.rtt_ms is None else round(self.rtt_ms, 1),
+            "source": self.source,
+            "age_s": None if self.checked_at is None else round(now - self.checked_at, 1),
+            "last_ok_age_s": None if self.last_ok_at is None else round(now - self.last_ok_at, 1),
+            "failures": self.failures,
+            "skipped": self.skipped,
+        }
+
+
+class HealthMonitor:
+    """Checks every arm of *pool* each *interval* seconds on one task."""
+
+    def __init__(self, pool: BridgePool, interval: float = HEALTH_INTERVAL_S) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self._pool = pool
+        self.interval = interval
+        self._health: dict[str, ArmHealth] = {}
+        self._task: asyncio.Task | None = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def ensure_started(self) -> None:
+        """Start the monitor on the running loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and self._task.get_loop() is loop and not self._task.done():
+            return
+        self._task = loop.create_task(self._loop(), name="health-monitor")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Health check failed")
+            await asyncio.sleep(self.interval)
+
+    # -- checks ------------------------------------------------------------
+
+    async def check(self) -> None:
+        """Update the cached health of every arm once."""
+        await asyncio.gather(*(self._check_arm(arm) for arm in self._pool.arms))
+
+    def _health_of(self, arm: Arm) -> ArmHealth:
+        # Arms can join the pool later (rediscovery), so entries are made on demand.
+        return self._health.setdefault(arm.arm_id, ArmHealth(arm.arm_id))
+
+    async def _check_arm(self, arm: Arm) -> None:
+        health = self._health_of(arm)
+        bridge = arm.bridge
+        if not bridge.connected:
+            self._record(health, False, "disconnected")
+            return
+        async with self._pool.hold_if_idle(arm) as held:
+            if not held:
+                health.skipped += 1
+                # Mock bridges have no serial traffic to go by; leave them as they were.
+                last_rx = getattr(bridge, "last_rx", None)
+                if last_rx is not None and time.monotonic() - last_rx < 2 * self.interval:
+                    self._record(health, True, "traffic")
+                return
+            start = time.monotonic()
+            healthy = await bridge.ping()
+            if healthy:
+                health.rtt_ms = (time.monotonic() - start) * 1000
+            self._record(health, healthy, "ping")
+
+    def _record(self, health: ArmHealth, healthy: bool, source: str) -> None:
+        if health.healthy is not False and not healthy:
+            logger.warning("Arm %s is unhealthy (%s)", health.arm, source)
+        health.healthy = healthy
+        health.source = source
+        health.checked_at = time.monotonic()
+        if healthy:
+            health.last_ok_at = health.checked_at
+            health.failures = 0
+        else:
+            health.failures += 1
+
+    # -- readers -----------------------------------------------------------
+
+    def get(self, arm_id: str | None = None) -> ArmHealth:
+        """Cached health of *arm_id* (default: the pool's first arm)."""
+        return self._health_of(self._pool.get(arm_id))
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [self._health_of(arm).to_dict() for arm in self._pool.arms]
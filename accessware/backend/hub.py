@@ -0,0 +1,103 @@
+"""Publish/subscribe fan-out of run events.
+
+Job messages are published once to the :class:`BroadcastHub` under the
+job's id; every sink subscribed to that id (or to ``"*"``, all jobs)
+receives the same :class:`Event`. The event is encoded at most once per
+wire format, on first use, and the encoding is shared by every subscriber,
+so adding observers (extra dashboards, loggers, recorders) costs a queue
+append each rather than another serialization.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Protocol
+
+from . import wire
+
+logger = logging.getLogger(__name__)
+
+ALL_TOPICS = "*"
+"""Subscribing to this topic receives events of every job."""
+
+
+class Event:
+    """One message plus its lazily computed, shared wire encodings."""
+
+    __slots__ = ("msg", "_text", "_packed")
+
+    def __init__(self, msg: dict[str, Any]) -> None:
+        self.msg = msg
+        self._text: str | None = None
+        self._packed: dict[str, bytes] | None = None
+
+    @property
+    def type(self) -> str:
+        return self.msg.get("type", "")
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = wire.dumps(self.msg)
+        return self._text
+
+    def encoded(self, fmt: wire.WireFormat) -> str | bytes:
+        """Binary frame if *fmt* packs this type, else the JSON text."""
+        if fmt.pack is None or self.type not in fmt.binary_types:
+            return self.text
+        if self._packed is None:
+            self._packed = {}
+        packed = self._packed.get(fmt.name)
+        if packed is None:
+            packed = self._packed[fmt.name] = fmt.pack(self.msg)
+        return packed
+
+
+class Sink(Protocol):
+    """Anything that accepts events without blocking (e.g. ClientOutbox)."""
+
+    def put(self, msg: dict[str, Any] | Event) -> None: ...
+
+
+class BroadcastHub:
+    """Topic-based fan-out of :class:`Event` to non-blocking sinks."""
+
+    def __init__(self) -> None:
+        self._topics: dict[str, set[Sink]] = {}
+        self.published = 0
+
+    def subscribe(self, topic: str, sink: Sink) -> None:
+        self._topics.setdefault(topic, set()).add(sink)
+
+    def unsubscribe(self, topic: str, sink: Sink) -> None:
+        sinks = self._topics.get(topic)
+        if sinks is not None:
+            sinks.discard(sink)
+            if not sinks:
+                del self._topics[topic]
+
+    def unsubscribe_all(self, sink: Sink) -> None:
+        for topic in list(self._topics):
+            self.unsubscribe(topic, sink)
+
+    def drop_topic(self, topic: str) -> None:
+        """Forget a finished topic's subscribers."""
+        self._topics.pop(topic, None)
+
+    def subscribers(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def publish(self, topic: str, msg: dict[str, Any]) -> Event:
+        """Deliver *msg* once to each sink on *topic* or on ``"*"``."""
+        event = Event(msg)
+        self.published += 1
+        sinks = self._topics.get(topic, set())
+        watchers = self._topics.get(ALL_TOPICS)
+        if watchers:
+            sinks = sinks | watchers
+        for sink in sinks:
+            try:
+                sink.put(event)
+            except Exception:
+                logger.exception("Hub subscriber error on %s", topic)
+        return event
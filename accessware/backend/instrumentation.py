@@ -0,0 +1,239 @@
+"""Process-wide counters, gauges and histograms for ``GET /metrics``.
+
+A minimal, dependency-free subset of the Prometheus client: metrics are
+registered once at import time, updated from the hot paths (SerialBridge
+round-trips, TestRunner steps, WebSocket outboxes) with a dict update
+each, and rendered in the Prometheus text exposition format on scrape.
+Gauges that are cheaper to read than to maintain (queue depths) take a
+callback evaluated at scrape time instead.
+
+Rates such as messages per second are left to the scraper:
+``rate(accessware_ws_messages_sent_total[1m])``.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Iterable, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[str, ...]
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names: Labels = tuple(labels)
+        self._lock = threading.Lock()  # the serial reader thread updates metrics too
+
+    def _key(self, labels: dict[str, str]) -> Labels:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Exposition lines of every label set."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback on scrape."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        function: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[Labels, float] = {}
+        self._function = function
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def value(self, **labels: str) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Bucketed observations with their count and sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float], labels: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (+Inf last), sum]
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def sum(self, **labels: str) -> float:
+        entry = self._values.get(self._key(labels))
+        return entry[1][0] if entry else 0.0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+# -- Serial link -------------------------------------------------------------
+
+SERIAL_RTT = REGISTRY.register(Histogram(
+    "accessware_serial_rtt_seconds",
+    "Time from sending a serial command to its reply (DONE: to the end of the move).",
+    buckets=(0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30),
+    labels=("command",),
+))
+SERIAL_TIMEOUTS = REGISTRY.register(Counter(
+    "accessware_serial_timeouts_total", "Serial replies that did not arrive in time.", labels=("command",),
+))
+ACK_RETRIES = REGISTRY.register(Counter(
+    "accessware_serial_ack_retries_total", "MOVE ACKs that failed to parse and were retried with READ.",
+))
+
+# -- Test runs ---------------------------------------------------------------
+
+STEP_DRIFT = REGISTRY.register(Histogram(
+    "accessware_step_duration_drift_ratio",
+    "Relative step duration error, (actual - planned) / planned, of wall-clock runs.",
+    buckets=(-0.2, -0.1, -0.05, -0.02, 0, 0.02, 0.05, 0.1, 0.2, 0.5, 1),
+    labels=("bridge",),
+))
+ACTIVE_RUNS = REGISTRY.register(Gauge("accessware_active_runs", "Tests currently running.", labels=("bridge",)))
+
+# -- WebSocket ---------------------------------------------------------------
+
+WS_MESSAGES = REGISTRY.register(Counter(
+    "accessware_ws_messages_sent_total", "WebSocket messages written to clients.", labels=("type",),
+))
+WS_DROPPED = REGISTRY.register(Counter(
+    "accessware_ws_messages_dropped_total", "Lossy WebSocket messages dropped under backpressure.",
+))
+WS_CLIENTS = REGISTRY.register(Gauge("accessware_ws_clients", "Connected WebSocket clients."))
+WS_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "accessware_ws_queue_depth", "Messages queued over all WebSocket clients.",
+))
+WS_QUEUE_DEPTH_MAX = REGISTRY.register(Gauge(
+    "accessware_ws_queue_depth_max", "Deepest WebSocket client queue.",
+))
@@ -8,12 +8,21 @@ Replicates the firmware's linear interpolation with early exit:
 
 Angles are clamped to [ANGLE_MIN, ANGLE_MAX] (safe mechanical range).
 
-No external dependencies -- pure Python.
+Because every servo moves exactly one degree per tick, the pose after
+``k`` ticks has a closed form: ``current + sign(delta) * min(k, |delta|)``.
+The scalar API uses it directly (pure Python); the batched ``*_batch`` /
+``*_array`` helpers apply it to NumPy arrays for bulk replay.
 """
 
 from __future__ import annotations
 
-from typing import Generator
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Generator, Iterator
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 TICK_COUNT = 180
 """Maximum number of interpolation steps in the firmware do-while loop."""
@@ -27,6 +36,9 @@ ANGLE_MIN = 10
 ANGLE_MAX = 170
 """Maximum safe servo angle (firmware clamps to this)."""
 
+TRAJECTORY_CACHE_SIZE = 1024
+"""Default number of trajectories kept by :data:`trajectory_cache`."""
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -51,6 +63,29 @@ def _step_angle(target: int, current: int) -> int:
     return current
 
 
+def _tick_at(elapsed_ms: float, speed_ms: int) -> int:
+    """Number of firmware ticks executed after *elapsed_ms* (0..TICK_COUNT)."""
+    if speed_ms <= 0:
+        return TICK_COUNT
+    return max(0, min(int(elapsed_ms / speed_ms), TICK_COUNT))
+
+
+def _pose_at_tick(current: list[int], target: list[int], tick: int) -> list[int]:
+    """Closed-form pose after *tick* ticks (*target* must already be clamped).
+
+    Equivalent to applying :func:`_step_angle` *tick* times per servo.
+    """
+    pose = []
+    for c, t in zip(current, target):
+        if t > c:
+            pose.append(min(c + tick, t))
+        elif t < c:
+            pose.append(max(c - tick, t))
+        else:
+            pose.append(c)
+    return pose
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -89,24 +124,16 @@ def interpolate_poses(
     if len(current) != 4 or len(target) != 4:
         raise ValueError("current and target must each have exactly 4 elements")
 
-    s = list(current)  # mutable working copy (S_angle)
     t = [_clamp(a) for a in target]  # clamped target angles (T_angle)
+    max_dist = max(abs(tv - c) for c, tv in zip(current, t))
+    # The firmware always runs at least one tick before checking doneCount.
+    ticks = max(1, min(max_dist, TICK_COUNT))
 
-    for tick in range(1, TICK_COUNT + 1):
-        done_count = 0
-        for i in range(4):
-            s[i] = _step_angle(t[i], s[i])
-            if s[i] == t[i]:
-                done_count += 1
-        yield list(s), tick * speed_ms
-        # Early exit: all servos reached target
-        if done_count == 4:
-            break
+    for tick in range(1, ticks + 1):
+        yield _pose_at_tick(current, t, tick), tick * speed_ms
 
     # Trailing hold: delay(speed * 20)
-    hold_elapsed = speed_ms * HOLD_MULTIPLIER
-    last_tick_elapsed = tick * speed_ms  # noqa: F821 — tick is set by the loop
-    yield list(s), last_tick_elapsed + hold_elapsed
+    yield _pose_at_tick(current, t, ticks), (ticks + HOLD_MULTIPLIER) * speed_ms
 
 
 def predict_angle_at_time(
@@ -119,27 +146,196 @@ def predict_angle_at_time(
 
     *elapsed_ms* is clamped to ``[0, total_duration_ms]``.  Within the tick
     window the tick index is ``min(int(elapsed_ms / speed_ms), TICK_COUNT)``
-    and the step logic is applied iteratively.
+    and the pose is computed in closed form (no per-tick loop).
 
     Returns a 4-element list of angles.
     """
     if len(current) != 4 or len(target) != 4:
         raise ValueError("current and target must each have exactly 4 elements")
 
-    tick = min(int(elapsed_ms / speed_ms), TICK_COUNT) if speed_ms > 0 else TICK_COUNT
-    if tick < 0:
-        tick = 0
-
-    s = list(current)
     t = [_clamp(a) for a in target]
+    return _pose_at_tick(current, t, _tick_at(elapsed_ms, speed_ms))
+
+
+# ---------------------------------------------------------------------------
+# Batched API (NumPy)
+# ---------------------------------------------------------------------------
+
+def predict_angles_batch(
+    current: npt.ArrayLike,
+    target: npt.ArrayLike,
+    speed_ms: npt.ArrayLike,
+    elapsed_ms: npt.ArrayLike,
+) -> np.ndarray:
+    """Vectorized :func:`predict_angle_at_time` over many moves/timestamps.
+
+    *current* and *target* are ``(N, 4)`` (or broadcastable, e.g. ``(4,)``)
+    angle arrays; *speed_ms* and *elapsed_ms* are scalars or ``(N,)``
+    arrays.  Returns an ``(N, 4)`` int array of poses, identical row by row
+    to calling :func:`predict_angle_at_time` in a loop.
+    """
+    import numpy as np
+
+    cur = np.asarray(current, dtype=np.int64)
+    tgt = np.clip(np.asarray(target, dtype=np.int64), ANGLE_MIN, ANGLE_MAX)
+    if cur.shape[-1] != 4 or tgt.shape[-1] != 4:
+        raise ValueError("current and target must each have exactly 4 elements")
+
+    speed = np.asarray(speed_ms, dtype=np.float64)
+    elapsed = np.asarray(elapsed_ms, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ticks = np.where(speed > 0, np.trunc(elapsed / np.where(speed > 0, speed, 1)), TICK_COUNT)
+    ticks = np.clip(ticks, 0, TICK_COUNT).astype(np.int64)
+
+    delta = tgt - cur
+    moved = np.minimum(np.abs(delta), ticks[..., np.newaxis])
+    poses = cur + np.sign(delta) * moved
+    return np.atleast_2d(poses)
+
 
-    for _ in range(tick):
-        all_done = True
-        for i in range(4):
-            s[i] = _step_angle(t[i], s[i])
-            if s[i] != t[i]:
-                all_done = False
-        if all_done:
-            break
+def interpolate_poses_array(
+    current: list[int],
+    target: list[int],
+    speed_ms: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Array form of :func:`interpolate_poses`.
+
+    Returns ``(poses, elapsed_ms)`` where *poses* is a ``(K, 4)`` int array
+    and *elapsed_ms* a ``(K,)`` array -- the same K rows the generator
+    yields, including the trailing hold row.
+    """
+    import numpy as np
+
+    if len(current) != 4 or len(target) != 4:
+        raise ValueError("current and target must each have exactly 4 elements")
+
+    cur = np.asarray(current, dtype=np.int64)
+    tgt = np.clip(np.asarray(target, dtype=np.int64), ANGLE_MIN, ANGLE_MAX)
+    delta = tgt - cur
+    ticks = max(1, min(int(np.abs(delta).max()), TICK_COUNT))
+
+    tick_idx = np.arange(1, ticks + 2, dtype=np.int64)
+    tick_idx[-1] = ticks  # hold row repeats the final pose
+    poses = cur + np.sign(delta) * np.minimum(np.abs(delta), tick_idx[:, np.newaxis])
+
+    elapsed = np.arange(1, ticks + 2, dtype=np.int64) * speed_ms
+    elapsed[-1] = (ticks + HOLD_MULTIPLIER) * speed_ms
+    return poses, elapsed
+
+
+# ---------------------------------------------------------------------------
+# Trajectory table cache
+# ---------------------------------------------------------------------------
+
+class TrajectoryTable:
+    """Precompiled pose stream of one ``do_action`` call.
+
+    Stores the same rows :func:`interpolate_poses` yields, packed into two
+    flat ``array`` buffers (4 angles per row, plus elapsed ms per row).
+    Iterating yields ``(angles, elapsed_ms)`` tuples like the generator;
+    ``duration_ms`` is the planned time from :func:`total_duration_ms`.
+    """
+
+    __slots__ = ("_poses", "_elapsed", "_current", "_target", "speed_ms", "duration_ms")
+
+    def __init__(self, current: list[int], target: list[int], speed_ms: int) -> None:
+        self._current = tuple(current)
+        self._target = tuple(_clamp(a) for a in target)
+        self.speed_ms = speed_ms
+        self.duration_ms = total_duration_ms(speed_ms, current, target)
+        self._poses = array("h")
+        self._elapsed = array("l")
+        for angles, elapsed in interpolate_poses(current, target, speed_ms):
+            self._poses.extend(angles)
+            self._elapsed.append(elapsed)
+
+    def __len__(self) -> int:
+        return len(self._elapsed)
+
+    def __iter__(self) -> Iterator[tuple[list[int], float]]:
+        poses = self._poses
+        for i, elapsed in enumerate(self._elapsed):
+            yield poses[4 * i:4 * i + 4].tolist(), elapsed
+
+    def pose(self, index: int) -> list[int]:
+        """Angles of row *index* (negative indices count from the end)."""
+        if index < 0:
+            index += len(self)
+        return self._poses[4 * index:4 * index + 4].tolist()
+
+    @property
+    def final_pose(self) -> list[int]:
+        return self.pose(-1)
+
+    @property
+    def end_ms(self) -> float:
+        """Elapsed time of the last row (the hold row)."""
+        return self._elapsed[-1]
+
+    def descriptor(self) -> dict[str, object]:
+        """Compact description from which a client can rebuild every pose
+        with the closed form (``start + sign(d) * min(t // speed, |d|)``)."""
+        return {
+            "start": list(self._current),
+            "target": list(self._target),
+            "speed": self.speed_ms,
+            "duration_ms": self.duration_ms,
+            "end_ms": self.end_ms,
+        }
+
+    def pose_at(self, elapsed_ms: float) -> list[int]:
+        """Closed-form pose at *elapsed_ms* into the move (see
+        :func:`predict_angle_at_time`)."""
+        return _pose_at_tick(self._current, self._target, _tick_at(elapsed_ms, self.speed_ms))
+
+
+class TrajectoryCache:
+    """LRU cache of :class:`TrajectoryTable` keyed by (current, target, speed).
+
+    Targets are clamped before keying, so requests that the firmware would
+    execute identically share one entry.
+    """
 
-    return s
+    def __init__(self, maxsize: int = TRAJECTORY_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tables: OrderedDict[tuple, TrajectoryTable] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def get(self, current: list[int], target: list[int], speed_ms: int) -> TrajectoryTable:
+        """Return the cached table for this move, building it on a miss."""
+        if len(current) != 4 or len(target) != 4:
+            raise ValueError("current and target must each have exactly 4 elements")
+        key = (tuple(current), tuple(_clamp(a) for a in target), speed_ms)
+        table = self._tables.get(key)
+        if table is not None:
+            self.hits += 1
+            self._tables.move_to_end(key)
+            return table
+
+        self.misses += 1
+        table = TrajectoryTable(list(current), list(target), speed_ms)
+        self._tables[key] = table
+        if len(self._tables) > self.maxsize:
+            self._tables.popitem(last=False)
+        return table
+
+    def clear(self) -> None:
+        self._tables.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._tables),
+            "maxsize": self.maxsize,
+        }
+
+
+trajectory_cache = TrajectoryCache()
+"""Process-wide trajectory cache used by the test runner."""
@@ -0,0 +1,320 @@
+"""Server-side test-run job scheduler.
+
+Test runs are submitted as jobs into a bounded priority queue and executed
+by one worker per arm of the BridgePool, independently of any WebSocket.
+A job pinned to an arm is only taken by that arm's worker, so it never
+holds up a worker while other arms could run the rest of the queue.
+Jobs have ids, can be polled and cancelled, and keep their TestResults
+after completion, so long unattended runs (overnight fatigue sweeps) need
+no browser attached and never race each other on a bridge.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from .bridge_pool import BridgePool
+from .hub import BroadcastHub
+from .results_store import ResultsStore
+from .test_runner import RunState, StateCallback, TestResult, TestRunner, result_to_dict
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_SIZE = 100
+"""Maximum number of jobs waiting to run."""
+
+JOB_HISTORY = 500
+"""Finished jobs kept for polling before the oldest are forgotten."""
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETE = "complete"
+    STOPPED = "stopped"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+FINISHED = (JobStatus.COMPLETE, JobStatus.STOPPED, JobStatus.CANCELLED, JobStatus.FAILED)
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by ``submit`` when ``JOB_QUEUE_SIZE`` jobs are already waiting."""
+
+
+class _JobCancelled(Exception):
+    """Aborts a job cancelled while its worker waited for an arm."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    test_data: dict[str, Any]
+    priority: int = 0
+    arm_id: str | None = None
+    runner_kwargs: dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    arm: str | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+    results: list[TestResult] = field(default_factory=list)
+    callbacks: list[StateCallback] = field(default_factory=list)
+    runner: TestRunner | None = None
+
+    @property
+    def test_name(self) -> str:
+        return self.test_data.get("name", "")
+
+
+def job_to_dict(job: Job, include_results: bool = True) -> dict[str, Any]:
+    """Serialize a Job for JSON/WebSocket transport."""
+    data: dict[str, Any] = {
+        "job_id": job.job_id,
+        "test": job.test_name,
+        "priority": job.priority,
+        "status": job.status.value,
+        "arm": job.arm,
+        "submitted_at": job.submitted_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+        "verdicts": [r.verdict for r in job.results],
+    }
+    if include_results:
+        data["results"] = [result_to_dict(r) for r in job.results]
+    return data
+
+
+class JobScheduler:
+    """Bounded priority queue of test runs, drained by one worker per arm.
+
+    Higher ``priority`` runs first; equal priorities run in submit order.
+    Results of finished jobs are appended to *store* when one is given.
+    Every job message is published to :attr:`hub` under the job id.
+    """
+
+    def __init__(self, pool: BridgePool, max_queued: int = JOB_QUEUE_SIZE,
+                 history: int = JOB_HISTORY, store: ResultsStore | None = None,
+                 hub: BroadcastHub | None = None) -> None:
+        self._pool = pool
+        self._store = store
+        self.hub = hub or BroadcastHub()
+        self._max_queued = max_queued
+        self._history = history
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._seq = itertools.count()
+        self._queue: list[tuple[int, int, str]] = []  # sorted (-priority, seq, job_id)
+        self._queue_changed: asyncio.Condition | None = None
+        self._workers: dict[str, asyncio.Task] = {}  # arm id -> worker
+        self._listeners: set[StateCallback] = set()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def ensure_started(self) -> None:
+        """Start the workers on the running loop (idempotent).
+
+        If the workers belong to another (closed) loop they are replaced and
+        any still-queued jobs are re-queued.
+        """
+        loop = asyncio.get_running_loop()
+        workers = self._workers.values()
+        if not workers or not all(w.get_loop() is loop and not w.done() for w in workers):
+            for w in workers:
+                if w.get_loop() is loop:
+                    w.cancel()
+            self._workers = {}
+            self._queue_changed = asyncio.Condition()
+            self._queue = []
+            for job in self._jobs.values():
+                if job.status == JobStatus.QUEUED:
+                    self._queue.append((-job.priority, next(self._seq), job.job_id))
+            self._queue.sort()
+        # One worker per arm; arms can join the pool later (rediscovery).
+        for arm in self._pool.arms:
+            if arm.arm_id not in self._workers:
+                self._workers[arm.arm_id] = asyncio.create_task(
+                    self._worker(arm.arm_id), name=f"job-worker:{arm.arm_id}",
+                )
+
+    async def stop(self) -> None:
+        """Stop running jobs and shut the workers down."""
+        for job in self._jobs.values():
+            if job.runner is not None:
+                job.runner.stop()
+        for w in self._workers.values():
+            w.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers = {}
+
+    # -- public API --------------------------------------------------------
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for j in self._jobs.values() if j.status == JobStatus.QUEUED)
+
+    def subscribe(self, callback: StateCallback) -> None:
+        """Receive every job's messages (tagged with ``job_id``)."""
+        self._listeners.add(callback)
+
+    def unsubscribe(self, callback: StateCallback) -> None:
+        self._listeners.discard(callback)
+
+    def submit(
+        self,
+        test_data: dict[str, Any],
+        priority: int = 0,
+        arm_id: str | None = None,
+        on_state_change: StateCallback | None = None,
+        **runner_kwargs: Any,
+    ) -> Job:
+        """Queue a test run. Raises ``JobQueueFull`` if the queue is full."""
+        self.ensure_started()
+        if self.queued >= self._max_queued:
+            raise JobQueueFull(f"Job queue full ({self._max_queued} waiting)")
+        if arm_id is not None:
+            self._pool.get(arm_id)  # KeyError for unknown arms, before queueing
+        job = Job(
+            job_id=uuid.uuid4().hex[:12],
+            test_data=test_data,
+            priority=priority,
+            arm_id=arm_id,
+            runner_kwargs=runner_kwargs,
+        )
+        if on_state_change:
+            job.callbacks.append(on_state_change)
+        self._jobs[job.job_id] = job
+        bisect.insort(self._queue, (-priority, next(self._seq), job.job_id))
+        asyncio.get_running_loop().create_task(self._queue_updated())
+        self._trim_history()
+        logger.info("Job %s queued: %s (priority %d)", job.job_id, job.test_name, priority)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        try:
+            return self._jobs[job_id]
+        except KeyError:
+            raise KeyError(f"Unknown job: {job_id}") from None
+
+    def list_jobs(self, status: JobStatus | None = None) -> list[Job]:
+        return [j for j in self._jobs.values() if status is None or j.status == status]
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued job, or stop a running one after its current step.
+
+        A job whose worker is still waiting for its arm counts as queued; it
+        is skipped once the arm is granted.
+        """
+        job = self.get(job_id)
+        if job.status == JobStatus.QUEUED:
+            self._set_status(job, JobStatus.CANCELLED)
+            job.finished_at = time.time()
+        elif job.status == JobStatus.RUNNING and job.runner is not None:
+            job.runner.stop()
+        return job
+
+    # -- internals ---------------------------------------------------------
+
+    def _trim_history(self) -> None:
+        finished = [j.job_id for j in self._jobs.values() if j.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self._history)]:
+            del self._jobs[job_id]
+
+    async def _notify(self, job: Job, msg: dict[str, Any]) -> None:
+        msg = {**msg, "job_id": job.job_id}
+        self.hub.publish(job.job_id, msg)
+        for callback in [*job.callbacks, *self._listeners]:
+            try:
+                await callback(msg)
+            except Exception:
+                logger.exception("Job listener error")
+
+    async def _notify_status(self, job: Job, msg: dict[str, Any], final: bool) -> None:
+        await self._notify(job, msg)
+        if final:
+            self.hub.drop_topic(job.job_id)
+
+    def _set_status(self, job: Job, status: JobStatus) -> None:
+        job.status = status
+        msg = {"type": "job", "job": job_to_dict(job, include_results=False)}
+        asyncio.get_running_loop().create_task(self._notify_status(job, msg, status in FINISHED))
+
+    async def _queue_updated(self) -> None:
+        async with self._queue_changed:
+            self._queue_changed.notify_all()
+
+    def _take(self, arm_id: str) -> Job | None:
+        """Pop the first queued job that is unpinned or pinned to *arm_id*."""
+        for entry in list(self._queue):
+            job = self._jobs.get(entry[2])
+            if job is None or job.status != JobStatus.QUEUED:
+                self._queue.remove(entry)  # cancelled (or forgotten) while waiting
+            elif job.arm_id in (None, arm_id):
+                self._queue.remove(entry)
+                return job
+        return None
+
+    async def _worker(self, arm_id: str) -> None:
+        while True:
+            async with self._queue_changed:
+                job = await self._queue_changed.wait_for(lambda: self._take(arm_id))
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        def attach(runner: TestRunner) -> None:
+            # Called with the arm leased, right before the run starts
+            if job.status == JobStatus.CANCELLED:
+                raise _JobCancelled
+            job.runner = runner
+            job.started_at = time.time()
+            self._set_status(job, JobStatus.RUNNING)
+
+        async def forward(msg: dict[str, Any]) -> None:
+            job.arm = msg.get("arm", job.arm)
+            await self._notify(job, msg)
+
+        try:
+            job.results = await self._pool.run_test(
+                job.test_data,
+                arm_id=job.arm_id,
+                on_state_change=forward,
+                on_runner=attach,
+                **job.runner_kwargs,
+            )
+            stopped = job.runner is not None and job.runner.state == RunState.STOPPED
+            status = JobStatus.STOPPED if stopped else JobStatus.COMPLETE
+        except _JobCancelled:
+            logger.info("Job %s cancelled while waiting for an arm", job.job_id)
+            return
+        except asyncio.CancelledError:
+            job.error = "scheduler stopped"
+            job.finished_at = time.time()
+            job.status = JobStatus.FAILED
+            raise
+        except Exception as exc:
+            logger.exception("Job %s failed", job.job_id)
+            job.error = str(exc)
+            status = JobStatus.FAILED
+        job.finished_at = time.time()
+        job.runner = None
+        if self._store is not None and job.results:
+            try:
+                await asyncio.to_thread(
+                    self._store.append, job.results, arm=job.arm, job_id=job.job_id,
+                    recorded_at=job.finished_at,
+                )
+            except Exception:
+                logger.exception("Could not persist results of job %s", job.job_id)
+        self._set_status(job, status)
+        self._trim_history()
@@ -3,27 +3,52 @@
 Endpoints:
     GET  /tests        — list available tests
     GET  /tests/{name} — load specific test
+    GET  /tests/{name}/plan — dry-run timeline, durations and predicted poses
+    GET  /tests/{name}/optimize — faster equivalent test and the time saved
     POST /tests        — save new test (record mode)
-    GET  /health       — bridge status & diagnostics
+    GET  /health       — cached arm liveness & diagnostics (no serial traffic)
+    GET  /metrics      — Prometheus metrics (serial RTT, step drift, WS queues)
+    GET  /arms         — per-arm status of the bridge pool
+    POST /jobs         — queue a test run
+    GET  /jobs         — list jobs
+    GET  /jobs/{id}    — job status and results
+    DELETE /jobs/{id}  — cancel / stop a job
+    GET  /results      — stored result history (filterable)
+    GET  /results/summary — per-test aggregates over the history
+    GET  /results/{id} — one stored result with its steps
     WS   /ws           — bidirectional real-time channel
 
 WebSocket messages (JSON):
-    Frontend → Backend:  run_test, pause, stop, jog, read_angles, ping
-    Backend → Frontend:  state, step_complete, test_complete, angles, pong, error
+    Frontend → Backend:  run_test, pause, resume, stop, jog, read_angles, ping,
+                         get_job, cancel_job, list_jobs, watch, unwatch
+    Backend → Frontend:  state, predicted_angles, trajectory, telemetry, step_complete,
+                         test_complete, job, jobs, watching, angles, pong, error
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from contextlib import asynccontextmanager
+import math
+from contextlib import asynccontextmanager, suppress
+from typing import Any, Awaitable
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-
-from .serial_bridge import MockSerialBridge, SerialBridge
-from .test_runner import TestRunner, list_tests, load_test, save_test
+from fastapi.responses import JSONResponse, Response
+
+from . import wire
+from .bridge_pool import Arm, BridgePool
+from .health import HealthMonitor
+from .hub import ALL_TOPICS
+from .instrumentation import CONTENT_TYPE, REGISTRY, WS_CLIENTS, WS_QUEUE_DEPTH, WS_QUEUE_DEPTH_MAX
+from .jobs import Job, JobQueueFull, JobScheduler, JobStatus, job_to_dict
+from .optimizer import optimize_test
+from .outbox import ClientOutbox
+from .planner import plan_cache
+from .results_store import ResultsStore
+from .serial_bridge import BridgeProtocol
+from .test_runner import STREAM_MODES, list_tests, load_test, save_test, test_catalog
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,11 +56,16 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    test_catalog.refresh(force=True)  # parse every test file once, up front
     yield
-    # Shutdown: disconnect serial bridge to prevent port lockup
-    if _bridge is not None:
-        logger.info("Shutting down — disconnecting bridge")
-        await _bridge.disconnect()
+    if _health_monitor is not None:
+        await _health_monitor.stop()
+    if _scheduler is not None:
+        await _scheduler.stop()
+    # Shutdown: disconnect serial bridges to prevent port lockup
+    if _pool is not None:
+        logger.info("Shutting down — disconnecting bridges")
+        await _pool.close()
 
 
 app = FastAPI(title="Accessware", version="0.1.0", lifespan=lifespan)
@@ -48,26 +78,141 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# -- Bridge singleton (auto-fallback to mock) --------------------------------
+# -- Bridge pool (auto-fallback to mock) -------------------------------------
 
-_bridge: SerialBridge | MockSerialBridge | None = None
+_pool: BridgePool | None = None
+_pool_lock = asyncio.Lock()
 
 
-async def get_bridge() -> SerialBridge | MockSerialBridge:
-    global _bridge
-    if _bridge is not None:
-        return _bridge
-    try:
-        bridge = SerialBridge()
-        await bridge.connect()
-        _bridge = bridge
-        logger.info("Using real serial bridge")
-    except Exception as exc:
-        logger.warning("Serial unavailable (%s), falling back to mock", exc)
-        bridge = MockSerialBridge()
-        await bridge.connect()
-        _bridge = bridge
-    return _bridge
+async def get_pool() -> BridgePool:
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await BridgePool.discover()
+    _pool.ensure_rediscovery()
+    return _pool
+
+
+async def get_bridge(arm_id: str | None = None) -> BridgeProtocol:
+    """Bridge of *arm_id*, or of the default (first) arm."""
+    return (await get_pool()).get(arm_id).bridge
+
+
+_outboxes: set[ClientOutbox] = set()  # one per connected WebSocket client
+
+WS_CLIENTS.set_function(lambda: len(_outboxes))
+WS_QUEUE_DEPTH.set_function(lambda: sum(o.depth for o in _outboxes))
+WS_QUEUE_DEPTH_MAX.set_function(lambda: max((o.depth for o in _outboxes), default=0))
+
+_results_store: ResultsStore | None = None
+
+
+def get_results_store() -> ResultsStore:
+    global _results_store
+    if _results_store is None:
+        _results_store = ResultsStore()
+    return _results_store
+
+
+_scheduler: JobScheduler | None = None
+
+
+async def get_scheduler() -> JobScheduler:
+    global _scheduler
+    pool = await get_pool()
+    if _scheduler is None:
+        _scheduler = JobScheduler(pool, store=get_results_store())
+    _scheduler.ensure_started()
+    return _scheduler
+
+
+_health_monitor: HealthMonitor | None = None
+
+
+async def get_health_monitor() -> HealthMonitor:
+    global _health_monitor
+    pool = await get_pool()
+    if _health_monitor is None:
+        _health_monitor = HealthMonitor(pool)
+    _health_monitor.ensure_started()
+    return _health_monitor
+
+
+TELEMETRY_HZ_MIN, TELEMETRY_HZ_MAX = 4, 100
+"""``telemetry_hz`` range: the firmware period is 1-255 ms, and faster
+than 100 Hz would saturate even a binary link. The arm's bridge lowers
+the rate further to what its link carries (``min_telemetry_period_ms``)."""
+
+
+def _number(msg: dict, key: str, default: float, integer: bool = False) -> float:
+    """Numeric field *key* of *msg* (*default* if absent or null)."""
+    value = msg.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{key} must be a number, got {value!r}")
+    if integer and value != int(value):
+        raise ValueError(f"{key} must be an integer, got {value!r}")
+    return int(value) if integer else value
+
+
+def _job_options(msg: dict) -> dict[str, Any]:
+    """Validate the run options of a REST body / WS message into
+    ``JobScheduler.submit`` keyword arguments; ValueError on a bad field."""
+    arm_id = msg.get("arm")
+    if arm_id is not None and not isinstance(arm_id, str):
+        raise ValueError(f"arm must be a string, got {arm_id!r}")
+    batched = msg.get("batched", False)
+    if not isinstance(batched, bool) and batched is not None:
+        raise ValueError(f"batched must be true or false, got {batched!r}")
+    telemetry_hz = _number(msg, "telemetry_hz", 0)
+    if telemetry_hz and not TELEMETRY_HZ_MIN <= telemetry_hz <= TELEMETRY_HZ_MAX:
+        raise ValueError(f"telemetry_hz must be 0 (off) or {TELEMETRY_HZ_MIN}-{TELEMETRY_HZ_MAX}")
+    stream_fps = _number(msg, "stream_fps", 0)
+    if stream_fps < 0:
+        raise ValueError(f"stream_fps must not be negative, got {stream_fps!r}")
+    stream_mode = msg.get("stream", "poses")
+    if stream_mode not in STREAM_MODES:
+        raise ValueError(f"Unknown stream mode: {stream_mode!r}")
+    return {
+        "priority": _number(msg, "priority", 0, integer=True),
+        "arm_id": arm_id,
+        "batch_moves": bool(batched),
+        "telemetry_ms": round(1000 / telemetry_hz) if telemetry_hz else 0,
+        "stream_fps": float(stream_fps),
+        "stream_mode": stream_mode,
+    }
+
+
+def _submit_job(scheduler: JobScheduler, msg: dict) -> Job:
+    """Queue a run described by a REST body / WS message.
+
+    Raises FileNotFoundError (unknown test), KeyError (unknown arm),
+    ValueError (bad option) or JobQueueFull.
+    """
+    if not isinstance(msg["name"], str):
+        raise ValueError(f"name must be a string, got {msg['name']!r}")
+    options = _job_options(msg)
+    return scheduler.submit(load_test(msg["name"]), **options)
+
+
+async def _jog(pool: BridgePool, arm: Arm, angles: list[int], speed: int, outbox: ClientOutbox) -> None:
+    """Move *arm* for a WS ``jog`` and reply with the angles reached.
+
+    Runs as its own task so the connection keeps reading messages; an arm
+    that is running a job (or another jog) is refused instead of waited for.
+    """
+    async with pool.hold_if_idle(arm) as held:
+        if not held:
+            outbox.put({"type": "error", "message": f"Arm {arm.arm_id} is busy"})
+            return
+        try:
+            await arm.bridge.move(angles, speed)
+            current = await arm.bridge.read_angles()
+        except (ValueError, RuntimeError, OSError, asyncio.TimeoutError) as exc:
+            outbox.put({"type": "error", "message": f"Jog failed: {str(exc) or type(exc).__name__}"})
+            return
+    outbox.put({"type": "angles", "angles": current})
 
 
 # -- REST endpoints ----------------------------------------------------------
@@ -82,10 +227,28 @@ async def get_test(name: str):
     try:
         return load_test(name)
     except FileNotFoundError:
-        from fastapi.responses import JSONResponse
         return JSONResponse(status_code=404, content={"error": f"Test '{name}' not found"})
 
 
+@app.get("/tests/{name}/plan")
+async def get_test_plan(name: str, poses: bool = False):
+    try:
+        plan = await asyncio.to_thread(plan_cache.get, name)
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"error": f"Test '{name}' not found"})
+    return await asyncio.to_thread(plan.to_dict, include_poses=poses)
+
+
+@app.get("/tests/{name}/optimize")
+async def get_test_optimized(name: str, min_speed: int | None = None, reorder: bool = False):
+    try:
+        return optimize_test(load_test(name), min_speed=min_speed, reorder=reorder).to_dict()
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"error": f"Test '{name}' not found"})
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
 @app.post("/tests")
 async def create_test(data: dict):
     path = save_test(data)
@@ -94,104 +257,274 @@ async def create_test(data: dict):
 
 @app.get("/health")
 async def health():
-    bridge = await get_bridge()
-    healthy = await bridge.ping()
+    pool = await get_pool()
+    bridge = pool.default.bridge
+    monitor = await get_health_monitor()
+    cached = monitor.get()
     return {
         "bridge_type": bridge.bridge_type,
         "connected": bridge.connected,
-        "healthy": healthy,
+        "healthy": cached.healthy,
+        "rtt_ms": cached.to_dict()["rtt_ms"],
         "port": getattr(bridge, "_port", None),
+        "arms": pool.status(),
+        "health": monitor.snapshot(),
+        "queued": pool.queued,
+        "clients": [o.stats() for o in _outboxes],
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/arms")
+async def get_arms():
+    return (await get_pool()).status()
+
+
+@app.post("/jobs")
+async def create_job(data: dict):
+    if not data.get("name"):
+        return JSONResponse(status_code=400, content={"error": "Missing test name"})
+    scheduler = await get_scheduler()
+    try:
+        job = _submit_job(scheduler, data)
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"error": f"Test '{data['name']}' not found"})
+    except KeyError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc.args[0])})
+    except ValueError as exc:
+        return JSONResponse(status_code=400, content={"error": str(exc)})
+    except JobQueueFull as exc:
+        return JSONResponse(status_code=503, content={"error": str(exc)})
+    return job_to_dict(job, include_results=False)
+
+
+@app.get("/jobs")
+async def get_jobs(status: str | None = None):
+    scheduler = await get_scheduler()
+    try:
+        wanted = JobStatus(status) if status else None
+    except ValueError:
+        return JSONResponse(status_code=400, content={"error": f"Unknown status '{status}'"})
+    return [job_to_dict(j, include_results=False) for j in scheduler.list_jobs(wanted)]
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    scheduler = await get_scheduler()
+    try:
+        return job_to_dict(scheduler.get(job_id))
+    except KeyError:
+        return JSONResponse(status_code=404, content={"error": f"Job '{job_id}' not found"})
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    scheduler = await get_scheduler()
+    try:
+        return job_to_dict(scheduler.cancel(job_id), include_results=False)
+    except KeyError:
+        return JSONResponse(status_code=404, content={"error": f"Job '{job_id}' not found"})
+
+
+@app.get("/results")
+async def get_results(
+    test: str | None = None,
+    arm: str | None = None,
+    verdict: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    steps: bool = False,
+):
+    return await asyncio.to_thread(
+        get_results_store().query,
+        test_name=test, arm=arm, verdict=verdict, since=since, until=until,
+        limit=limit, offset=offset, include_steps=steps,
+    )
+
+
+@app.get("/results/summary")
+async def get_results_summary(
+    test: str | None = None,
+    arm: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+):
+    return await asyncio.to_thread(
+        get_results_store().summary, test_name=test, arm=arm, since=since, until=until,
+    )
+
+
+@app.get("/results/{result_id}")
+async def get_result(result_id: int):
+    try:
+        return await asyncio.to_thread(get_results_store().get, result_id)
+    except KeyError:
+        return JSONResponse(status_code=404, content={"error": f"Result {result_id} not found"})
+
+
 # -- WebSocket ---------------------------------------------------------------
 
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
-    bridge = await get_bridge()
-    runner: TestRunner | None = None
-
-    async def send_state(msg: dict):
-        try:
-            logger.info("WS OUT → %s", msg.get("type", "unknown"))
-            await ws.send_json(msg)
-        except Exception:
-            pass
+    pool = await get_pool()
+    scheduler = await get_scheduler()
+    job: Job | None = None  # latest job started from this connection
+    tasks: set[asyncio.Task] = set()  # keeps this connection's background tasks referenced
+
+    fmt = wire.FORMATS.get(ws.query_params.get("format", "json"))
+    if fmt is None:
+        await ws.send_text(wire.dumps({
+            "type": "error",
+            "message": f"Unknown format; available: {', '.join(wire.FORMATS)}",
+        }))
+        await ws.close()
+        return
+
+    async def send(payload: str | bytes):
+        wire.wire_log("WS OUT → %s", payload[:40])
+        if isinstance(payload, bytes):
+            await ws.send_bytes(payload)
+        else:
+            await ws.send_text(payload)
+
+    def spawn(coro: Awaitable[None], task_name: str) -> None:
+        task = asyncio.create_task(coro, name=task_name)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def close_overloaded() -> None:
+        # 1013 "Try Again Later": the client fell behind and may reconnect.
+        with suppress(RuntimeError):
+            await ws.close(code=1013)
+
+    # All outbound traffic goes through the outbox, so runners never wait
+    # on this client's socket. Job events reach it via the scheduler's hub.
+    name = f"{ws.client.host}:{ws.client.port}" if ws.client else "client"
+    outbox = ClientOutbox(
+        send, name=name, fmt=fmt,
+        on_overflow=lambda: spawn(close_overloaded(), f"ws-close:{name}"),
+    )
+    _outboxes.add(outbox)
+    outbox.start()
 
     try:
         while True:
             raw = await ws.receive_text()
             try:
-                msg = json.loads(raw)
-            except json.JSONDecodeError:
-                await ws.send_json({"type": "error", "message": "Invalid JSON"})
+                msg = wire.loads(raw)
+            except ValueError:
+                outbox.put({"type": "error", "message": "Invalid JSON"})
                 continue
 
             action = msg.get("type", "")
-            logger.info("WS IN  ← %s | %s", action, {k: v for k, v in msg.items() if k != "type"})
+            wire.wire_log("WS IN  ← %s | %s", action, msg)
+
+            arm_id = msg.get("arm")
+            try:
+                arm = pool.get(arm_id)
+            except KeyError as exc:
+                outbox.put({"type": "error", "message": str(exc.args[0])})
+                continue
 
             if action == "run_test":
                 test_name = msg.get("name")
                 if not test_name:
-                    await ws.send_json({"type": "error", "message": "Missing test name"})
+                    outbox.put({"type": "error", "message": "Missing test name"})
                     continue
                 try:
-                    test_data = load_test(test_name)
+                    job = _submit_job(scheduler, msg)
                 except FileNotFoundError:
-                    await ws.send_json({"type": "error", "message": f"Test '{test_name}' not found"})
+                    outbox.put({"type": "error", "message": f"Test '{test_name}' not found"})
                     continue
-                runner = TestRunner(bridge, on_state_change=send_state)
-                asyncio.create_task(_run_test_task(runner, test_data, ws))
+                except (ValueError, JobQueueFull) as exc:
+                    outbox.put({"type": "error", "message": str(exc)})
+                    continue
+                scheduler.hub.subscribe(job.job_id, outbox)
+                outbox.put({"type": "job", "job": job_to_dict(job, include_results=False)})
+
+            elif action in ("watch", "unwatch"):
+                topic = msg.get("job_id") or ALL_TOPICS
+                if topic != ALL_TOPICS:
+                    try:
+                        scheduler.get(topic)
+                    except KeyError as exc:
+                        outbox.put({"type": "error", "message": str(exc.args[0])})
+                        continue
+                if action == "watch":
+                    scheduler.hub.subscribe(topic, outbox)
+                else:
+                    scheduler.hub.unsubscribe(topic, outbox)
+                outbox.put({"type": "watching", "job_id": topic, "active": action == "watch"})
 
             elif action == "pause":
-                if runner:
-                    runner.pause()
-                    await ws.send_json({"type": "state", "state": "paused"})
+                if job and job.runner:
+                    job.runner.pause()
+                    outbox.put({"type": "state", "state": "paused"})
 
             elif action == "resume":
-                if runner:
-                    runner.resume()
-                    await ws.send_json({"type": "state", "state": "running"})
+                if job and job.runner:
+                    job.runner.resume()
+                    outbox.put({"type": "state", "state": "running"})
 
             elif action == "stop":
-                if runner:
-                    runner.stop()
-                    await ws.send_json({"type": "state", "state": "stopped"})
+                if job:
+                    scheduler.cancel(job.job_id)
+                    outbox.put({"type": "state", "state": "stopped"})
+
+            elif action in ("get_job", "cancel_job"):
+                try:
+                    found = scheduler.get(msg.get("job_id", ""))
+                except KeyError as exc:
+                    outbox.put({"type": "error", "message": str(exc.args[0])})
+                    continue
+                if action == "cancel_job":
+                    scheduler.cancel(found.job_id)
+                outbox.put({"type": "job", "job": job_to_dict(found)})
+
+            elif action == "list_jobs":
+                outbox.put({
+                    "type": "jobs",
+                    "jobs": [job_to_dict(j, include_results=False) for j in scheduler.list_jobs()],
+                })
 
             elif action == "jog":
                 # Direct servo control for record mode
                 angles = msg.get("angles")
                 speed = msg.get("speed", 15)
                 if angles and len(angles) == 4:
-                    await bridge.move(angles, speed)
-                    current = await bridge.read_angles()
-                    await ws.send_json({"type": "angles", "angles": current})
+                    spawn(_jog(pool, arm, angles, speed, outbox), f"jog:{arm.arm_id}")
 
             elif action == "read_angles":
-                current = await bridge.read_angles()
-                await ws.send_json({"type": "angles", "angles": current})
+                try:
+                    current = await arm.bridge.read_angles()
+                except (ValueError, OSError, asyncio.TimeoutError) as exc:
+                    outbox.put({"type": "error", "message": f"Read failed: {str(exc) or type(exc).__name__}"})
+                    continue
+                outbox.put({"type": "angles", "angles": current})
 
             elif action == "ping":
-                healthy = await bridge.ping()
-                await ws.send_json({"type": "pong", "healthy": healthy, "bridge_type": bridge.bridge_type})
+                cached = (await get_health_monitor()).get(arm_id)
+                outbox.put({
+                    "type": "pong",
+                    "healthy": cached.healthy,
+                    "rtt_ms": cached.to_dict()["rtt_ms"],
+                    "bridge_type": arm.bridge.bridge_type,
+                })
 
             else:
-                await ws.send_json({"type": "error", "message": f"Unknown action: {action}"})
+                outbox.put({"type": "error", "message": f"Unknown action: {action}"})
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
-        if runner:
-            runner.stop()
-
-
-async def _run_test_task(runner: TestRunner, test_data: dict, ws: WebSocket):
-    """Run a test in a background task so the WS loop stays responsive."""
-    try:
-        await runner.run_test(test_data)
-    except Exception as exc:
-        logger.exception("Test run failed")
-        try:
-            await ws.send_json({"type": "error", "message": str(exc)})
-        except Exception:
-            pass
+    finally:
+        # Jobs keep running without a browser; just stop streaming to it.
+        scheduler.hub.unsubscribe_all(outbox)
+        _outboxes.discard(outbox)
+        await outbox.close()
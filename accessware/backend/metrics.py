@@ -0,0 +1,326 @@
+"""Vectorized run metrics.
+
+A run's steps are converted to NumPy arrays once (:class:`StepArrays`);
+range coverage, direction reversals, extreme holds, path divergence and
+timing drift are then single array passes, so scoring is linear in the
+number of steps and stays in the millisecond range for recorded sessions
+with tens of thousands of steps. These batch functions are the offline
+scorers, for results that were not produced by a live run (recorded
+sessions, stored results, tests of the engine). A live run is scored by
+:class:`OnlineMetrics`, which maintains the same figures incrementally
+while the test runs and fills in the runner's results from them. Both
+paths judge the figures with the same rules (:func:`judge`).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from .test_runner import StepResult, TestResult
+
+SERVO_RANGE = 180.0
+"""Full servo travel (degrees) that range coverage is measured against."""
+
+MAX_REVERSALS = 4
+"""More sharp direction reversals than this raise an ergonomic flag."""
+
+EXTREME_HOLD_MS = 3000
+EXTREME_ANGLE_LOW = 20
+EXTREME_ANGLE_HIGH = 160
+"""Holding this long with any servo outside [low, high] raises a flag."""
+
+DIVERGENCE_FAIL_PCT = 10.0
+"""Path divergence (% of max possible) above which a run fails."""
+
+TIMING_DRIFT_WARN = 0.2
+"""Relative actual-vs-planned duration error above which a run warns."""
+
+
+@dataclass
+class StepArrays:
+    """Columnar view of a run's steps."""
+
+    targets: npt.NDArray[np.int64]  # (n, 4)
+    holds: npt.NDArray[np.int64]  # (n,)
+    planned: npt.NDArray[np.float64]  # (n,)
+    actual: npt.NDArray[np.float64]  # (n,)
+    labels: list[str]
+
+    @classmethod
+    def from_steps(cls, steps: list[StepResult]) -> StepArrays:
+        import numpy as np
+
+        n = len(steps)
+        return cls(
+            targets=np.array([s.target_angles for s in steps], dtype=np.int64).reshape(n, 4),
+            holds=np.fromiter((s.hold_ms for s in steps), dtype=np.int64, count=n),
+            planned=np.fromiter((s.planned_duration_ms for s in steps), dtype=np.float64, count=n),
+            actual=np.fromiter((s.actual_duration_ms for s in steps), dtype=np.float64, count=n),
+            labels=[s.label for s in steps],
+        )
+
+
+def range_coverage(targets: npt.NDArray[np.int64]) -> dict[str, float]:
+    """Per servo, the percentage of the 0-180 range the targets span."""
+    spans = targets.max(axis=0) - targets.min(axis=0)
+    return {f"servo{i + 1}": round(int(span) / SERVO_RANGE * 100, 1) for i, span in enumerate(spans)}
+
+
+def count_reversals(targets: npt.NDArray[np.int64]) -> int:
+    """Servo moves whose direction flips relative to the previous move.
+
+    Moves out of a pose equal to the first step's are not counted.
+    """
+    import numpy as np
+
+    if len(targets) < 3:
+        return 0
+    deltas = np.diff(targets, axis=0)  # deltas[k-1] = targets[k] - targets[k-1]
+    flips = deltas[1:] * deltas[:-1] < 0  # both non-zero, opposite signs
+    counted = (targets[1:-1] != targets[0]).any(axis=1)
+    return int(flips[counted].sum())
+
+
+def extreme_holds(arrays: StepArrays) -> list[str]:
+    """Labels of long holds with any servo near its mechanical limit."""
+    import numpy as np
+
+    extreme = ((arrays.targets < EXTREME_ANGLE_LOW) | (arrays.targets > EXTREME_ANGLE_HIGH)).any(axis=1)
+    return [arrays.labels[i] for i in np.flatnonzero(extreme & (arrays.holds >= EXTREME_HOLD_MS))]
+
+
+def path_divergence(targets: npt.NDArray[np.int64], designed: list[list[int]]) -> float:
+    """Mean absolute deviation from *designed*, as % of the max possible."""
+    import numpy as np
+
+    m = min(len(designed), len(targets))
+    if m == 0:
+        return 0.0
+    reference = np.asarray(designed[:m], dtype=np.int64)[:, :4]
+    total_dev = int(np.abs(reference - targets[:m]).sum())
+    return round(total_dev / (m * 4 * SERVO_RANGE) * 100, 2)
+
+
+def timing_drift(planned: npt.NDArray[np.float64], actual: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Relative duration error of every step with a non-zero plan."""
+    import numpy as np
+
+    moving = planned > 0
+    return np.abs(actual[moving] - planned[moving]) / planned[moving]
+
+
+def judge(reversals: int, extreme: list[str], divergence: float, drifted: bool) -> tuple[list[str], str]:
+    """Ergonomic flags and verdict of a repeat from its figures."""
+    flags = [f"sharp_reversals:{reversals}"] if reversals > MAX_REVERSALS else []
+    flags.extend(f"extreme_hold:{label}" for label in extreme)
+    verdict = "warning" if flags or drifted else "pass"
+    if divergence > DIVERGENCE_FAIL_PCT:
+        verdict = "fail"
+    return flags, verdict
+
+
+def compute_metrics(result: TestResult, test_data: dict[str, Any]) -> None:
+    """Fill in range_coverage, ergonomic_flags, path_divergence, verdict.
+
+    Offline scorer of a finished repeat; the runner uses
+    :meth:`OnlineMetrics.finish_repeat` instead.
+    """
+    if not result.steps:
+        return
+    arrays = StepArrays.from_steps(result.steps)
+
+    result.range_coverage.update(range_coverage(arrays.targets))
+    designed = test_data.get("designed_path", [])
+    if designed:
+        result.path_divergence = path_divergence(arrays.targets, designed)
+    flags, result.verdict = judge(
+        count_reversals(arrays.targets),
+        extreme_holds(arrays),
+        result.path_divergence,
+        bool((timing_drift(arrays.planned, arrays.actual) > TIMING_DRIFT_WARN).any()),
+    )
+    result.ergonomic_flags.extend(flags)
+
+
+def compute_repeatability(results: list[TestResult]) -> float:
+    """Variance across repeated runs (lower = more consistent).
+
+    Offline counterpart of :meth:`OnlineMetrics.repeatability`.
+    """
+    if len(results) < 2:
+        return 0.0
+
+    # Compare final angles of each step across runs
+    deviations: list[float] = []
+    step_count = min(len(r.steps) for r in results)
+    for step_idx in range(step_count):
+        for servo_idx in range(4):
+            values = [r.steps[step_idx].actual_end_angles[servo_idx] for r in results]
+            mean = sum(values) / len(values)
+            variance = sum((v - mean) ** 2 for v in values) / len(values)
+            deviations.append(math.sqrt(variance))
+
+    return round(sum(deviations) / len(deviations), 2) if deviations else 0.0
+
+
+class OnlineMetrics:
+    """Streaming accumulators updated once per completed step.
+
+    Tracks what :func:`compute_metrics` computes for the current repeat
+    (range, reversals, extreme holds, divergence, drift, verdict so far),
+    so :meth:`finish_repeat` scores a repeat without another pass, and
+    keeps a Welford mean/variance of every step's end angles across
+    repeats, so repeatability is available mid-run and costs nothing at
+    the end.
+    """
+
+    def __init__(self, designed_path: list[list[int]] | None = None) -> None:
+        self._designed = designed_path or []
+        # Across repeats: per step index, Welford (n, mean[4], m2[4]) of end angles
+        self._welford: list[tuple[int, list[float], list[float]]] = []
+        self._std_sum = 0.0  # sum of mean per-servo std over steps seen in >= 2 repeats
+        self._std_steps = 0
+        self.start_repeat()
+
+    def start_repeat(self) -> None:
+        """Reset the per-repeat accumulators (cross-repeat state is kept)."""
+        self.steps = 0
+        self._mins = [180] * 4
+        self._maxs = [0] * 4
+        self._first: list[int] | None = None
+        self._prev: list[int] | None = None
+        self._prev_delta: list[int] = [0] * 4
+        self.reversals = 0
+        self.extreme_holds: list[str] = []
+        self._dev_sum = 0
+        self._drift_n = 0
+        self._drift_sum = 0.0
+        self.drift_max = 0.0
+        self.drift_over = 0
+
+    def add_step(self, step_idx: int, step: StepResult) -> None:
+        target = step.target_angles
+        self.steps += 1
+        for i in range(4):
+            self._mins[i] = min(self._mins[i], target[i])
+            self._maxs[i] = max(self._maxs[i], target[i])
+
+        if self._prev is None:
+            self._first = target
+        else:
+            delta = [t - p for t, p in zip(target, self._prev)]
+            if self._prev != self._first:
+                self.reversals += sum(1 for d, pd in zip(delta, self._prev_delta) if d * pd < 0)
+            self._prev_delta = delta
+        self._prev = target
+
+        if step.hold_ms >= EXTREME_HOLD_MS and any(
+            a < EXTREME_ANGLE_LOW or a > EXTREME_ANGLE_HIGH for a in target
+        ):
+            self.extreme_holds.append(step.label)
+
+        if step_idx < len(self._designed):
+            self._dev_sum += sum(abs(d - t) for d, t in zip(self._designed[step_idx][:4], target))
+
+        if step.planned_duration_ms > 0:
+            drift = abs(step.actual_duration_ms - step.planned_duration_ms) / step.planned_duration_ms
+            self._drift_n += 1
+            self._drift_sum += drift
+            self.drift_max = max(self.drift_max, drift)
+            self.drift_over += drift > TIMING_DRIFT_WARN
+
+        self._update_welford(step_idx, step.actual_end_angles)
+
+    def _update_welford(self, step_idx: int, end_angles: list[int]) -> None:
+        if step_idx == len(self._welford):
+            self._welford.append((0, [0.0] * 4, [0.0] * 4))
+        n, mean, m2 = self._welford[step_idx]
+        old_std = self._step_std(n, m2)
+        n += 1
+        for i, x in enumerate(end_angles):
+            delta = x - mean[i]
+            mean[i] += delta / n
+            m2[i] += delta * (x - mean[i])
+        self._welford[step_idx] = (n, mean, m2)
+        if n >= 2:
+            self._std_sum += self._step_std(n, m2) - old_std
+        if n == 2:
+            self._std_steps += 1
+
+    @staticmethod
+    def _step_std(n: int, m2: list[float]) -> float:
+        """Mean over servos of the population std of one step's end angles."""
+        if n < 2:
+            return 0.0
+        return sum(math.sqrt(max(v, 0.0) / n) for v in m2) / 4
+
+    def repeatability(self, repeat_lengths: list[int] | None = None) -> float:
+        """Mean per-servo std of end angles across repeats.
+
+        With *repeat_lengths* (steps per finished repeat) this matches
+        :func:`compute_repeatability` over those repeats; without, it covers
+        every step index seen in at least two repeats so far.
+        """
+        if repeat_lengths is None:
+            return round(self._std_sum / self._std_steps, 2) if self._std_steps else 0.0
+        if len(repeat_lengths) < 2:
+            return 0.0
+        step_count = min(repeat_lengths)
+        if not step_count:
+            return 0.0
+        total = 0.0
+        for n, _, m2 in self._welford[:step_count]:
+            total += self._step_std(n, m2)
+        return round(total / step_count, 2)
+
+    @property
+    def path_divergence(self) -> float:
+        m = min(len(self._designed), self.steps)
+        return round(self._dev_sum / (m * 4 * SERVO_RANGE) * 100, 2) if m else 0.0
+
+    @property
+    def range_coverage(self) -> dict[str, float]:
+        return {
+            f"servo{i + 1}": round((self._maxs[i] - self._mins[i]) / SERVO_RANGE * 100, 1)
+            for i in range(4)
+        }
+
+    def _judge(self) -> tuple[list[str], str]:
+        return judge(self.reversals, self.extreme_holds, self.path_divergence, self.drift_over > 0)
+
+    @property
+    def verdict(self) -> str:
+        """Verdict of the current repeat so far."""
+        return self._judge()[1]
+
+    def finish_repeat(self, result: TestResult) -> None:
+        """Fill in *result*'s metrics from the current repeat, like
+        :func:`compute_metrics` over its steps."""
+        if not self.steps:
+            return
+        result.range_coverage.update(self.range_coverage)
+        result.path_divergence = self.path_divergence
+        flags, result.verdict = self._judge()
+        result.ergonomic_flags.extend(flags)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Partial metrics for the ``step_complete`` message."""
+        return {
+            "steps": self.steps,
+            "range_coverage": self.range_coverage,
+            "reversals": self.reversals,
+            "path_divergence": self.path_divergence,
+            "timing_drift": {
+                "mean": round(self._drift_sum / self._drift_n, 3) if self._drift_n else 0.0,
+                "max": round(self.drift_max, 3),
+                "over": self.drift_over,
+            },
+            "repeatability": self.repeatability(),
+            "verdict": self.verdict,
+        }
@@ -0,0 +1,203 @@
+"""Motion-aware step optimizer.
+
+A firmware move takes ``speed * (max_dist + 20)`` ms, so a step that does
+not move still pays ``speed * 20`` and the order of waypoints decides how
+far the arm travels. :func:`optimize_test` rewrites a test JSON to run in
+less time without changing what it exercises:
+
+- **No-op merging**: a step whose (clamped) target equals the previous
+  step's is dropped and its hold added to the previous step's hold.
+- **Speeds**: with ``min_speed``, every step runs at the fastest speed
+  allowed by that limit and by the step's own ``min_speed`` (if any);
+  steps are never slowed down.
+- **Reordering** (opt-in): consecutive steps sharing a ``group`` value are
+  freely orderable; each group is put in the order that minimises travel
+  time from the step before it to the step after it.
+
+``designed_path`` entries follow their steps. Times come from the planner,
+so the saving is the planned duration difference over all repeats.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+from dataclasses import dataclass, field
+from typing import Any
+
+from .interpolation import ANGLE_MAX, ANGLE_MIN, total_duration_ms
+from .planner import MAX_HOLD_MS, SPEED_MAX, SPEED_MIN, START_POSE, _clamp_speed, plan_test
+
+MAX_EXACT_GROUP = 7
+"""Groups up to this size are ordered exhaustively (7! = 5040 orders);
+larger ones greedily by nearest next waypoint."""
+
+
+@dataclass
+class Optimization:
+    test: dict[str, Any]
+    original_ms: int
+    optimized_ms: int
+    changes: list[str] = field(default_factory=list)
+
+    @property
+    def saved_ms(self) -> int:
+        return self.original_ms - self.optimized_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "test": self.test,
+            "original_ms": self.original_ms,
+            "optimized_ms": self.optimized_ms,
+            "saved_ms": self.saved_ms,
+            "changes": self.changes,
+        }
+
+
+def _pose(angles: list[int]) -> list[int]:
+    return [min(max(a, ANGLE_MIN), ANGLE_MAX) for a in angles]
+
+
+def _label(step: dict[str, Any], idx: int) -> str:
+    return step.get("label", f"step {idx}")
+
+
+def _speed(step: dict[str, Any], speed: int) -> int:
+    """Speed the firmware will run *step* at (clamped like ``plan_test``)."""
+    return _clamp_speed(step.get("speed", speed))
+
+
+# ---------------------------------------------------------------------------
+# Passes (each takes and returns the steps with their original indices)
+# ---------------------------------------------------------------------------
+
+Indexed = list[tuple[int, dict[str, Any]]]
+
+
+def _travel_ms(entry: list[int], order: Indexed, exit_step: dict[str, Any] | None, speed: int) -> int:
+    total = 0
+    current = entry
+    for _, step in order:
+        total += total_duration_ms(_speed(step, speed), current, step["angles"])
+        current = _pose(step["angles"])
+    if exit_step is not None:
+        total += total_duration_ms(_speed(exit_step, speed), current, exit_step["angles"])
+    return total
+
+
+def _best_order(entry: list[int], group: Indexed, exit_step: dict[str, Any] | None, speed: int) -> Indexed:
+    if len(group) <= MAX_EXACT_GROUP:
+        return list(min(
+            itertools.permutations(group),
+            key=lambda order: _travel_ms(entry, list(order), exit_step, speed),
+        ))
+    remaining = list(group)
+    order: Indexed = []
+    current = entry
+    while remaining:
+        nxt = min(remaining, key=lambda s: total_duration_ms(_speed(s[1], speed), current, s[1]["angles"]))
+        remaining.remove(nxt)
+        order.append(nxt)
+        current = _pose(nxt[1]["angles"])
+    return order
+
+
+def reorder_groups(steps: Indexed, speed: int, start: list[int], changes: list[str]) -> Indexed:
+    """Order each run of steps with the same ``group`` for least travel."""
+    result: Indexed = []
+    i = 0
+    while i < len(steps):
+        group_id = steps[i][1].get("group")
+        j = i + 1
+        while group_id is not None and j < len(steps) and steps[j][1].get("group") == group_id:
+            j += 1
+        group = steps[i:j]
+        if len(group) > 1:
+            entry = _pose(result[-1][1]["angles"]) if result else start
+            exit_step = steps[j][1] if j < len(steps) else None
+            best = _best_order(entry, group, exit_step, speed)
+            if _travel_ms(entry, best, exit_step, speed) < _travel_ms(entry, group, exit_step, speed):
+                group = best
+                labels = ", ".join(_label(s, idx) for idx, s in group)
+                changes.append(f"reordered group {group_id!r}: {labels}")
+        result.extend(group)
+        i = j
+    return result
+
+
+def merge_noops(steps: Indexed, changes: list[str]) -> Indexed:
+    """Fold steps that do not move into the previous step's hold."""
+    result: Indexed = []
+    for idx, step in steps:
+        if result:
+            prev_idx, prev = result[-1]
+            hold = max(prev.get("hold_ms", 0), 0) + max(step.get("hold_ms", 0), 0)
+            if _pose(step["angles"]) == _pose(prev["angles"]) and hold <= MAX_HOLD_MS:
+                prev["hold_ms"] = hold
+                changes.append(f"merged no-op step {_label(step, idx)!r} into {_label(prev, prev_idx)!r}")
+                continue
+        result.append((idx, step))
+    return result
+
+
+def pick_speeds(steps: Indexed, speed: int, min_speed: int, changes: list[str]) -> None:
+    """Run each step as fast as *min_speed* and its own ``min_speed`` allow."""
+    faster: dict[tuple[int, bool], int] = {}  # (limit applied, step's own) -> steps
+    for _, step in steps:
+        own = step.get("min_speed", SPEED_MIN)
+        limit = max(min_speed, own, SPEED_MIN)
+        if limit < _speed(step, speed):
+            step["speed"] = limit
+            key = (limit, own > min_speed)
+            faster[key] = faster.get(key, 0) + 1
+    for (limit, own), count in sorted(faster.items()):
+        if own:
+            changes.append(f"sped up {count} step(s) to their own {limit} ms/tick min_speed")
+        else:
+            changes.append(f"sped up {count} step(s) to the {limit} ms/tick limit")
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def optimize_test(
+    test_data: dict[str, Any],
+    min_speed: int | None = None,
+    reorder: bool = False,
+    start_angles: list[int] | None = None,
+) -> Optimization:
+    """Return a faster equivalent of *test_data* and the planned time saved.
+
+    Raises ``ValueError`` if the test cannot be planned.
+    """
+    original = plan_test(test_data, start_angles)
+    if not original.feasible:
+        errors = "; ".join(i.message for i in original.issues if i.level == "error")
+        raise ValueError(f"Test cannot be planned: {errors}")
+    if min_speed is not None and not SPEED_MIN <= min_speed <= SPEED_MAX:
+        raise ValueError(f"min_speed must be {SPEED_MIN}-{SPEED_MAX}")
+
+    test = copy.deepcopy(test_data)
+    speed = original.speed
+    changes: list[str] = []
+    steps: Indexed = list(enumerate(test["steps"]))
+    if reorder:
+        steps = reorder_groups(steps, speed, _pose(start_angles or START_POSE), changes)
+    steps = merge_noops(steps, changes)
+    if min_speed is not None:
+        pick_speeds(steps, speed, min_speed, changes)
+        speeds = {step.get("speed", speed) for _, step in steps}
+        if len(speeds) == 1:  # uniform again: keep it at the top level
+            test["speed"] = speeds.pop()
+            for _, step in steps:
+                step.pop("speed", None)
+
+    designed = test.get("designed_path")
+    if designed:
+        test["designed_path"] = [designed[i] for i, _ in steps if i < len(designed)] \
+            + designed[len(test["steps"]):]
+    test["steps"] = [step for _, step in steps]
+
+    optimized = plan_test(test, start_angles)
+    return Optimization(test, original.total_ms, optimized.total_ms, changes)
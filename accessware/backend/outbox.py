@@ -0,0 +1,160 @@
+"""Per-client outbound message queues for the WebSocket endpoint.
+
+Producers (test runners, job notifications, request handlers) only ever
+``put`` into a client's :class:`ClientOutbox`, which never blocks; a
+dedicated writer task drains it onto the socket. A slow browser therefore
+fills its own queue instead of stalling the runner's timing loop.
+Messages are queued as hub :class:`~.hub.Event` objects and written in
+the client's wire format, using the event's shared pre-encoded payload.
+
+Lossy stream messages (``predicted_angles``, ``telemetry``) are capped
+per client and the oldest is dropped when the cap is hit; every other
+message is delivered, in order. The two kinds wait in separate deques
+(merged by arrival number on the way out), so a drop is O(1). A client
+that falls so far behind that even its guaranteed backlog overflows is
+disconnected through ``on_overflow``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+from . import wire
+from .hub import Event
+from .instrumentation import WS_DROPPED, WS_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+LOSSY_TYPES = frozenset({"predicted_angles", "telemetry"})
+"""Message types that may be dropped (oldest first) under backpressure."""
+
+WS_QUEUE_SIZE = 256
+"""Queued lossy messages per client before the oldest is dropped."""
+
+WS_BACKLOG_LIMIT = 10_000
+"""Total queued messages after which a client is considered dead."""
+
+
+class ClientOutbox:
+    """Bounded, drop-oldest-for-lossy send queue with its own writer task."""
+
+    def __init__(
+        self,
+        send: Callable[[str | bytes], Awaitable[None]],
+        maxsize: int = WS_QUEUE_SIZE,
+        backlog_limit: int = WS_BACKLOG_LIMIT,
+        name: str = "client",
+        fmt: wire.WireFormat = wire.JSON,
+        on_overflow: Callable[[], None] | None = None,
+    ) -> None:
+        self._send = send
+        self.format = fmt
+        self._maxsize = maxsize
+        self._backlog_limit = backlog_limit
+        self.name = name
+        self._on_overflow = on_overflow  # called once the backlog overflows, e.g. to close the socket
+        # (arrival number, event); guaranteed and lossy messages kept apart
+        self._ordered: deque[tuple[int, Event]] = deque()
+        self._lossy: deque[tuple[int, Event]] = deque()
+        self._arrivals = itertools.count()
+        self._ready = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop(), name=f"outbox-{self.name}")
+
+    async def close(self) -> None:
+        """Stop the writer and discard anything still queued."""
+        self._discard()
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+
+    def _discard(self) -> None:
+        self.closed = True
+        self._ordered.clear()
+        self._lossy.clear()
+
+    # -- producers ---------------------------------------------------------
+
+    def put(self, msg: dict[str, Any] | Event) -> None:
+        """Queue *msg*; never blocks."""
+        if self.closed:
+            return
+        event = msg if isinstance(msg, Event) else Event(msg)
+        if event.type in LOSSY_TYPES:
+            if len(self._lossy) >= self._maxsize:
+                self._lossy.popleft()
+                self.dropped += 1
+                WS_DROPPED.inc()
+            self._lossy.append((next(self._arrivals), event))
+        elif self.depth >= self._backlog_limit:
+            logger.warning("WS %s: %d messages backlogged, disconnecting", self.name, self.depth)
+            self._discard()
+            if self._writer is not None:
+                self._writer.cancel()  # it may be stuck sending to this very client
+            if self._on_overflow is not None:
+                self._on_overflow()
+            return
+        else:
+            self._ordered.append((next(self._arrivals), event))
+        self.max_depth = max(self.max_depth, self.depth)
+        self._ready.set()
+
+    async def send(self, msg: dict[str, Any]) -> None:
+        """``StateCallback`` adapter: queues and returns immediately."""
+        self.put(msg)
+
+    def _next(self) -> Event:
+        """Pop the earliest-queued message of either deque."""
+        if not self._lossy or (self._ordered and self._ordered[0][0] < self._lossy[0][0]):
+            return self._ordered.popleft()[1]
+        return self._lossy.popleft()[1]
+
+    # -- writer ------------------------------------------------------------
+
+    async def _write_loop(self) -> None:
+        while not self.closed:
+            if not self.depth:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            event = self._next()
+            try:
+                await self._send(event.encoded(self.format))
+            except Exception as exc:
+                self.errors += 1
+                logger.info("WS %s: send failed (%s), closing outbox", self.name, exc)
+                self._discard()
+                return
+            self.sent += 1
+            WS_MESSAGES.inc(type=event.type)
+
+    # -- metrics -----------------------------------------------------------
+
+    @property
+    def depth(self) -> int:
+        return len(self._ordered) + len(self._lossy)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "client": self.name,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "closed": self.closed,
+        }
@@ -0,0 +1,291 @@
+"""Offline dry-run planning of whole tests.
+
+Walks a test JSON (steps, holds, repeats) through the interpolation model
+without a bridge: the start pose of every move is the end pose of the one
+before, speeds (the test's, or a step's own ``speed``) and angles are
+clamped as the firmware clamps them, and each step takes
+``total_duration_ms`` plus its hold. The resulting :class:`TestPlan` has
+the step timeline, per-repeat and total runtime, the predicted pose
+stream and any problems found on the way, so bench time can be scheduled
+and broken tests caught before touching hardware. Repeats that start from
+the same pose move identically, so their poses are stored once (relative
+to the repeat's start) and only expanded into one stream on request.
+
+Plans of catalog tests are cached per file version (:data:`plan_cache`).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from .interpolation import ANGLE_MAX, ANGLE_MIN, trajectory_cache
+from .serial_bridge import MAX_SEQ_HOLD_MS
+from .test_runner import TestCatalog, test_catalog
+
+START_POSE = [90, 90, 90, 90]
+"""Pose assumed before the first step (the firmware's power-on pose)."""
+
+SPEED_MIN, SPEED_MAX = 1, 50
+"""Firmware ``clampSpeed`` range (ms per tick)."""
+
+MAX_HOLD_MS = MAX_SEQ_HOLD_MS
+"""Largest hold a MOVESEQ waypoint can carry (u16 on the firmware, both framings)."""
+
+PLAN_CACHE_SIZE = 128
+"""Number of test plans kept by :data:`plan_cache`."""
+
+
+@dataclass
+class PlanIssue:
+    level: str  # "error" (the test cannot run) or "warning"
+    message: str
+    step: int | None = None
+
+
+@dataclass
+class PlannedStep:
+    repeat: int
+    step: int
+    label: str
+    start_angles: list[int]
+    end_angles: list[int]
+    start_ms: int
+    move_ms: int
+    hold_ms: int
+
+    @property
+    def duration_ms(self) -> int:
+        return self.move_ms + self.hold_ms
+
+    @property
+    def end_ms(self) -> int:
+        return self.start_ms + self.duration_ms
+
+
+@dataclass
+class TestPlan:
+    test_name: str
+    speed: int
+    repeat_count: int
+    steps: list[PlannedStep] = field(default_factory=list)
+    cycles: list[list[list[int]]] = field(default_factory=list)  # [t_ms from repeat start, a1..a4]
+    repeat_cycles: list[int] = field(default_factory=list)  # index into cycles, per repeat
+    issues: list[PlanIssue] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> int:
+        return self.steps[-1].end_ms if self.steps else 0
+
+    @property
+    def feasible(self) -> bool:
+        return not any(issue.level == "error" for issue in self.issues)
+
+    @property
+    def poses(self) -> list[list[int]]:
+        """The full predicted pose stream, ``[t_ms, a1, a2, a3, a4]`` rows."""
+        starts = [s.start_ms for s in self.steps if s.step == 0]
+        return [
+            [start + t_ms, *angles]
+            for start, cycle in zip(starts, self.repeat_cycles)
+            for t_ms, *angles in self.cycles[cycle]
+        ]
+
+    def repeat_ms(self) -> list[int]:
+        totals = [0] * self.repeat_count
+        for s in self.steps:
+            totals[s.repeat] += s.duration_ms
+        return totals
+
+    def to_dict(self, include_poses: bool = False) -> dict[str, Any]:
+        plan: dict[str, Any] = {
+            "test": self.test_name,
+            "speed": self.speed,
+            "repeat_count": self.repeat_count,
+            "feasible": self.feasible,
+            "issues": [
+                {"level": i.level, "message": i.message, "step": i.step} for i in self.issues
+            ],
+            "total_ms": self.total_ms,
+            "repeat_ms": self.repeat_ms() if self.feasible else [],
+            "steps": [
+                {
+                    "repeat": s.repeat,
+                    "step": s.step,
+                    "label": s.label,
+                    "start": s.start_angles,
+                    "end": s.end_angles,
+                    "start_ms": s.start_ms,
+                    "move_ms": s.move_ms,
+                    "hold_ms": s.hold_ms,
+                    "end_ms": s.end_ms,
+                }
+                for s in self.steps
+            ],
+        }
+        if include_poses:
+            plan["poses"] = self.poses
+        return plan
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _clamp_speed(speed: int) -> int:
+    return min(max(speed, SPEED_MIN), SPEED_MAX)
+
+
+def _check_speed(speed: Any, issues: list[PlanIssue], step: int | None = None) -> None:
+    if not _is_int(speed):
+        issues.append(PlanIssue("error", f"speed must be an integer, got {speed!r}", step))
+    elif not SPEED_MIN <= speed <= SPEED_MAX:
+        issues.append(PlanIssue(
+            "warning", f"speed {speed} is clamped to {_clamp_speed(speed)} by the firmware", step,
+        ))
+
+
+def validate_test(test_data: dict[str, Any]) -> list[PlanIssue]:
+    """Problems that stop a test from running (errors) or that the
+    firmware silently corrects (warnings)."""
+    issues: list[PlanIssue] = []
+    _check_speed(test_data.get("speed", 15), issues)
+    repeat_count = test_data.get("repeat_count", 1)
+    if not _is_int(repeat_count) or repeat_count < 1:
+        issues.append(PlanIssue("error", f"repeat_count must be a positive integer, got {repeat_count!r}"))
+
+    steps = test_data.get("steps")
+    if not isinstance(steps, list) or not steps:
+        issues.append(PlanIssue("error", "test has no steps"))
+        return issues
+    for idx, step in enumerate(steps):
+        angles = step.get("angles") if isinstance(step, dict) else None
+        if not isinstance(angles, list) or len(angles) != 4 or not all(_is_int(a) for a in angles):
+            issues.append(PlanIssue("error", f"angles must be 4 integers, got {angles!r}", idx))
+            continue
+        clamped = [i + 1 for i, a in enumerate(angles) if not ANGLE_MIN <= a <= ANGLE_MAX]
+        if clamped:
+            servos = ", ".join(f"servo{i}" for i in clamped)
+            issues.append(PlanIssue(
+                "warning", f"{servos} outside {ANGLE_MIN}-{ANGLE_MAX} and clamped by the firmware", idx,
+            ))
+        if "speed" in step:
+            _check_speed(step["speed"], issues, idx)
+        hold = step.get("hold_ms", 0)
+        if not _is_int(hold):
+            issues.append(PlanIssue("error", f"hold_ms must be an integer, got {hold!r}", idx))
+        elif hold < 0:
+            issues.append(PlanIssue("warning", f"negative hold_ms {hold} is treated as 0", idx))
+        elif hold > MAX_HOLD_MS:
+            issues.append(PlanIssue(
+                "warning", f"hold_ms {hold} does not fit a MOVESEQ waypoint; batched runs finish it on the host", idx,
+            ))
+    return issues
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+def plan_test(test_data: dict[str, Any], start_angles: list[int] | None = None) -> TestPlan:
+    """Predict the full timeline of *test_data* (no steps if it has errors)."""
+    issues = validate_test(test_data)
+    speed = test_data.get("speed", 15)
+    repeat_count = test_data.get("repeat_count", 1)
+    plan = TestPlan(
+        test_name=test_data.get("name", ""),
+        speed=speed,
+        repeat_count=repeat_count,
+        issues=issues,
+    )
+    if not plan.feasible:
+        return plan
+
+    plan.speed = speed = _clamp_speed(speed)
+    current = list(start_angles or START_POSE)
+    t_ms = 0
+    cycle_of: dict[tuple[int, ...], int] = {}  # repeat start pose -> index into plan.cycles
+    for repeat_idx in range(repeat_count):
+        repeat_start = t_ms
+        poses: list[list[int]] | None = None  # None: same moves as an earlier repeat
+        if tuple(current) not in cycle_of:
+            cycle_of[tuple(current)] = len(plan.cycles)
+            poses = []
+            plan.cycles.append(poses)
+        plan.repeat_cycles.append(cycle_of[tuple(current)])
+        for step_idx, step in enumerate(test_data["steps"]):
+            hold_ms = max(step.get("hold_ms", 0), 0)
+            trajectory = trajectory_cache.get(current, step["angles"], _clamp_speed(step.get("speed", speed)))
+            if poses is not None:
+                for angles, elapsed in trajectory:
+                    poses.append([t_ms - repeat_start + int(elapsed), *angles])
+            end = trajectory.final_pose
+            planned = PlannedStep(
+                repeat=repeat_idx,
+                step=step_idx,
+                label=step.get("label", f"step {step_idx}"),
+                start_angles=current,
+                end_angles=end,
+                start_ms=t_ms,
+                move_ms=trajectory.duration_ms,
+                hold_ms=hold_ms,
+            )
+            plan.steps.append(planned)
+            if hold_ms and poses is not None:
+                poses.append([planned.end_ms - repeat_start, *end])
+            t_ms = planned.end_ms
+            current = end
+    return plan
+
+
+class PlanCache:
+    """LRU of catalog test plans, invalidated when the test file changes.
+    Safe to call from worker threads."""
+
+    def __init__(self, catalog: TestCatalog = test_catalog, maxsize: int = PLAN_CACHE_SIZE) -> None:
+        self._catalog = catalog
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict[str, tuple[tuple, TestPlan]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> TestPlan:
+        """Plan of catalog test *name*; raises ``FileNotFoundError``."""
+        with self._lock:
+            return self._get(name)
+
+    def _get(self, name: str) -> TestPlan:
+        version = self._catalog.version(name)
+        cached = self._plans.get(name)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            self._plans.move_to_end(name)
+            return cached[1]
+
+        self.misses += 1
+        plan = plan_test(self._catalog.get(name))
+        self._plans[name] = (version, plan)
+        self._plans.move_to_end(name)
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._plans), "maxsize": self.maxsize}
+
+
+plan_cache = PlanCache()
+"""Process-wide plan cache used by ``GET /tests/{name}/plan``."""
@@ -0,0 +1,195 @@
+"""Persistent, append-only store of TestResult history.
+
+Every finished run is appended to a local SQLite database, one row per
+repeat. The filter columns (test name, arm, timestamp, verdict) and the
+scalar metrics are real columns with indexes, so trend queries over
+thousands of runs never parse JSON; the full serialized result (steps
+included) is kept alongside for drill-down.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .test_runner import TestResult, result_to_dict
+
+RESULTS_DB = os.environ.get(
+    "ACCESSWARE_RESULTS_DB",
+    str(Path(__file__).resolve().parent.parent / "results" / "results.db"),
+)
+"""Database path (``:memory:`` for a throwaway store)."""
+
+MAX_QUERY_LIMIT = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at     REAL    NOT NULL,
+    test_name       TEXT    NOT NULL,
+    arm             TEXT,
+    job_id          TEXT,
+    repeat_index    INTEGER NOT NULL,
+    verdict         TEXT    NOT NULL,
+    total_time_ms   REAL    NOT NULL,
+    repeatability   REAL    NOT NULL,
+    path_divergence REAL    NOT NULL,
+    result          TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results (test_name, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_arm ON results (arm, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_verdict ON results (verdict, recorded_at);
+"""
+
+_SUMMARY_COLUMNS = (
+    "id, recorded_at, test_name, arm, job_id, repeat_index, verdict,"
+    " total_time_ms, repeatability, path_divergence"
+)
+
+
+class ResultsStore:
+    """SQLite-backed result history. Safe to call from worker threads."""
+
+    def __init__(self, path: str | Path = RESULTS_DB) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def append(
+        self,
+        results: list[TestResult],
+        arm: str | None = None,
+        job_id: str | None = None,
+        recorded_at: float | None = None,
+    ) -> list[int]:
+        """Append the repeats of one run in a single transaction; returns row ids."""
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        rows = [
+            (
+                recorded_at, r.test_name, arm, job_id, r.repeat_index, r.verdict,
+                r.total_time_ms, r.repeatability, r.path_divergence,
+                json.dumps(result_to_dict(r)),
+            )
+            for r in results
+        ]
+        ids: list[int] = []
+        with self._lock, self._conn:
+            for row in rows:
+                cur = self._conn.execute(
+                    "INSERT INTO results (recorded_at, test_name, arm, job_id, repeat_index,"
+                    " verdict, total_time_ms, repeatability, path_divergence, result)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    def query(
+        self,
+        test_name: str | None = None,
+        arm: str | None = None,
+        verdict: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        include_steps: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Matching rows, newest first.
+
+        Without *include_steps* only the indexed columns are read; with it
+        each row also carries the full serialized ``result``.
+        """
+        where, params = _filters(test_name, arm, verdict, since, until)
+        columns = _SUMMARY_COLUMNS + (", result" if include_steps else "")
+        limit = max(0, min(limit, MAX_QUERY_LIMIT))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM results{where}"
+                " ORDER BY recorded_at DESC, id DESC LIMIT ? OFFSET ?",
+                (*params, limit, max(0, offset)),
+            ).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    def get(self, result_id: int) -> dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS}, result FROM results WHERE id = ?", (result_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown result: {result_id}")
+        return _row_to_dict(row)
+
+    def count(self, **filters: Any) -> int:
+        where, params = _filters(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def summary(
+        self,
+        test_name: str | None = None,
+        arm: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Per-test aggregates (run counts by verdict, metric averages)."""
+        where, params = _filters(test_name, arm, None, since, until)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT test_name, COUNT(*) AS runs,"
+                " SUM(verdict = 'pass') AS passed,"
+                " SUM(verdict = 'warning') AS warnings,"
+                " SUM(verdict = 'fail') AS failed,"
+                " AVG(total_time_ms) AS avg_total_time_ms,"
+                " AVG(repeatability) AS avg_repeatability,"
+                " AVG(path_divergence) AS avg_path_divergence,"
+                " MIN(recorded_at) AS first_at, MAX(recorded_at) AS last_at"
+                f" FROM results{where} GROUP BY test_name ORDER BY test_name",
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _filters(
+    test_name: str | None = None,
+    arm: str | None = None,
+    verdict: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+) -> tuple[str, tuple[Any, ...]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    for column, value in (("test_name", test_name), ("arm", arm), ("verdict", verdict)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("recorded_at >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("recorded_at < ?")
+        params.append(until)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+
+def _row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
+    data = dict(row)
+    if "result" in data:
+        data["result"] = json.loads(data["result"])
+    return data
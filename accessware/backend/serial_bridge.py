@@ -1,29 +1,69 @@
 """Serial bridge to communicate with the CKK0006 robotic arm over USB.
 
-Sends MOVE/READ/PING commands and receives ACK/DONE/READY/PONG/ERR
+Sends MOVE/MOVESEQ/READ/PING commands and receives ACK/DONE/READY/PONG/ERR
 responses using the protocol defined in Sketches/serial_control/serial_control.ino.
 
 Provides both a real SerialBridge (pyserial) and a MockSerialBridge for
-development without hardware.
+development without hardware. A SerialBridge on a ``sim://`` port drives a
+tick-accurate simulated arm (``simulator.py``) through the real protocol.
+
+The link always starts as ASCII at ``DEFAULT_BAUD``. After READY the bridge
+can optionally negotiate a faster baud rate (``BAUD,<rate>``) and switch to
+CRC-checked binary frames (``BIN``, see ``framing.py``); firmware that
+rejects either request leaves the link on the ASCII/9600 fallback.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import os
+import threading
 import time
-from typing import Protocol
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+from .clock import SYSTEM_CLOCK, Clock
+from .framing import FrameDecoder, FramingError, LineDecoder, encode_ascii, encode_binary
+from .instrumentation import ACK_RETRIES, SERIAL_RTT, SERIAL_TIMEOUTS
+from .simulator import SIM_SCHEME, SimulatedArm
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_PORT = os.environ.get("ACCESSWARE_PORT", "/dev/cu.usbserial-2110")
 DEFAULT_BAUD = int(os.environ.get("ACCESSWARE_BAUD", "9600"))
+FAST_BAUD = int(os.environ.get("ACCESSWARE_FAST_BAUD", "0"))  # 0 = stay at DEFAULT_BAUD
+BINARY_FRAMING = os.environ.get("ACCESSWARE_BINARY", "").lower() in ("1", "true", "yes")
+SUPPORTED_BAUDS = (19200, 38400, 57600, 115200)  # must match serial_control.ino
+BAUD_SETTLE = 0.05  # seconds — let both UARTs reconfigure before probing
 READ_TIMEOUT = 5.0  # seconds — base timeout, extended dynamically for slow speeds
 READY_TIMEOUT = 5.0  # seconds — CH340 reset delay on connect
+PING_TIMEOUT = 2.0  # seconds
+READER_POLL = 0.1  # seconds — reader thread readline timeout (shutdown latency)
+MAX_SEQ_STEPS = 32  # waypoints per MOVESEQ upload (firmware buffer size)
+MAX_SEQ_HOLD_MS = 0xFFFF  # hold per MOVESEQ waypoint (u16 on the firmware)
+TELEMETRY_BUFFER = 512  # POS samples kept between drains (~5s at 100 Hz)
+TELEMETRY_LINK_SHARE = 0.5  # most of the link POS frames may take; the rest is for replies
 LOG_SERIAL = os.environ.get("LOG_SERIAL", "").lower() in ("1", "true", "yes")
 
 
+@dataclass
+class TelemetrySample:
+    """One ``POS`` frame pushed by the firmware while a move is running.
+
+    The servos have no position feedback, so *angles* are the angles the
+    firmware has actually written at *t_ms* (ms since that move started,
+    firmware clock) -- the ground truth the Python prediction mirrors.
+    """
+
+    t_ms: int
+    angles: list[int]
+    received_at: float  # time.monotonic() on arrival
+
+
 class BridgeProtocol(Protocol):
     """Interface shared by real and mock bridges."""
 
@@ -33,6 +73,11 @@ class BridgeProtocol(Protocol):
     async def wait_move_done(self) -> None: ...
     async def move(self, angles: list[int], speed: int) -> list[int]: ...
     async def read_angles(self) -> list[int]: ...
+    async def send_sequence(self, steps: list[tuple[list[int], int]], speed: int) -> list[int]: ...
+    async def wait_step_done(self) -> tuple[int, list[int]] | None: ...
+    async def stop_sequence(self) -> None: ...
+    async def set_telemetry(self, period_ms: int) -> None: ...
+    def drain_telemetry(self) -> list[TelemetrySample]: ...
     async def ping(self) -> bool: ...
     @property
     def connected(self) -> bool: ...
@@ -44,14 +89,72 @@ class BridgeProtocol(Protocol):
 # Real serial bridge
 # ---------------------------------------------------------------------------
 
-class SerialBridge:
-    """Communicates with the Arduino over a physical serial port."""
+@dataclass
+class _Pending:
+    """A command response the reader thread has not delivered yet."""
+
+    kind: str  # "ACK" | "DONE" | "PONG"
+    future: asyncio.Future
+    done: asyncio.Future | None = None  # MOVE's DONE, released if the MOVE is rejected
+
 
-    def __init__(self, port: str = DEFAULT_PORT, baud: int = DEFAULT_BAUD) -> None:
+class SerialBridge:
+    """Communicates with the Arduino over a physical serial port.
+
+    After the READY handshake a single reader thread owns ``readline``.
+    It hands each line to the event loop, where it is matched against the
+    pending responses in send order (the firmware answers commands
+    strictly sequentially). Commands therefore only write a line and await
+    a future, so READ/PING can be queued while a MOVE is in flight without
+    tying up a worker thread per request.
+
+    The firmware reads nothing while a move runs, so a reply can arrive
+    after its awaiter gave up. Such entries stay queued as placeholders
+    that swallow the late reply; otherwise it would be handed to the next
+    command of the same kind and every later reply would be off by one.
+    READ/PING timeouts are extended by the remaining time of the MOVE in
+    flight, and only one MOVE may be in flight at a time.
+    """
+
+    def __init__(
+        self,
+        port: str = DEFAULT_PORT,
+        baud: int = DEFAULT_BAUD,
+        fast_baud: int = FAST_BAUD,
+        binary: bool = BINARY_FRAMING,
+    ) -> None:
         self._port = port
         self._baud = baud
+        self._fast_baud = fast_baud
+        self._binary = binary
         self._serial = None  # type: ignore[assignment]
         self._connected = False
+        self._encode: Callable[[str], bytes] = encode_ascii
+        self._decoder: LineDecoder | FrameDecoder = LineDecoder()
+        self._binary_pending = False
+        self.bytes_tx = 0
+        self.bytes_rx = 0
+        self.last_rx: float | None = None  # time.monotonic() of the last line from the arm
+        self.on_link_lost: Callable[[Exception], None] | None = None  # called on the event loop
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader: threading.Thread | None = None
+        self._reader_stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._pending: deque[_Pending] = deque()
+        self._done_future: asyncio.Future | None = None
+        self._done_timeout = READ_TIMEOUT
+        self._move_until = 0.0  # time.monotonic() by which the MOVE in flight is done
+        # MOVESEQ state
+        self._seq_events: asyncio.Queue[str | Exception] | None = None
+        self._seq_remaining: list[tuple[list[int], int]] = []
+        self._seq_speed = 0
+        self._seq_offset = 0
+        self._seq_chunk_len = 0
+        self._seq_stopped = False
+        self._step_timeout = READ_TIMEOUT
+        # Telemetry ring buffer (filled by POS lines)
+        self._telemetry: deque[TelemetrySample] = deque(maxlen=TELEMETRY_BUFFER)
+        self.telemetry_dropped = 0
 
     @property
     def connected(self) -> bool:
@@ -60,6 +163,9 @@ class SerialBridge:
     # -- blocking helpers (run via asyncio.to_thread) ----------------------
 
     def _open(self) -> None:
+        if self._port.startswith(SIM_SCHEME):
+            self._serial = SimulatedArm.from_url(self._port, baudrate=self._baud, timeout=READ_TIMEOUT)
+            return
         import serial  # type: ignore[import-untyped]
         self._serial = serial.Serial(self._port, self._baud, timeout=READ_TIMEOUT)
 
@@ -71,81 +177,295 @@ class SerialBridge:
                 return
         raise TimeoutError("Did not receive READY from Arduino")
 
+    def _read_loop(self) -> None:
+        """Reader thread: decode incoming bytes and forward each message."""
+        loop = self._loop
+        while not self._reader_stop.is_set():
+            try:
+                data = self._serial.read(self._serial.in_waiting or 1)
+            except Exception as exc:  # port unplugged, closed under us, ...
+                if not self._reader_stop.is_set():
+                    loop.call_soon_threadsafe(self._on_reader_error, exc)
+                return
+            if not data:
+                continue
+            self.bytes_rx += len(data)
+            self._decoder.feed(data)
+            while (msg := self._decoder.next_message()) is not None:
+                if LOG_SERIAL:
+                    logger.info("SERIAL RX: %r", msg)
+                if msg == "BIN" and self._binary_pending:
+                    # Everything after the BIN reply is binary-framed.
+                    rest = self._decoder.take_buffer()
+                    self._decoder = FrameDecoder()
+                    self._decoder.feed(rest)
+                    self._binary_pending = False
+                loop.call_soon_threadsafe(self._dispatch_line, msg)
+
     def _send(self, cmd: str) -> None:
-        data = (cmd + "\n").encode("ascii")
+        data = self._encode(cmd)
         if LOG_SERIAL:
             logger.info("SERIAL TX: %r", cmd)
-        self._serial.write(data)
-        self._serial.flush()
-
-    def _readline(self) -> str:
-        raw = self._serial.readline()
-        line = raw.decode("ascii", errors="replace").strip()
-        if LOG_SERIAL and line:
-            logger.info("SERIAL RX: %r", line)
-        return line
-
-    def _send_move_cmd(self, angles: list[int], speed: int) -> list[int]:
-        """Send MOVE command, read ACK, return immediately (no DONE wait).
-
-        Sets serial timeout dynamically based on expected movement duration.
-        Retries once on ACK parse failure (line noise resilience).
+        # Commands are a few bytes; write() only copies into the OS buffer,
+        # so this is safe to call from the event loop.
+        with self._write_lock:
+            self._serial.write(data)
+        self.bytes_tx += len(data)
+
+    # -- response matching (event loop thread) -----------------------------
+
+    def _expect(self, kind: str, done: asyncio.Future | None = None, command: str = "") -> asyncio.Future:
+        """Register the reply to a command about to be sent; with *command*
+        its round-trip time is recorded under that label."""
+        future = self._loop.create_future()
+        self._pending.append(_Pending(kind, future, done))
+        if command:
+            sent = time.monotonic()
+
+            def record(f: asyncio.Future) -> None:
+                if not f.cancelled() and f.exception() is None:
+                    SERIAL_RTT.observe(time.monotonic() - sent, command=command)
+
+            future.add_done_callback(record)
+        return future
+
+    def _forget(self, *futures: asyncio.Future) -> None:
+        """Unregister replies to a command that was never sent."""
+        self._pending = deque(p for p in self._pending if p.future not in futures)
+
+    def _take(self, kinds: tuple[str, ...]) -> _Pending | None:
+        """Pop the oldest pending entry whose kind is in *kinds*.
+
+        Entries whose awaiter timed out or was cancelled are popped too:
+        the reply is theirs, and is discarded by the caller.
         """
-        # Dynamic timeout: worst case is 180 ticks * speed + hold + buffer
-        from .interpolation import total_duration_ms
-        move_ms = total_duration_ms(speed)
-        self._serial.timeout = max(READ_TIMEOUT, move_ms / 1000.0 + 2.0)
-
-        cmd = f"MOVE,{angles[0]},{angles[1]},{angles[2]},{angles[3]},{speed}"
-        self._send(cmd)
-        ack = self._readline()
+        for entry in self._pending:
+            if entry.kind in kinds:
+                self._pending.remove(entry)
+                if entry.future.done():
+                    logger.debug("Discarding late %s reply", entry.kind)
+                return entry
+        return None
+
+    def _move_remaining(self) -> float:
+        """Seconds until the MOVE in flight should be done (0 if none)."""
+        return max(0.0, self._move_until - time.monotonic())
+
+    def _dispatch_line(self, line: str) -> None:
+        self.last_rx = time.monotonic()
+        if line.startswith("ACK,"):
+            entry = self._take(("ACK",))
+            if entry is None:
+                logger.warning("Unsolicited ACK: %r", line)
+                return
+            if entry.future.done():
+                return
+            try:
+                entry.future.set_result(_parse_ack(line))
+            except ValueError as exc:
+                entry.future.set_exception(exc)
+        elif line.startswith(("DONE,", "SEQDONE,")):
+            if self._seq_events is None:
+                logger.warning("Sequence event outside MOVESEQ: %r", line)
+                return
+            self._seq_events.put_nowait(line)
+        elif line.startswith("POS,"):
+            try:
+                t_ms, *angles = (int(p) for p in line[4:].split(","))
+            except ValueError:
+                logger.warning("Bad telemetry line: %r", line)
+                return
+            if len(self._telemetry) == self._telemetry.maxlen:
+                self.telemetry_dropped += 1
+            self._telemetry.append(TelemetrySample(t_ms, angles, time.monotonic()))
+        elif line in ("DONE", "PONG", "BIN") or line.startswith(("BAUD,", "TELEM,")):
+            kind = line.split(",", 1)[0]
+            entry = self._take((kind,))
+            if entry is None:
+                logger.warning("Unsolicited %s", line)
+                return
+            if kind == "DONE":
+                self._move_until = 0.0
+            if not entry.future.done():
+                entry.future.set_result(line)
+        elif line.startswith("ERR"):
+            # ERR replaces the reply to whichever command the firmware was parsing.
+            entry = self._take(("ACK", "PONG", "BIN", "BAUD", "TELEM"))
+            if entry is None:
+                logger.warning("Unsolicited error from Arduino: %r", line)
+                return
+            if not entry.future.done():
+                entry.future.set_exception(ValueError(f"Arduino error: {line!r}"))
+            if entry.done is not None:
+                # A rejected MOVE never sends DONE: drop its entry too.
+                self._move_until = 0.0
+                with suppress(ValueError):
+                    self._pending.remove(next(p for p in self._pending if p.future is entry.done))
+                if not entry.done.done():
+                    entry.done.set_result(None)
+        elif line != "READY":
+            logger.warning("Ignoring unexpected serial line: %r", line)
+
+    def _on_reader_error(self, exc: Exception) -> None:
+        logger.error("Serial reader stopped: %s", exc)
+        self._connected = False
+        lost = ConnectionError(f"Serial link lost: {exc}")
+        self._fail_pending(lost)
+        if self.on_link_lost is not None:
+            self.on_link_lost(lost)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        while self._pending:
+            entry = self._pending.popleft()
+            if not entry.future.done():
+                entry.future.set_exception(exc)
+        if self._done_future is not None and not self._done_future.done():
+            self._done_future.set_exception(exc)
+        self._done_future = None
+        self._move_until = 0.0
+        if self._seq_events is not None:
+            self._seq_events.put_nowait(exc)  # wakes wait_step_done
+
+    async def _request(self, cmd: str, kind: str, timeout: float):
+        """Send *cmd* and await its *kind* reply. The firmware answers only
+        after the MOVE in flight, so that time is added to *timeout*."""
+        command = cmd.split(",", 1)[0]
+        future = self._expect(kind, command=command)
         try:
-            return _parse_ack(ack)
-        except ValueError:
-            # Retry once — could be line noise or an ERR response
-            logger.warning("ACK parse failed (%r), retrying READ", ack)
-            self._send("READ")
-            ack = self._readline()
-            return _parse_ack(ack)
-
-    def _wait_done(self) -> None:
-        """Block until DONE is received from the Arduino."""
-        done = self._readline()
-        if done != "DONE":
-            logger.warning("Expected DONE, got: %s", done)
-
-    def _send_read(self) -> list[int]:
-        self._serial.timeout = READ_TIMEOUT
-        self._send("READ")
-        ack = self._readline()
-        return _parse_ack(ack)
-
-    def _send_ping(self) -> bool:
-        """Send PING, expect PONG. Returns True if healthy."""
-        self._serial.timeout = 2.0
-        self._send("PING")
-        resp = self._readline()
-        return resp == "PONG"
+            self._send(cmd)  # FramingError (a ValueError) if it has no binary frame
+        except Exception:
+            self._forget(future)
+            raise
+        try:
+            return await asyncio.wait_for(future, timeout + self._move_remaining())
+        except asyncio.TimeoutError:
+            SERIAL_TIMEOUTS.inc(command=command)
+            raise
 
     # -- async public API --------------------------------------------------
 
     async def connect(self) -> None:
         await asyncio.to_thread(self._open)
-        await asyncio.to_thread(self._wait_ready)
+        try:
+            await asyncio.to_thread(self._wait_ready)
+        except BaseException:
+            self._serial.close()  # not an arm (or not booting); free the port
+            raise
+        self._loop = asyncio.get_running_loop()
+        # From here on only the reader thread calls readline; a short timeout
+        # lets it notice disconnect() promptly.
+        self._serial.timeout = READER_POLL
+        self._reader_stop.clear()
+        self._reader = threading.Thread(
+            target=self._read_loop, name=f"serial-reader:{self._port}", daemon=True,
+        )
+        self._reader.start()
         self._connected = True
         logger.info("Connected to %s", self._port)
+        if self._fast_baud and self._fast_baud != self._baud:
+            await self._negotiate_baud(self._fast_baud)
+        if self._binary:
+            await self._negotiate_binary()
+
+    async def _negotiate_baud(self, rate: int) -> None:
+        """Ask the firmware to switch to *rate*; keep the old rate on failure.
+
+        The firmware answers ``BAUD,<rate>`` at the old rate, switches, and
+        falls back on its own if no PING arrives at the new rate within 1s.
+        """
+        if rate not in SUPPORTED_BAUDS:
+            raise ValueError(f"Unsupported baud rate {rate}; choose from {SUPPORTED_BAUDS}")
+        try:
+            await self._request(f"BAUD,{rate}", "BAUD", READ_TIMEOUT)
+        except (ValueError, asyncio.TimeoutError) as exc:
+            logger.info("Baud negotiation unsupported (%s), staying at %d", exc, self._baud)
+            return
+        old = self._serial.baudrate
+        self._serial.baudrate = rate
+        await asyncio.sleep(BAUD_SETTLE)
+        if await self.ping():
+            logger.info("Serial link now at %d baud", rate)
+            return
+        logger.warning("No PONG at %d baud, reverting to %d", rate, old)
+        self._serial.baudrate = old
+        await asyncio.sleep(1.0 + BAUD_SETTLE)  # firmware reverts after 1s
+        if not await self.ping():
+            raise ConnectionError(f"Lost link after failed switch to {rate} baud")
+
+    async def _negotiate_binary(self) -> None:
+        """Switch both sides to binary frames; stay on ASCII if rejected."""
+        self._binary_pending = True
+        try:
+            await self._request("BIN", "BIN", READ_TIMEOUT)
+        except (ValueError, asyncio.TimeoutError) as exc:
+            self._binary_pending = False
+            logger.info("Binary framing unsupported (%s), using ASCII", exc)
+            return
+        self._encode = encode_binary
+        logger.info("Serial link now using binary framing")
+
+    @property
+    def framing(self) -> str:
+        return "binary" if self._encode is encode_binary else "ascii"
 
     async def disconnect(self) -> None:
+        self._reader_stop.set()
+        if self._reader is not None:
+            await asyncio.to_thread(self._reader.join, READER_POLL * 10)
+            self._reader = None
         if self._serial:
             self._serial.close()
         self._connected = False
+        self._fail_pending(ConnectionError("Serial bridge disconnected"))
         logger.info("Disconnected from %s", self._port)
 
     async def send_move(self, angles: list[int], speed: int) -> list[int]:
-        return await asyncio.to_thread(self._send_move_cmd, angles, speed)
+        """Send MOVE and return the ACK angles (does not wait for DONE).
+
+        Retries with a READ once if the ACK is malformed or an ERR comes
+        back (line noise resilience). Raises ``RuntimeError`` if the
+        previous MOVE has not been waited for with :meth:`wait_move_done`.
+        """
+        if self._done_future is not None and not self._done_future.done():
+            raise RuntimeError("A MOVE is already in flight; call wait_move_done() first")
+        # Worst case is 180 ticks * speed + hold; DONE may take that long.
+        from .interpolation import total_duration_ms
+        worst_s = total_duration_ms(speed) / 1000.0
+        self._done_timeout = max(READ_TIMEOUT, worst_s + 2.0)
+
+        cmd = f"MOVE,{angles[0]},{angles[1]},{angles[2]},{angles[3]},{speed}"
+        done = self._expect("DONE", command="DONE")
+        ack = self._expect("ACK", done=done, command="MOVE")
+        try:
+            self._send(cmd)
+        except Exception:
+            self._forget(done, ack)
+            raise
+        self._done_future = done
+        self._move_until = time.monotonic() + worst_s
+        try:
+            return await asyncio.wait_for(ack, READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            SERIAL_TIMEOUTS.inc(command="MOVE")
+            # Leave the DONE entry as a placeholder for a late DONE.
+            done.cancel()
+            self._done_future = None
+            raise
+        except ValueError as exc:
+            logger.warning("ACK parse failed (%s), retrying READ", exc)
+            ACK_RETRIES.inc()
+            return await self._request("READ", "ACK", READ_TIMEOUT)
 
     async def wait_move_done(self) -> None:
-        await asyncio.to_thread(self._wait_done)
+        """Wait until DONE is received for the last MOVE."""
+        done, self._done_future = self._done_future, None
+        if done is None:
+            return
+        try:
+            await asyncio.wait_for(done, self._done_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for DONE")
+            SERIAL_TIMEOUTS.inc(command="DONE")
 
     async def move(self, angles: list[int], speed: int) -> list[int]:
         result = await self.send_move(angles, speed)
@@ -153,14 +473,116 @@ class SerialBridge:
         return result
 
     async def read_angles(self) -> list[int]:
-        return await asyncio.to_thread(self._send_read)
+        return await self._request("READ", "ACK", READ_TIMEOUT)
+
+    async def send_sequence(self, steps: list[tuple[list[int], int]], speed: int) -> list[int]:
+        """Upload ``(angles, hold_ms)`` waypoints as MOVESEQ and start them.
+
+        Returns the ACK angles (position before the first step). Step
+        completions are then collected with :meth:`wait_step_done`; lists
+        longer than ``MAX_SEQ_STEPS`` are uploaded in chunks as each chunk
+        finishes.
+        """
+        waypoints = _waypoints(steps)
+        from .interpolation import total_duration_ms
+        self._seq_events = asyncio.Queue()
+        self._seq_remaining = waypoints
+        self._seq_speed = speed
+        self._seq_offset = 0
+        self._seq_chunk_len = 0
+        self._seq_stopped = False
+        max_hold = max(h for _, h in self._seq_remaining)
+        self._step_timeout = max(READ_TIMEOUT, (total_duration_ms(speed) + max_hold) / 1000.0 + 2.0)
+        try:
+            return await self._upload_chunk()
+        except Exception:
+            self._seq_events = None
+            raise
+
+    async def _upload_chunk(self) -> list[int]:
+        chunk = self._seq_remaining[:MAX_SEQ_STEPS]
+        del self._seq_remaining[:MAX_SEQ_STEPS]
+        self._seq_chunk_len = len(chunk)
+        lines = [f"MOVESEQ,{self._seq_speed},{len(chunk)}"]
+        lines += [f"{a[0]},{a[1]},{a[2]},{a[3]},{hold}" for a, hold in chunk]
+        return await self._request("\n".join(lines), "ACK", READ_TIMEOUT)
+
+    async def wait_step_done(self) -> tuple[int, list[int]] | None:
+        """Wait for the next ``DONE,i,a1,a2,a3,a4`` of the running sequence.
+
+        Returns ``(step_index, end_angles)``, or ``None`` once the sequence
+        has finished (or was stopped).
+        """
+        if self._seq_events is None:
+            return None
+        while True:
+            line = await asyncio.wait_for(self._seq_events.get(), self._step_timeout)
+            if isinstance(line, Exception):
+                self._seq_events = None
+                raise line
+            if line.startswith("DONE,"):
+                parts = line[5:].split(",")
+                if len(parts) != 5:
+                    raise ValueError(f"Bad sequence DONE: {line!r}")
+                return self._seq_offset + int(parts[0]), [int(p) for p in parts[1:]]
+            # SEQDONE,<executed>: chunk finished or was stopped
+            if self._seq_stopped or not self._seq_remaining:
+                self._seq_events = None
+                return None
+            self._seq_offset += self._seq_chunk_len
+            await self._upload_chunk()
+
+    async def stop_sequence(self) -> None:
+        """Ask the firmware to abort the sequence after the current step."""
+        if self._seq_events is None:
+            return
+        self._seq_stopped = True
+        self._seq_remaining.clear()
+        self._send("STOP")
+
+    async def set_telemetry(self, period_ms: int) -> None:
+        """Have the firmware push a POS frame every *period_ms* while moving.
+
+        ``0`` turns telemetry off. Shorter periods than the link can carry
+        are raised to :meth:`min_telemetry_period_ms` (~18 Hz on ASCII at
+        9600 baud), since a full TX buffer stalls the firmware's tick loop
+        and stretches the move. Raises ``ValueError`` if the firmware
+        refuses.
+        """
+        if not 0 <= period_ms <= 255:
+            raise ValueError("Telemetry period must be 0-255 ms")
+        floor = self.min_telemetry_period_ms()
+        if 0 < period_ms < floor:
+            logger.info("Telemetry every %d ms is too fast for this link, using %d ms", period_ms, floor)
+            period_ms = floor
+        await self._request(f"TELEM,{period_ms}", "TELEM", READ_TIMEOUT)
+        if period_ms == 0:
+            self._telemetry.clear()
+
+    def min_telemetry_period_ms(self) -> int:
+        """Shortest POS period that keeps to ``TELEMETRY_LINK_SHARE`` of the
+        link at its current baud rate and framing."""
+        frame = len(self._encode("POS,65535,180,180,180,180"))
+        baud = self._serial.baudrate if self._serial else self._baud
+        return math.ceil(frame * 10 * 1000 / baud / TELEMETRY_LINK_SHARE)  # 10 bits per byte
+
+    def drain_telemetry(self) -> list[TelemetrySample]:
+        """Return and clear all buffered telemetry samples (oldest first)."""
+        samples = list(self._telemetry)
+        self._telemetry.clear()
+        return samples
 
     async def ping(self) -> bool:
-        return await asyncio.to_thread(self._send_ping)
+        """Send PING, expect PONG. Returns True if healthy."""
+        try:
+            await self._request("PING", "PONG", PING_TIMEOUT)
+        except (asyncio.TimeoutError, ValueError, OSError):  # OSError: write to a dead port
+            return False
+        return True
 
     @property
     def bridge_type(self) -> str:
-        return "serial"
+        return "simulated" if self._port.startswith(SIM_SCHEME) else "serial"
 
 
 # ---------------------------------------------------------------------------
@@ -168,42 +590,93 @@ class SerialBridge:
 # ---------------------------------------------------------------------------
 
 class MockSerialBridge:
-    """Simulates the serial protocol for development without an Arduino."""
+    """Simulates the serial protocol for development without an Arduino.
+
+    Every command and reply is pushed through the same framing codec the
+    real link uses (ASCII lines, or binary frames with ``binary=True``), so
+    the byte-level protocol is exercised without hardware. Move and hold
+    timing follows *clock*; share a VirtualClock with the TestRunner to
+    fast-forward whole tests.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, binary: bool = False, clock: Clock | None = None) -> None:
+        self._clock = clock or SYSTEM_CLOCK
         self._angles = [90, 90, 90, 90]
         self._connected = False
         self._target: list[int] | None = None
         self._move_start: float = 0.0
         self._move_duration: float = 0.0
+        self._move_speed = 0
+        self._seq: deque[tuple[list[int], int]] | None = None
+        self._seq_speed = 0
+        self._seq_index = 0
+        self._seq_step_start: float = 0.0
+        self._encode: Callable[[str], bytes] = encode_binary if binary else encode_ascii
+        self._decoder: LineDecoder | FrameDecoder = FrameDecoder() if binary else LineDecoder()
+        self.bytes_tx = 0
+        self.bytes_rx = 0
+        self._telemetry_period = 0
+        self._telemetry_next = 0  # next sample time (ms) within the current move
+        self._telemetry_buf: deque[TelemetrySample] = deque(maxlen=TELEMETRY_BUFFER)
 
     @property
     def connected(self) -> bool:
         return self._connected
 
+    @property
+    def framing(self) -> str:
+        return "binary" if self._encode is encode_binary else "ascii"
+
+    def _wire(self, msg: str, outbound: bool = True) -> str:
+        """Round-trip *msg* through the framing codec, as the UART would."""
+        data = self._encode(msg)
+        if outbound:
+            self.bytes_tx += len(data)
+        else:
+            self.bytes_rx += len(data)
+        self._decoder.feed(data)
+        # ASCII carries multi-line messages (MOVESEQ) as several lines.
+        parts = []
+        while (part := self._decoder.next_message()) is not None:
+            parts.append(part)
+        decoded = "\n".join(parts)
+        if decoded != msg:
+            raise FramingError(f"Framing round trip changed {msg!r} into {decoded!r}")
+        return decoded
+
+    def _reply_angles(self) -> list[int]:
+        return _parse_ack(self._wire("ACK," + ",".join(map(str, self._angles)), outbound=False))
+
     async def connect(self) -> None:
         self._connected = True
-        logger.info("MockSerialBridge connected (no hardware)")
+        logger.info("MockSerialBridge connected (no hardware, %s framing)", self.framing)
 
     async def disconnect(self) -> None:
         self._connected = False
 
     async def send_move(self, angles: list[int], speed: int) -> list[int]:
         from .interpolation import total_duration_ms
-        before = list(self._angles)
+        if self._target is not None and self._clock.monotonic() - self._move_start < self._move_duration:
+            raise RuntimeError("A MOVE is already in flight; call wait_move_done() first")
+        self._wire(f"MOVE,{angles[0]},{angles[1]},{angles[2]},{angles[3]},{speed}")
+        before = self._reply_angles()
         self._target = list(angles)
-        self._move_start = time.monotonic()
+        self._move_start = self._clock.monotonic()
         self._move_duration = total_duration_ms(speed) / 1000.0
+        self._move_speed = speed
+        self._telemetry_next = 0
         return before
 
     async def wait_move_done(self) -> None:
         if self._target is None:
             return
-        remaining = self._move_duration - (time.monotonic() - self._move_start)
+        remaining = self._move_duration - (self._clock.monotonic() - self._move_start)
         if remaining > 0:
-            await asyncio.sleep(remaining)
+            await self._clock.sleep(remaining)
+        self._sample_motion()
         self._angles = list(self._target)
         self._target = None
+        self._wire("DONE", outbound=False)
 
     async def move(self, angles: list[int], speed: int) -> list[int]:
         result = await self.send_move(angles, speed)
@@ -211,10 +684,92 @@ class MockSerialBridge:
         return result
 
     async def read_angles(self) -> list[int]:
-        return list(self._angles)
+        self._wire("READ")
+        return self._reply_angles()
+
+    async def send_sequence(self, steps: list[tuple[list[int], int]], speed: int) -> list[int]:
+        self._seq = deque(_waypoints(steps))
+        self._wire("\n".join(
+            [f"MOVESEQ,{speed},{len(self._seq)}"]
+            + [f"{a[0]},{a[1]},{a[2]},{a[3]},{h}" for a, h in self._seq]
+        ))
+        self._seq_speed = speed
+        self._seq_index = 0
+        self._seq_step_start = self._clock.monotonic()
+        self._telemetry_next = 0
+        return self._reply_angles()
+
+    async def wait_step_done(self) -> tuple[int, list[int]] | None:
+        if not self._seq:
+            if self._seq is not None:
+                self._wire(f"SEQDONE,{self._seq_index}", outbound=False)
+            self._seq = None
+            return None
+        from .interpolation import total_duration_ms
+        angles, hold_ms = self._seq[0]
+        duration = (total_duration_ms(self._seq_speed) + hold_ms) / 1000.0
+        remaining = duration - (self._clock.monotonic() - self._seq_step_start)
+        if remaining > 0:
+            await self._clock.sleep(remaining)
+        self._sample_motion()  # while this step is still the one in motion
+        self._seq.popleft()
+        self._seq_step_start += duration
+        self._telemetry_next = 0
+        self._angles = list(angles)
+        index = self._seq_index
+        self._seq_index += 1
+        line = self._wire(f"DONE,{index}," + ",".join(map(str, self._angles)), outbound=False)
+        return index, [int(p) for p in line.split(",")[2:]]
+
+    async def stop_sequence(self) -> None:
+        if self._seq:
+            self._wire("STOP")
+            self._seq.clear()
+
+    async def set_telemetry(self, period_ms: int) -> None:
+        if not 0 <= period_ms <= 255:
+            raise ValueError("Telemetry period must be 0-255 ms")
+        self._wire(f"TELEM,{period_ms}")
+        self._wire(f"TELEM,{period_ms}", outbound=False)
+        self._telemetry_period = period_ms
+
+    def _current_motion(self) -> tuple[list[int], list[int], int, float] | None:
+        """(start angles, target, speed, start time) of the move in progress."""
+        if self._target is not None:
+            return self._angles, self._target, self._move_speed, self._move_start
+        if self._seq:
+            return self._angles, self._seq[0][0], self._seq_speed, self._seq_step_start
+        return None
+
+    def _sample_motion(self) -> None:
+        """Buffer the POS samples the firmware would have sent so far."""
+        motion = self._current_motion()
+        if not self._telemetry_period or motion is None:
+            return
+        from .interpolation import HOLD_MULTIPLIER, predict_angle_at_time, total_duration_ms
+        start, target, speed, started = motion
+        now = self._clock.monotonic()
+        # Firmware only reports while ticking (not during the trailing hold).
+        tick_ms = total_duration_ms(speed, start, target) - speed * HOLD_MULTIPLIER
+        end_ms = min((now - started) * 1000, tick_ms)
+        while self._telemetry_next <= end_ms:
+            t_ms = int(self._telemetry_next)
+            angles = predict_angle_at_time(start, target, speed, t_ms)
+            line = self._wire("POS," + ",".join(map(str, [t_ms, *angles])), outbound=False)
+            self._telemetry_buf.append(TelemetrySample(t_ms, [int(p) for p in line.split(",")[2:]], now))
+            self._telemetry_next += self._telemetry_period
+
+    def drain_telemetry(self) -> list[TelemetrySample]:
+        self._sample_motion()
+        samples = list(self._telemetry_buf)
+        self._telemetry_buf.clear()
+        return samples
 
     async def ping(self) -> bool:
-        return self._connected
+        if not self._connected:
+            return False
+        self._wire("PING")
+        return self._wire("PONG", outbound=False) == "PONG"
 
     @property
     def bridge_type(self) -> str:
@@ -225,6 +780,17 @@ class MockSerialBridge:
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _waypoints(steps: list[tuple[list[int], int]]) -> list[tuple[list[int], int]]:
+    """Copy MOVESEQ ``(angles, hold_ms)`` steps; ValueError if one cannot be sent."""
+    if not steps:
+        raise ValueError("MOVESEQ needs at least one step")
+    waypoints = [(list(a), int(h)) for a, h in steps]
+    for i, (_, hold) in enumerate(waypoints):
+        if not 0 <= hold <= MAX_SEQ_HOLD_MS:
+            raise ValueError(f"MOVESEQ step {i}: hold_ms {hold} outside 0-{MAX_SEQ_HOLD_MS}")
+    return waypoints
+
+
 def _parse_ack(line: str) -> list[int]:
     """Parse ``ACK,a1,a2,a3,a4`` into a list of 4 ints."""
     if not line.startswith("ACK,"):
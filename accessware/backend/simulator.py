@@ -0,0 +1,522 @@
+"""Tick-accurate simulated CKK0006 arm for load and soak testing.
+
+:class:`SimulatedArm` is a pyserial-compatible port object that runs the
+``serial_control.ino`` command loop on a thread, including ``moveServos``
+tick by tick (one degree per servo per ``delay(speed)``, early exit,
+180-tick cap, ``speed * 20`` settle), MOVESEQ with STOP, POS telemetry,
+BAUD/BIN negotiation and the sketch's ERR replies. Firmware time is a
+virtual clock that runs *warp* times faster than the wall clock, so hours
+of fatigue tests finish in seconds.
+
+Link and servo imperfections are configurable (:class:`SimConfig`):
+reply latency and jitter, line noise (a corrupted byte per message, in
+either direction), dropped ``DONE`` replies, per-servo ``read()`` error
+and gear backlash. With the defaults the simulator is an ideal arm. Note
+that, like the sketch, it runs one tick more per move than
+``interpolation.py`` counts (the tick on which every servo is found done),
+and a POS frame reports the pose after the tick in progress at *t_ms*.
+
+A :class:`~.serial_bridge.SerialBridge` opened on a ``sim://`` port talks
+to a simulated arm instead of a serial device, so simulated arms can be
+listed in ``ACCESSWARE_PORTS``, e.g.
+``sim://arm-a?warp=100&noise=0.001,sim://arm-b?backlash=2``.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .framing import FrameDecoder, LineDecoder, encode_ascii, encode_binary
+
+logger = logging.getLogger(__name__)
+
+SIM_SCHEME = "sim://"
+"""Port prefix that selects a simulated arm instead of a serial device."""
+
+ANGLE_MIN, ANGLE_MAX = 10, 170
+MAX_SEQ_STEPS = 32
+MAX_SEQ_HOLD_MS = 0xFFFF  # seqHold is an unsigned int on the AVR
+BASE_BAUD = 9600
+SUPPORTED_BAUDS = (19200, 38400, 57600, 115200)
+MAX_TICKS = 180
+SETTLE_TICKS = 20
+SERIAL_TIMEOUT_MS = 1000  # Stream.setTimeout default: readStringUntil, BAUD fallback
+HOME = (90, 90, 90, 90)
+
+_BAD_FRAME = "\x00BAD_FRAME"  # marker queued when a binary frame fails its CRC
+_LEADING_INT = re.compile(r"\s*[-+]?\d+")
+
+# Query-string names accepted by SimConfig.from_url
+_URL_KEYS = {
+    "latency": "latency_ms",
+    "jitter": "jitter_ms",
+    "noise": "line_noise",
+    "drop_done": "drop_done",
+    "error": "servo_error",
+    "backlash": "backlash_deg",
+    "warp": "warp",
+    "seed": "seed",
+}
+
+
+@dataclass
+class SimConfig:
+    """Link and servo imperfections of a :class:`SimulatedArm`."""
+
+    latency_ms: float = 0.0
+    """Delay (firmware time) before a reply reaches the host."""
+    jitter_ms: float = 0.0
+    """Extra random delay, uniform in ``[0, jitter_ms]``; replies stay in order."""
+    line_noise: float = 0.0
+    """Probability that a message (command or reply) has one corrupted byte."""
+    drop_done: float = 0.0
+    """Probability that the ``DONE`` of a MOVE is lost."""
+    servo_error: tuple[int, int, int, int] = (0, 0, 0, 0)
+    """Per-servo max ``read()`` error in degrees (uniform, redrawn on each read)."""
+    backlash_deg: int = 0
+    """Dead band before a servo follows a change of direction."""
+    warp: float = 1.0
+    """Firmware clock speed relative to the wall clock."""
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.warp <= 0:
+            raise ValueError("warp must be positive")
+        if isinstance(self.servo_error, int):
+            self.servo_error = (self.servo_error,) * 4
+        if len(self.servo_error) != 4:
+            raise ValueError("servo_error needs one value per servo")
+        self.servo_error = tuple(int(e) for e in self.servo_error)  # type: ignore[assignment]
+
+    @classmethod
+    def from_url(cls, url: str) -> SimConfig:
+        """Parse the query of a ``sim://name?warp=100&noise=0.01`` port."""
+        kwargs: dict[str, Any] = {}
+        types = {f.name: f.type for f in fields(cls)}
+        for key, value in parse_qsl(urlsplit(url).query):
+            name = _URL_KEYS.get(key)
+            if name is None:
+                raise ValueError(f"Unknown simulator option {key!r} in {url!r}")
+            if name == "servo_error":
+                errors = [int(v) for v in value.split(",")]
+                kwargs[name] = tuple(errors * 4 if len(errors) == 1 else errors)
+            elif name == "seed" or types[name] == "int":
+                kwargs[name] = int(value)
+            else:
+                kwargs[name] = float(value)
+        return cls(**kwargs)
+
+    def url(self, name: str) -> str:
+        """Port string for a simulated arm *name* with this configuration."""
+        defaults = asdict(SimConfig())
+        query = {}
+        for key, attr in _URL_KEYS.items():
+            value = getattr(self, attr)
+            if value != defaults[attr]:
+                query[key] = ",".join(map(str, value)) if attr == "servo_error" else value
+        return f"{SIM_SCHEME}{name}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _to_int(field: str) -> int:
+    """Arduino ``String.toInt``: leading integer, 0 if there is none."""
+    match = _LEADING_INT.match(field)
+    return int(match.group()) if match else 0
+
+
+def _parse_ints(params: str, n: int) -> list[int] | None:
+    """Sketch ``parseInts``: the first *n* comma-separated fields, or None."""
+    parts = params.split(",")
+    if len(parts) < n:
+        return None
+    return [_to_int(p) for p in parts[:n]]
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    return max(low, min(high, value))
+
+
+class SimulatedArm:
+    """pyserial-like port running the firmware against a virtual clock.
+
+    Implements the subset of ``serial.Serial`` the bridge uses: ``read``,
+    ``readline``, ``in_waiting``, ``write``, ``timeout``, ``baudrate`` and
+    ``close``. Opening the port resets the firmware (as the CH340's DTR
+    toggle does), so the link starts as ASCII at 9600 baud with READY.
+    """
+
+    def __init__(
+        self,
+        config: SimConfig | None = None,
+        name: str = "sim",
+        baudrate: int = BASE_BAUD,
+        timeout: float | None = 1.0,
+    ) -> None:
+        self.config = config or SimConfig()
+        self.name = name
+        self.timeout = timeout
+        self.baudrate = baudrate  # host side; bytes are lost while it differs from the firmware's
+        self._rng = random.Random(self.config.seed)
+        self._link_rng = random.Random(None if self.config.seed is None else ~self.config.seed)
+        self._closed = threading.Event()
+        # host -> firmware
+        self._rx: deque[str] = deque()
+        self._rx_ready = threading.Condition()
+        self._decoder: LineDecoder | FrameDecoder = LineDecoder()
+        # firmware -> host: (release time, bytes), released in order
+        self._tx = bytearray()
+        self._tx_pending: deque[tuple[float, bytes]] = deque()
+        self._tx_ready = threading.Condition()
+        self._last_release = 0.0
+        # firmware state
+        self._binary = False
+        self._device_baud = BASE_BAUD
+        self._telem_ms = 0
+        self._physical = list(HOME)
+        self._origin = time.monotonic()
+        self._vms = 0.0  # firmware millis()
+        self.stats = {
+            "commands": 0,
+            "moves": 0,
+            "steps": 0,
+            "ticks": 0,
+            "errors": 0,
+            "corrupted": 0,
+            "dropped_dones": 0,
+            "garbled": 0,
+        }
+        self._thread = threading.Thread(target=self._firmware, name=f"sim-arm:{name}", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> SimulatedArm:
+        """Open ``sim://name?option=value...`` (see :meth:`SimConfig.from_url`)."""
+        if not url.startswith(SIM_SCHEME):
+            raise ValueError(f"Not a simulator port: {url!r}")
+        name = urlsplit(url).netloc or "sim"
+        return cls(SimConfig.from_url(url), name=name, **kwargs)
+
+    # -- pyserial surface (host side) --------------------------------------
+
+    def write(self, data: bytes) -> int:
+        if self._closed.is_set():
+            raise ConnectionError(f"Simulated port {self.name} is closed")
+        size = len(data)
+        if self.baudrate != self._device_baud:
+            self.stats["garbled"] += 1
+            return size
+        data = self._add_noise(data, self._link_rng)
+        with self._rx_ready:
+            decoder = self._decoder
+            bad_before = getattr(decoder, "bad_frames", 0)
+            decoder.feed(data)
+            while (msg := decoder.next_message()) is not None:
+                self._rx.extend(msg.split("\n"))
+            if getattr(decoder, "bad_frames", 0) > bad_before:
+                self._rx.append(_BAD_FRAME)
+            self._rx_ready.notify_all()
+        return size
+
+    @property
+    def in_waiting(self) -> int:
+        with self._tx_ready:
+            self._release()
+            return len(self._tx)
+
+    def read(self, size: int = 1) -> bytes:
+        with self._tx_ready:
+            self._wait_tx(lambda: bool(self._tx))
+            data = bytes(self._tx[:size])
+            del self._tx[:size]
+            return data
+
+    def readline(self) -> bytes:
+        with self._tx_ready:
+            self._wait_tx(lambda: b"\n" in self._tx)
+            idx = self._tx.find(b"\n") + 1
+            data = bytes(self._tx[:idx])
+            del self._tx[:idx]
+            return data
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._rx_ready:
+            self._rx_ready.notify_all()
+        with self._tx_ready:
+            self._tx_ready.notify_all()
+
+    @property
+    def is_open(self) -> bool:
+        return not self._closed.is_set()
+
+    def _release(self) -> None:
+        now = time.monotonic()
+        while self._tx_pending and self._tx_pending[0][0] <= now:
+            self._tx += self._tx_pending.popleft()[1]
+
+    def _wait_tx(self, ready) -> None:
+        """Wait (holding ``_tx_ready``) until *ready* or the read timeout."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            self._release()
+            if ready() or self._closed.is_set():
+                return
+            now = time.monotonic()
+            wait = None if deadline is None else deadline - now
+            if wait is not None and wait <= 0:
+                return
+            if self._tx_pending:
+                due = self._tx_pending[0][0] - now
+                wait = due if wait is None else min(wait, due)
+            self._tx_ready.wait(wait)
+
+    # -- virtual clock -----------------------------------------------------
+
+    def millis(self) -> int:
+        return int(self._vms)
+
+    def _delay(self, ms: float) -> None:
+        """``delay(ms)`` on the firmware clock; sleeps ``ms / warp`` for real.
+
+        Short waits are accumulated rather than slept one by one, so the
+        average rate holds even when a single tick is below the OS sleep
+        granularity.
+        """
+        self._vms += ms
+        lag = self._origin + self._vms / 1000.0 / self.config.warp - time.monotonic()
+        if lag > 0.001:
+            self._closed.wait(lag)
+
+    def _catch_up(self) -> None:
+        """Advance the firmware clock over time spent idle waiting for input."""
+        self._vms = max(self._vms, (time.monotonic() - self._origin) * 1000.0 * self.config.warp)
+
+    # -- link (firmware side) ----------------------------------------------
+
+    def _add_noise(self, data: bytes, rng: random.Random) -> bytes:
+        """With probability ``line_noise`` replace one byte (not a line end)."""
+        if not self.config.line_noise or rng.random() >= self.config.line_noise:
+            return data
+        end = len(data) - 1 if data.endswith(b"\n") else len(data)
+        if end <= 0:
+            return data
+        self.stats["corrupted"] += 1
+        pos = rng.randrange(end)
+        corrupted = bytearray(data)
+        corrupted[pos] = rng.choice([b for b in range(256) if b not in (data[pos], 0x0A)])
+        return bytes(corrupted)
+
+    def _reply(self, msg: str) -> None:
+        if self._binary:
+            data = encode_binary(msg)
+        else:  # ERR,UNKNOWN_CMD echoes the line, which may carry line noise
+            data = encode_ascii(msg.encode("ascii", errors="replace").decode("ascii"))
+        if self.baudrate != self._device_baud:
+            self.stats["garbled"] += 1
+            return
+        data = self._add_noise(data, self._rng)
+        delay_ms = self.config.latency_ms
+        if self.config.jitter_ms:
+            delay_ms += self._rng.uniform(0.0, self.config.jitter_ms)
+        with self._tx_ready:
+            release = max(time.monotonic() + delay_ms / 1000.0 / self.config.warp, self._last_release)
+            self._last_release = release
+            self._tx_pending.append((release, data))
+            self._tx_ready.notify_all()
+
+    def _next_line(self, timeout: float | None = None) -> str | None:
+        """Next command line; None on close or after *timeout* seconds."""
+        with self._rx_ready:
+            self._rx_ready.wait_for(lambda: self._rx or self._closed.is_set(), timeout)
+            if self._closed.is_set() or not self._rx:
+                return None
+            line = self._rx.popleft()
+        self._catch_up()
+        return line
+
+    def _stop_requested(self) -> bool:
+        with self._rx_ready:
+            if self._rx and self._rx[0] == "STOP":
+                self._rx.popleft()
+                return True
+        return False
+
+    # -- servos ------------------------------------------------------------
+
+    def _write_servo(self, i: int, angle: int) -> None:
+        """``servo.write``: the horn follows, minus any backlash dead band."""
+        gap = angle - self._physical[i]
+        backlash = self.config.backlash_deg
+        if gap > backlash:
+            self._physical[i] = angle - backlash
+        elif gap < -backlash:
+            self._physical[i] = angle + backlash
+
+    def _read_servo(self, i: int) -> int:
+        error = self.config.servo_error[i]
+        noise = self._rng.randint(-error, error) if error else 0
+        return _clamp(self._physical[i] + noise, 0, 180)
+
+    def _read_angles(self) -> list[int]:
+        return [self._read_servo(i) for i in range(4)]
+
+    @property
+    def angles(self) -> list[int]:
+        """Actual horn positions (what an external encoder would measure)."""
+        return list(self._physical)
+
+    def _move_servos(self, target: list[int], speed: int) -> None:
+        targets = [_clamp(t, ANGLE_MIN, ANGLE_MAX) for t in target]
+        current = self._read_angles()
+        count = 0
+        move_start = self.millis()
+        last_pos = 0
+        first_pos = True
+        while True:
+            done = 0
+            for i in range(4):
+                if targets[i] > current[i]:
+                    current[i] += 1
+                elif targets[i] < current[i]:
+                    current[i] -= 1
+                else:
+                    done += 1
+                self._write_servo(i, current[i])
+            count += 1
+            if self._telem_ms:
+                t = self.millis() - move_start
+                if first_pos or t - last_pos >= self._telem_ms:
+                    self._reply(f"POS,{t & 0xFFFF},{current[0]},{current[1]},{current[2]},{current[3]}")
+                    last_pos = t
+                    first_pos = False
+            self._delay(speed)
+            if done == 4 or count >= MAX_TICKS or self._closed.is_set():
+                break
+        self.stats["ticks"] += count
+        self._delay(speed * SETTLE_TICKS)
+
+    # -- command loop ------------------------------------------------------
+
+    def _send_angles(self) -> None:
+        a = self._read_angles()
+        self._reply(f"ACK,{a[0]},{a[1]},{a[2]},{a[3]}")
+
+    def _send_err(self, reason: str) -> None:
+        self.stats["errors"] += 1
+        self._reply(f"ERR,{reason}")
+
+    def _firmware(self) -> None:
+        self._reply("READY")
+        while (line := self._next_line()) is not None:
+            line = line.strip()
+            if not line:
+                continue
+            self.stats["commands"] += 1
+            try:
+                self._handle(line)
+            except Exception:  # a simulator bug must not hang the host
+                logger.exception("Simulated arm %s failed on %r", self.name, line)
+
+    def _handle(self, line: str) -> None:
+        if line == _BAD_FRAME:
+            self._send_err("BAD_FRAME")
+        elif line.startswith("MOVE,"):
+            fields_ = _parse_ints(line[5:], 5)
+            if fields_ is None:
+                self._send_err("BAD_MOVE_FORMAT")
+                return
+            self._do_move(fields_[:4], fields_[4])
+        elif line.startswith("MOVESEQ,"):
+            self._run_sequence(line[8:])
+        elif line.startswith("BAUD,") and not self._binary:
+            self._negotiate_baud(_to_int(line[5:]))
+        elif line == "BIN" and not self._binary:
+            self._reply("BIN")
+            self._binary = True
+            with self._rx_ready:
+                self._decoder = FrameDecoder()
+        elif line == "STOP":
+            pass  # no sequence running
+        elif line.startswith("TELEM,"):
+            self._telem_ms = _clamp(_to_int(line[6:]), 0, 255)
+            self._reply(f"TELEM,{self._telem_ms}")
+        elif line == "READ":
+            self._send_angles()
+        elif line == "PING":
+            self._reply("PONG")
+        elif self._binary:
+            self._send_err("UNKNOWN_FRAME")
+        else:
+            self._send_err(f"UNKNOWN_CMD:{line}")
+
+    def _do_move(self, target: list[int], speed: int) -> None:
+        self.stats["moves"] += 1
+        self._send_angles()
+        self._move_servos(target, _clamp(speed, 1, 50))
+        if self.config.drop_done and self._rng.random() < self.config.drop_done:
+            self.stats["dropped_dones"] += 1
+            return
+        self._reply("DONE")
+
+    def _run_sequence(self, params: str) -> None:
+        header = _parse_ints(params, 2)
+        if header is None:
+            self._send_err("BAD_SEQ_FORMAT")
+            return
+        speed, n = _clamp(header[0], 1, 50), header[1]
+        if not 1 <= n <= MAX_SEQ_STEPS:
+            self._drain_lines(n)
+            self._send_err("BAD_SEQ_LENGTH")
+            return
+        waypoints: list[tuple[list[int], int]] = []
+        for i in range(n):
+            fields_ = _parse_ints(self._next_line(SERIAL_TIMEOUT_MS / 1000.0) or "", 5)
+            if fields_ is None:
+                self._drain_lines(n - i - 1)
+                self._send_err("BAD_SEQ_FORMAT")
+                return
+            waypoints.append((fields_[:4], _clamp(fields_[4], 0, MAX_SEQ_HOLD_MS)))
+
+        self._send_angles()
+        executed = 0
+        for i, (target, hold) in enumerate(waypoints):
+            self._move_servos(target, speed)
+            self._delay(hold)
+            a = self._read_angles()
+            self._reply(f"DONE,{i},{a[0]},{a[1]},{a[2]},{a[3]}")
+            self.stats["steps"] += 1
+            executed += 1
+            if self._stop_requested() or self._closed.is_set():
+                break
+        self._reply(f"SEQDONE,{executed}")
+
+    def _drain_lines(self, count: int) -> None:
+        """Sketch ``drainLines``: skip a rejected upload's waypoint lines."""
+        for _ in range(count):
+            if not self._next_line(SERIAL_TIMEOUT_MS / 1000.0):
+                return
+
+    def _negotiate_baud(self, rate: int) -> None:
+        if rate not in SUPPORTED_BAUDS:
+            self._send_err("BAD_BAUD")
+            return
+        self._reply(f"BAUD,{rate}")
+        self._device_baud = rate
+        # The host's settle and PING timing is wall-clock, so the fallback
+        # window is too (it is not warped).
+        deadline = time.monotonic() + SERIAL_TIMEOUT_MS / 1000.0
+        while (remaining := deadline - time.monotonic()) > 0:
+            line = self._next_line(remaining)
+            if line is None:
+                break
+            if line.strip() == "PING":
+                self._reply("PONG")
+                return
+        self._device_baud = BASE_BAUD
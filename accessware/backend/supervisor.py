@@ -0,0 +1,308 @@
+"""Self-healing bridge: reconnects a lost serial link and resumes.
+
+A CH340 that drops off the USB bus (loose cable, hub power blip, EMI from
+the servos) makes every pending and later command of a SerialBridge fail
+with ``ConnectionError``. :class:`SupervisedBridge` wraps a bridge factory
+and, on link loss:
+
+1. reconnects with exponential backoff, creating a fresh bridge each
+   time (open, READY handshake, baud/binary negotiation as configured);
+2. resyncs with ``read_angles``. The Nano reboots when the port reopens,
+   so the arm is back at its power-on pose; it is moved back to the last
+   commanded pose (the last MOVE target, or the last finished MOVESEQ
+   step) and telemetry is restored;
+3. retries the interrupted call where that is safe. Targets are
+   absolute, so a MOVE is simply resent; a MOVESEQ resumes from the first
+   step without a ``DONE``, with step indices continuing where they were.
+
+Link loss is noticed as soon as the bridge's reader fails, so an idle arm
+reconnects without waiting for the next command. A TestRunner on a
+supervised bridge carries on after a hiccup; the outage shows up as a
+longer step duration (and timing drift), not as a failed run. While
+reconnecting, ``connected`` is False, so the pool hands new runs to other
+arms; ``on_reconnect`` tells it when the arm is back. Calls give up with
+``ConnectionError`` if the link is not back within ``RECOVER_TIMEOUT_S``;
+the reconnect loop keeps going in the background until :meth:`disconnect`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, TypeVar
+
+from .interpolation import ANGLE_MAX, ANGLE_MIN
+from .serial_bridge import BridgeProtocol, SerialBridge, TelemetrySample
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_BASE_S = 0.5
+"""First reconnect delay; doubled after every failed attempt."""
+
+RECONNECT_MAX_S = 30.0
+"""Longest delay between reconnect attempts."""
+
+RECOVER_TIMEOUT_S = float(os.environ.get("ACCESSWARE_RECOVER_TIMEOUT", "300"))
+"""How long an interrupted call waits for the link to come back."""
+
+T = TypeVar("T")
+
+
+def _link_lost(bridge: BridgeProtocol, exc: BaseException) -> bool:
+    """Whether *exc* from *bridge* means the link is gone (not a bad reply)."""
+    if isinstance(exc, ConnectionError) or not bridge.connected:
+        return True
+    # pyserial's SerialException is an OSError; a reply timeout is not a lost link.
+    return isinstance(exc, OSError) and not isinstance(exc, TimeoutError)
+
+
+def _clamped(angles: list[int]) -> list[int]:
+    return [min(max(a, ANGLE_MIN), ANGLE_MAX) for a in angles]
+
+
+class SupervisedBridge:
+    """BridgeProtocol wrapper that survives link drops (see module docstring)."""
+
+    def __init__(
+        self,
+        factory: Callable[[], BridgeProtocol],
+        bridge: BridgeProtocol | None = None,
+        backoff_s: float = RECONNECT_BASE_S,
+        max_backoff_s: float = RECONNECT_MAX_S,
+        recover_timeout_s: float = RECOVER_TIMEOUT_S,
+    ) -> None:
+        self._factory = factory
+        self._bridge = bridge or factory()
+        self._watch(self._bridge)
+        self._port = getattr(self._bridge, "_port", None)
+        self._backoff_s = backoff_s
+        self._max_backoff_s = max_backoff_s
+        self._recover_timeout_s = recover_timeout_s
+        self._reconnect_task: asyncio.Task | None = None
+        self._reconnecting = False
+        self._closed = False
+        self.reconnects = 0
+        self.resynced_angles: list[int] | None = None  # arm pose read after the last reconnect
+        self.on_reconnect: Callable[[], Awaitable[None]] | None = None
+        self._telemetry_ms = 0
+        self._pose: tuple[list[int], int] | None = None  # where the run expects the arm, at what speed
+        # MOVESEQ being run: all waypoints, steps reported done, index of
+        # the first waypoint of the current upload and the bridge it is on
+        self._seq: list[tuple[list[int], int]] | None = None
+        self._seq_speed = 0
+        self._seq_done = 0
+        self._seq_base = 0
+        self._seq_bridge: BridgeProtocol | None = None
+        self._seq_stopped = False
+
+    @classmethod
+    def for_port(cls, port: str, **kwargs: Any) -> SupervisedBridge:
+        """Supervised SerialBridge on *port* (*kwargs* go to SerialBridge)."""
+        return cls(lambda: SerialBridge(port, **kwargs))
+
+    @property
+    def bridge(self) -> BridgeProtocol:
+        """The current underlying bridge (replaced on every reconnect)."""
+        return self._bridge
+
+    @property
+    def connected(self) -> bool:
+        return self._bridge.connected and not self.reconnecting
+
+    @property
+    def reconnecting(self) -> bool:
+        return self._reconnecting
+
+    @property
+    def bridge_type(self) -> str:
+        return self._bridge.bridge_type
+
+    @property
+    def last_rx(self) -> float | None:
+        return getattr(self._bridge, "last_rx", None)
+
+    # -- supervision -------------------------------------------------------
+
+    def _watch(self, bridge: BridgeProtocol) -> None:
+        """Start reconnecting as soon as *bridge* reports its link lost."""
+        if hasattr(bridge, "on_link_lost"):
+            bridge.on_link_lost = lambda exc: self._start_reconnect(bridge, exc)
+
+    async def _call(self, op: Callable[[BridgeProtocol], Awaitable[T]]) -> T:
+        """Run *op* on the current bridge, recovering the link until it succeeds."""
+        while True:
+            bridge = self._bridge
+            try:
+                return await op(bridge)
+            except Exception as exc:
+                if self._closed or not _link_lost(bridge, exc):
+                    raise
+                await self._recover(bridge, exc)
+
+    def _start_reconnect(self, failed: BridgeProtocol, exc: BaseException) -> None:
+        if self._bridge is failed and not self.reconnecting and not self._closed:
+            logger.warning("Link to %s lost (%s), reconnecting", self._port, exc)
+            self._reconnecting = True
+            self._reconnect_task = asyncio.create_task(self._reconnect(failed), name=f"reconnect:{self._port}")
+
+    async def _recover(self, failed: BridgeProtocol, exc: BaseException) -> None:
+        self._start_reconnect(failed, exc)
+        task = self._reconnect_task
+        if task is None or self._bridge is not failed and task.done():
+            return  # already replaced
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self._recover_timeout_s)
+        except asyncio.TimeoutError:
+            raise ConnectionError(
+                f"Link to {self._port} not restored within {self._recover_timeout_s:g}s"
+            ) from exc
+
+    async def _reconnect(self, failed: BridgeProtocol) -> None:
+        try:
+            restored = await self._connect_again(failed)
+        finally:
+            self._reconnecting = False
+        if restored and self.on_reconnect is not None:
+            try:
+                await self.on_reconnect()
+            except Exception:
+                logger.exception("on_reconnect callback failed")
+
+    async def _connect_again(self, failed: BridgeProtocol) -> bool:
+        """Replace *failed* with a fresh, resynced bridge; False if closed first."""
+        with suppress(Exception):
+            await failed.disconnect()
+        delay = self._backoff_s
+        attempt = 0
+        while not self._closed:
+            attempt += 1
+            bridge = self._factory()
+            try:
+                await bridge.connect()  # waits for READY
+                angles = await bridge.read_angles()
+                if self._pose is not None and angles != self._pose[0]:
+                    logger.info("Arm at %s after reconnect, restoring %s", angles, self._pose[0])
+                    await bridge.move(*self._pose)
+                if self._telemetry_ms:
+                    await bridge.set_telemetry(self._telemetry_ms)
+            except Exception as exc:
+                logger.info("Reconnect attempt %d to %s failed (%s), next in %.1fs",
+                            attempt, self._port, exc, delay)
+                with suppress(Exception):
+                    await bridge.disconnect()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._max_backoff_s)
+                continue
+            self._bridge = bridge
+            self._watch(bridge)
+            self._port = getattr(bridge, "_port", self._port)
+            self.resynced_angles = angles
+            self.reconnects += 1
+            logger.info("Reconnected to %s after %d attempt(s); arm at %s", self._port, attempt, angles)
+            return True
+        return False
+
+    # -- BridgeProtocol ----------------------------------------------------
+
+    async def connect(self) -> None:
+        self._closed = False
+        if not self._bridge.connected:
+            await self._bridge.connect()
+
+    async def disconnect(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        await self._bridge.disconnect()
+
+    async def send_move(self, angles: list[int], speed: int) -> list[int]:
+        self._pose = (_clamped(angles), speed)
+        return await self._call(lambda b: b.send_move(angles, speed))
+
+    async def wait_move_done(self) -> None:
+        # After a reconnect the pose restore has already finished the move.
+        await self._call(lambda b: b.wait_move_done())
+
+    async def move(self, angles: list[int], speed: int) -> list[int]:
+        result = await self.send_move(angles, speed)
+        await self.wait_move_done()
+        return result
+
+    async def read_angles(self) -> list[int]:
+        return await self._call(lambda b: b.read_angles())
+
+    async def send_sequence(self, steps: list[tuple[list[int], int]], speed: int) -> list[int]:
+        self._seq = [(list(a), int(h)) for a, h in steps]
+        self._seq_speed = speed
+        self._seq_done = 0
+        self._seq_base = 0
+        self._seq_stopped = False
+
+        async def op(bridge: BridgeProtocol) -> list[int]:
+            self._seq_bridge = bridge
+            return await bridge.send_sequence(steps, speed)
+
+        start = await self._call(op)
+        self._pose = (start, speed)
+        return start
+
+    async def wait_step_done(self) -> tuple[int, list[int]] | None:
+        if self._seq is None:
+            return await self._bridge.wait_step_done()
+
+        async def op(bridge: BridgeProtocol) -> tuple[int, list[int]] | None:
+            if bridge is not self._seq_bridge:
+                # Link replaced mid-sequence: upload the steps still to run.
+                remaining = self._seq[self._seq_done:]
+                if self._seq_stopped or not remaining:
+                    return None
+                logger.info("Resuming MOVESEQ at step %d of %d", self._seq_done, len(self._seq))
+                self._seq_bridge = bridge
+                self._seq_base = self._seq_done
+                await bridge.send_sequence(remaining, self._seq_speed)
+            event = await bridge.wait_step_done()
+            if event is None:
+                return None
+            index, angles = event
+            self._seq_done = self._seq_base + index + 1
+            self._pose = (angles, self._seq_speed)
+            return self._seq_base + index, angles
+
+        event = await self._call(op)
+        if event is None:
+            self._seq = None
+        return event
+
+    async def stop_sequence(self) -> None:
+        self._seq_stopped = True
+        bridge = self._bridge
+        try:
+            await bridge.stop_sequence()
+        except Exception as exc:
+            if not _link_lost(bridge, exc):
+                raise
+            # A rebooted firmware is not running the sequence any more.
+
+    async def set_telemetry(self, period_ms: int) -> None:
+        await self._call(lambda b: b.set_telemetry(period_ms))
+        self._telemetry_ms = period_ms
+
+    def drain_telemetry(self) -> list[TelemetrySample]:
+        return self._bridge.drain_telemetry()
+
+    async def ping(self) -> bool:
+        """PING the current bridge; never waits for a reconnect.
+
+        A failed ping on a dead link starts reconnecting in the background.
+        """
+        if self.reconnecting:
+            return False
+        bridge = self._bridge
+        healthy = await bridge.ping()
+        if not healthy and not bridge.connected:
+            self._start_reconnect(bridge, ConnectionError("no PONG"))
+        return healthy
@@ -8,6 +8,7 @@ result metrics after each run.
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import logging
 import math
@@ -18,11 +19,22 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Callable, Coroutine
 
-from .interpolation import interpolate_poses, total_duration_ms
-from .serial_bridge import BridgeProtocol
+from .clock import SYSTEM_CLOCK, Clock
+from .instrumentation import ACTIVE_RUNS, STEP_DRIFT
+from .interpolation import TrajectoryTable, trajectory_cache
+from .metrics import OnlineMetrics
+from .serial_bridge import MAX_SEQ_HOLD_MS, BridgeProtocol
 
 logger = logging.getLogger(__name__)
 
+TELEMETRY_DIVERGENCE_DEG = 3
+"""Measured-vs-predicted gap (degrees) above which a telemetry sample is flagged."""
+
+STREAM_MODES = ("poses", "trajectory")
+"""``poses``: stream predicted_angles; ``trajectory``: one descriptor per step."""
+
+MAX_STREAM_FPS = 60
+
 BUNDLED_DIR = Path(__file__).resolve().parent.parent / "tests" / "bundled"
 CUSTOM_DIR = Path(__file__).resolve().parent.parent / "tests" / "custom"
 
@@ -67,46 +79,126 @@ StateCallback = Callable[[dict[str, Any]], Coroutine[Any, Any, None]]
 # Test loading
 # ---------------------------------------------------------------------------
 
+CATALOG_POLL_S = 1.0
+"""Minimum interval between catalog rescans (stat calls only, no parsing)."""
+
+
+@dataclass
+class _CatalogEntry:
+    path: Path
+    source: str
+    stamp: tuple[int, int]  # (mtime_ns, size) of the parsed version
+    data: dict[str, Any] | None  # None if the file is not valid test JSON
+    meta: dict[str, str] | None = None
+
+
+class TestCatalog:
+    """Index of test files by id (filename stem) and JSON ``name``.
+
+    Files are parsed once and re-parsed only when their mtime/size
+    changes. Rescans are stat-only and happen at most every *poll_s*
+    seconds, so listing and lookup are dict operations in between.
+    """
+
+    def __init__(self, directories: list[tuple[Path, str]], poll_s: float = CATALOG_POLL_S) -> None:
+        self._directories = directories
+        self._poll_s = poll_s
+        self._entries: dict[Path, _CatalogEntry] = {}
+        self._by_id: dict[str, _CatalogEntry] = {}
+        self._by_name: dict[str, _CatalogEntry] = {}
+        self._listing: list[dict[str, str]] = []
+        self._scanned_at: float | None = None
+
+    def invalidate(self) -> None:
+        """Force a rescan on next access (e.g. after writing a test file)."""
+        self._scanned_at = None
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and self._scanned_at is not None and now - self._scanned_at < self._poll_s:
+            return
+        self._scanned_at = now
+
+        seen: dict[Path, _CatalogEntry] = {}
+        changed = False
+        for directory, source in self._directories:
+            if not directory.exists():
+                continue
+            for f in sorted(directory.glob("*.json")):
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                stamp = (st.st_mtime_ns, st.st_size)
+                entry = self._entries.get(f)
+                if entry is None or entry.stamp != stamp:
+                    entry = self._parse(f, source, stamp)
+                    changed = True
+                seen[f] = entry
+        if changed or seen.keys() != self._entries.keys():
+            self._entries = seen
+            self._reindex()
+
+    def _parse(self, path: Path, source: str, stamp: tuple[int, int]) -> _CatalogEntry:
+        try:
+            data = json.loads(path.read_text())
+            meta = {
+                "id": path.stem,
+                "name": data.get("name", path.stem),
+                "description": data.get("description", ""),
+                "source": source,
+                "file": str(path),
+            }
+        except (OSError, json.JSONDecodeError, AttributeError):
+            logger.warning("Skipping invalid test file: %s", path)
+            return _CatalogEntry(path, source, stamp, None)
+        return _CatalogEntry(path, source, stamp, data, meta)
+
+    def _reindex(self) -> None:
+        # Insertion order is bundled-then-custom, sorted; first match wins,
+        # as with the original directory scans.
+        valid = [e for e in self._entries.values() if e.data is not None]
+        self._by_id = {}
+        self._by_name = {}
+        for e in valid:
+            self._by_id.setdefault(e.path.stem, e)
+        for e in valid:
+            self._by_name.setdefault(e.data.get("name"), e)
+        self._listing = [e.meta for e in valid]
+
+    def list(self) -> list[dict[str, str]]:
+        self.refresh()
+        return [dict(meta) for meta in self._listing]
+
+    def _entry(self, name: str) -> _CatalogEntry:
+        self.refresh()
+        entry = self._by_id.get(name) or self._by_name.get(name)
+        if entry is None:
+            raise FileNotFoundError(f"Test not found: {name}")
+        return entry
+
+    def get(self, name: str) -> dict[str, Any]:
+        """Parsed test by id, else by JSON name. Returns a private copy."""
+        return copy.deepcopy(self._entry(name).data)
+
+    def version(self, name: str) -> tuple[str, int, int]:
+        """(path, mtime_ns, size) of the parsed file behind *name*; changes
+        whenever the test is edited, so derived data can be cached on it."""
+        entry = self._entry(name)
+        return (str(entry.path), *entry.stamp)
+
+
+test_catalog = TestCatalog([(BUNDLED_DIR, "bundled"), (CUSTOM_DIR, "custom")])
+
+
 def list_tests() -> list[dict[str, str]]:
     """Return metadata for all available tests (bundled + custom)."""
-    tests: list[dict[str, str]] = []
-    for directory, source in [(BUNDLED_DIR, "bundled"), (CUSTOM_DIR, "custom")]:
-        if not directory.exists():
-            continue
-        for f in sorted(directory.glob("*.json")):
-            try:
-                data = json.loads(f.read_text())
-                tests.append({
-                    "id": f.stem,
-                    "name": data.get("name", f.stem),
-                    "description": data.get("description", ""),
-                    "source": source,
-                    "file": str(f),
-                })
-            except (json.JSONDecodeError, KeyError):
-                logger.warning("Skipping invalid test file: %s", f)
-    return tests
+    return test_catalog.list()
 
 
 def load_test(name: str) -> dict[str, Any]:
     """Load a test by filename stem or JSON name field."""
-    # Try direct filename match first
-    for directory in [BUNDLED_DIR, CUSTOM_DIR]:
-        path = directory / f"{name}.json"
-        if path.exists():
-            return json.loads(path.read_text())
-    # Fallback: search by JSON "name" field
-    for directory in [BUNDLED_DIR, CUSTOM_DIR]:
-        if not directory.exists():
-            continue
-        for f in directory.glob("*.json"):
-            try:
-                data = json.loads(f.read_text())
-                if data.get("name") == name:
-                    return data
-            except (json.JSONDecodeError, KeyError):
-                continue
-    raise FileNotFoundError(f"Test not found: {name}")
+    return test_catalog.get(name)
 
 
 def save_test(data: dict[str, Any]) -> Path:
@@ -115,6 +207,7 @@ def save_test(data: dict[str, Any]) -> Path:
     name = data.get("name", "untitled")
     path = CUSTOM_DIR / f"{name}.json"
     path.write_text(json.dumps(data, indent=2))
+    test_catalog.invalidate()
     return path
 
 
@@ -123,20 +216,46 @@ def save_test(data: dict[str, Any]) -> Path:
 # ---------------------------------------------------------------------------
 
 class TestRunner:
-    """Executes test sequences on the robotic arm."""
-
-    def __init__(self, bridge: BridgeProtocol, on_state_change: StateCallback | None = None) -> None:
+    """Executes test sequences on the robotic arm.
+
+    Streaming, holds and step durations read *clock* (``clock.py``); a
+    VirtualClock shared with a MockSerialBridge fast-forwards a run.
+    """
+
+    def __init__(
+        self,
+        bridge: BridgeProtocol,
+        on_state_change: StateCallback | None = None,
+        batch_moves: bool = False,
+        telemetry_ms: int = 0,
+        stream_fps: float = 0,
+        stream_mode: str = "poses",
+        clock: Clock | None = None,
+    ) -> None:
+        if stream_mode not in STREAM_MODES:
+            raise ValueError(f"Unknown stream mode: {stream_mode}")
         self._bridge = bridge
         self._on_state_change = on_state_change
+        self._batch_moves = batch_moves
+        self._telemetry_ms = telemetry_ms
+        self._stream_fps = min(max(stream_fps, 0), MAX_STREAM_FPS)  # 0 = every firmware tick
+        self._stream_mode = stream_mode
+        self._clock = clock or SYSTEM_CLOCK
         self._state = RunState.IDLE
         self._cancel = False
         self._pause_event = asyncio.Event()
         self._pause_event.set()  # not paused initially
+        self._metrics = OnlineMetrics()
 
     @property
     def state(self) -> RunState:
         return self._state
 
+    @property
+    def metrics(self) -> OnlineMetrics:
+        """Running metrics of the current (or last) test."""
+        return self._metrics
+
     async def _emit(self, msg: dict[str, Any]) -> None:
         if self._on_state_change:
             try:
@@ -158,6 +277,14 @@ class TestRunner:
 
     async def run_test(self, test_data: dict[str, Any]) -> list[TestResult]:
         """Execute a full test (all repeats). Returns results per repeat."""
+        bridge = self._bridge.bridge_type
+        ACTIVE_RUNS.inc(bridge=bridge)
+        try:
+            return await self._run_test(test_data)
+        finally:
+            ACTIVE_RUNS.dec(bridge=bridge)
+
+    async def _run_test(self, test_data: dict[str, Any]) -> list[TestResult]:
         self._state = RunState.RUNNING
         self._cancel = False
         self._pause_event.set()
@@ -166,92 +293,32 @@ class TestRunner:
         repeat_count = test_data.get("repeat_count", 1)
         steps = test_data["steps"]
         all_results: list[TestResult] = []
+        self._metrics = OnlineMetrics(test_data.get("designed_path"))
 
         await self._emit({"type": "state", "state": "running", "test": test_data["name"]})
+        await self._set_telemetry(self._telemetry_ms)
 
         for repeat_idx in range(repeat_count):
             if self._cancel:
                 break
 
             result = TestResult(test_name=test_data["name"], repeat_index=repeat_idx)
-            run_start = time.monotonic()
-
-            # Read starting angles
-            current_angles = await self._bridge.read_angles()
-
-            for step_idx, step in enumerate(steps):
-                if self._cancel:
-                    break
-
-                await self._pause_event.wait()
+            self._metrics.start_repeat()
+            run_start = self._clock.monotonic()
 
-                target = step["angles"]
-                hold_ms = step.get("hold_ms", 0)
-                label = step.get("label", f"step {step_idx}")
+            if self._batch_moves:
+                await self._run_repeat_batched(result, steps, speed, repeat_idx)
+            else:
+                await self._run_repeat(result, steps, speed, repeat_idx)
 
-                await self._emit({
-                    "type": "state",
-                    "state": "running",
-                    "repeat": repeat_idx,
-                    "step": step_idx,
-                    "label": label,
-                    "target": target,
-                    "speed": speed,
-                })
-
-                step_start = time.monotonic()
-
-                # Send MOVE command (returns immediately after ACK)
-                start_angles = await self._bridge.send_move(target, speed)
-
-                # Stream predicted angles in real-time while firmware moves
-                move_duration = total_duration_ms(speed, current_angles, target)
-                stream_start = time.monotonic()
-                for angles, elapsed in interpolate_poses(current_angles, target, speed):
-                    if self._cancel:
-                        break
-                    real_elapsed = (time.monotonic() - stream_start) * 1000
-                    sleep_needed = (elapsed - real_elapsed) / 1000.0
-                    if sleep_needed > 0:
-                        await asyncio.sleep(sleep_needed)
-                    await self._emit({
-                        "type": "predicted_angles",
-                        "angles": angles,
-                        "elapsed_ms": elapsed,
-                        "step": step_idx,
-                        "repeat": repeat_idx,
-                    })
-
-                # Wait for firmware to confirm movement complete
-                await self._bridge.wait_move_done()
-
-                # Hold period
-                if hold_ms > 0 and not self._cancel:
-                    await asyncio.sleep(hold_ms / 1000.0)
-
-                step_end = time.monotonic()
-                end_angles = await self._bridge.read_angles()
-
-                result.steps.append(StepResult(
-                    label=label,
-                    target_angles=target,
-                    actual_start_angles=start_angles,
-                    actual_end_angles=end_angles,
-                    planned_duration_ms=move_duration + hold_ms,
-                    actual_duration_ms=(step_end - step_start) * 1000,
-                    hold_ms=hold_ms,
-                ))
-
-                await self._emit({"type": "step_complete", "step": step_idx, "repeat": repeat_idx})
-
-                current_angles = end_angles
-
-            result.total_time_ms = (time.monotonic() - run_start) * 1000
-            _compute_metrics(result, test_data)
+            result.total_time_ms = (self._clock.monotonic() - run_start) * 1000
+            self._metrics.finish_repeat(result)
             all_results.append(result)
 
-        # Compute cross-run repeatability and assign to each result
-        rep_score = compute_repeatability(all_results)
+        await self._set_telemetry(0)
+
+        # Cross-run repeatability, from the Welford accumulators
+        rep_score = self._metrics.repeatability([len(r.steps) for r in all_results])
         for r in all_results:
             r.repeatability = rep_score
 
@@ -259,103 +326,258 @@ class TestRunner:
         await self._emit({
             "type": "test_complete",
             "state": self._state.value,
-            "results": [_result_to_dict(r) for r in all_results],
+            "results": [result_to_dict(r) for r in all_results],
         })
 
         return all_results
 
+    async def _emit_step_start(self, step_idx: int, repeat_idx: int, label: str,
+                               target: list[int], speed: int) -> None:
+        await self._emit({
+            "type": "state",
+            "state": "running",
+            "repeat": repeat_idx,
+            "step": step_idx,
+            "label": label,
+            "target": target,
+            "speed": speed,
+        })
 
-# ---------------------------------------------------------------------------
-# Metrics
-# ---------------------------------------------------------------------------
+    async def _step_complete(self, step_idx: int, repeat_idx: int, step: StepResult) -> None:
+        self._metrics.add_step(step_idx, step)
+        # Virtual or warped durations say nothing about the bench's timing
+        if step.planned_duration_ms > 0 and self._clock is SYSTEM_CLOCK:
+            STEP_DRIFT.observe(
+                (step.actual_duration_ms - step.planned_duration_ms) / step.planned_duration_ms,
+                bridge=self._bridge.bridge_type,
+            )
+        await self._emit({
+            "type": "step_complete",
+            "step": step_idx,
+            "repeat": repeat_idx,
+            "metrics": self._metrics.snapshot(),
+        })
 
-def _compute_metrics(result: TestResult, test_data: dict[str, Any]) -> None:
-    """Fill in range_coverage, ergonomic_flags, path_divergence, verdict."""
-    if not result.steps:
-        return
-
-    # Range coverage: per servo, what % of 0-180 was used
-    servo_mins = [180] * 4
-    servo_maxs = [0] * 4
-    prev_angles: list[int] | None = None
-    reversals = 0
-
-    for s in result.steps:
-        for i in range(4):
-            servo_mins[i] = min(servo_mins[i], s.target_angles[i])
-            servo_maxs[i] = max(servo_maxs[i], s.target_angles[i])
-        # Ergonomic: sharp direction reversals
-        if prev_angles is not None:
-            for i in range(4):
-                delta = s.target_angles[i] - prev_angles[i]
-                if prev_angles != result.steps[0].target_angles:
-                    prev_delta = prev_angles[i] - result.steps[max(0, result.steps.index(s) - 2)].target_angles[i]
-                    if delta != 0 and prev_delta != 0 and (delta > 0) != (prev_delta > 0):
-                        reversals += 1
-        prev_angles = s.target_angles
-
-    for i in range(4):
-        span = servo_maxs[i] - servo_mins[i]
-        result.range_coverage[f"servo{i+1}"] = round(span / 180.0 * 100, 1)
-
-    # Ergonomic flags
-    if reversals > 4:
-        result.ergonomic_flags.append(f"sharp_reversals:{reversals}")
-
-    for s in result.steps:
-        if s.hold_ms >= 3000:
-            for i in range(4):
-                if s.target_angles[i] < 20 or s.target_angles[i] > 160:
-                    result.ergonomic_flags.append(f"extreme_hold:{s.label}")
+    async def _set_telemetry(self, period_ms: int) -> None:
+        if not self._telemetry_ms:
+            return
+        try:
+            await self._bridge.set_telemetry(period_ms)
+        except (ValueError, asyncio.TimeoutError) as exc:  # refused, or firmware never echoes TELEM
+            logger.warning("Telemetry unavailable (%r), streaming predictions only", exc)
+            self._telemetry_ms = 0
+
+    async def _emit_telemetry(self, trajectory: TrajectoryTable, step_idx: int, repeat_idx: int) -> None:
+        """Forward buffered firmware POS samples alongside the prediction."""
+        if not self._telemetry_ms:
+            return
+        for sample in self._bridge.drain_telemetry():
+            predicted = trajectory.pose_at(sample.t_ms)
+            divergence = max(abs(m - p) for m, p in zip(sample.angles, predicted))
+            await self._emit({
+                "type": "telemetry",
+                "measured": sample.angles,
+                "predicted": predicted,
+                "elapsed_ms": sample.t_ms,
+                "divergence": divergence,
+                "diverged": divergence > TELEMETRY_DIVERGENCE_DEG,
+                "step": step_idx,
+                "repeat": repeat_idx,
+            })
+
+    async def _stream_predicted(self, trajectory: TrajectoryTable, stream_start: float,
+                                step_idx: int, repeat_idx: int) -> None:
+        """Stream predicted angles in real-time while the firmware moves.
+
+        Without ``stream_fps`` every firmware tick is sent. With it, frames
+        sit on a fixed grid anchored at *stream_start* and carry the pose due
+        at that instant, so intermediate ticks are coalesced and a late
+        frame skips ahead instead of drifting. In ``trajectory`` mode a
+        single descriptor is sent and the client interpolates locally.
+        """
+        send_poses = self._stream_mode == "poses"
+        if not send_poses:
+            await self._emit({
+                "type": "trajectory",
+                **trajectory.descriptor(),
+                "step": step_idx,
+                "repeat": repeat_idx,
+            })
+        interval = 1000.0 / self._stream_fps if self._stream_fps else 0.0
+        ticks = iter(trajectory)
+        end_ms = trajectory.end_ms
+        frame_ms = 0.0
+
+        while not self._cancel:
+            await self._emit_telemetry(trajectory, step_idx, repeat_idx)
+            real_elapsed = (self._clock.monotonic() - stream_start) * 1000
+            if interval:
+                behind = real_elapsed - frame_ms
+                if behind >= interval:
+                    frame_ms += math.floor(behind / interval) * interval
+                frame_ms = min(frame_ms, end_ms)
+                angles = trajectory.pose_at(frame_ms)
+            elif send_poses:
+                row = next(ticks, None)
+                if row is None:
                     break
+                angles, frame_ms = row
+            else:
+                angles, frame_ms = trajectory.final_pose, end_ms
+
+            sleep_needed = (frame_ms - real_elapsed) / 1000.0
+            if sleep_needed > 0:
+                await self._clock.sleep(sleep_needed)
+            if send_poses:
+                await self._emit({
+                    "type": "predicted_angles",
+                    "angles": angles,
+                    "elapsed_ms": frame_ms,
+                    "step": step_idx,
+                    "repeat": repeat_idx,
+                })
+            if frame_ms >= end_ms:
+                break
+            frame_ms += interval
+
+    async def _run_repeat(self, result: TestResult, steps: list[dict[str, Any]],
+                          speed: int, repeat_idx: int) -> None:
+        """One repeat as individual MOVE → DONE → READ round trips."""
+        # Read starting angles
+        current_angles = await self._bridge.read_angles()
+
+        for step_idx, step in enumerate(steps):
+            if self._cancel:
+                break
+
+            await self._pause_event.wait()
+
+            target = step["angles"]
+            hold_ms = step.get("hold_ms", 0)
+            label = step.get("label", f"step {step_idx}")
+            step_speed = step.get("speed", speed)
+
+            await self._emit_step_start(step_idx, repeat_idx, label, target, step_speed)
+
+            step_start = self._clock.monotonic()
+
+            # Send MOVE command (returns immediately after ACK)
+            start_angles = await self._bridge.send_move(target, step_speed)
+
+            trajectory = trajectory_cache.get(current_angles, target, step_speed)
+            await self._stream_predicted(trajectory, self._clock.monotonic(), step_idx, repeat_idx)
+
+            # Wait for firmware to confirm movement complete
+            await self._bridge.wait_move_done()
+            await self._emit_telemetry(trajectory, step_idx, repeat_idx)
+
+            # Hold period
+            if hold_ms > 0 and not self._cancel:
+                await self._clock.sleep(hold_ms / 1000.0)
+
+            step_end = self._clock.monotonic()
+            end_angles = await self._bridge.read_angles()
+
+            result.steps.append(StepResult(
+                label=label,
+                target_angles=target,
+                actual_start_angles=start_angles,
+                actual_end_angles=end_angles,
+                planned_duration_ms=trajectory.duration_ms + hold_ms,
+                actual_duration_ms=(step_end - step_start) * 1000,
+                hold_ms=hold_ms,
+            ))
+
+            await self._step_complete(step_idx, repeat_idx, result.steps[-1])
+
+            current_angles = end_angles
+
+    async def _run_repeat_batched(self, result: TestResult, steps: list[dict[str, Any]],
+                                  speed: int, repeat_idx: int) -> None:
+        """One repeat uploaded as MOVESEQ (one per run of equal step speeds).
+
+        The firmware runs the holds itself and reports each step's end
+        angles, so there is no per-step MOVE/READ turnaround. A hold longer
+        than a waypoint can carry ends its MOVESEQ and is finished on the
+        host. Pause takes effect between repeats; stop aborts after the
+        current step.
+        """
+        await self._pause_event.wait()
+        step_idx = 0
+        while step_idx < len(steps) and not self._cancel:
+            seq_speed = steps[step_idx].get("speed", speed)
+            seq_end = step_idx + 1
+            while (seq_end < len(steps) and steps[seq_end].get("speed", speed) == seq_speed
+                   and steps[seq_end - 1].get("hold_ms", 0) <= MAX_SEQ_HOLD_MS):
+                seq_end += 1
+            if not await self._run_sequence(result, steps, step_idx, seq_end, seq_speed, repeat_idx):
+                break
+            step_idx = seq_end
+
+    async def _run_sequence(self, result: TestResult, steps: list[dict[str, Any]], first: int,
+                            end: int, speed: int, repeat_idx: int) -> bool:
+        """Run ``steps[first:end]`` as one MOVESEQ; False if it was cut short."""
+        waypoints = [
+            (step["angles"], min(max(step.get("hold_ms", 0), 0), MAX_SEQ_HOLD_MS)) for step in steps[first:end]
+        ]
+        current_angles = await self._bridge.send_sequence(waypoints, speed)
+        step_start = self._clock.monotonic()
+        completed = True
+
+        for step_idx in range(first, end):
+            step = steps[step_idx]
+            target = step["angles"]
+            hold_ms = step.get("hold_ms", 0)
+            label = step.get("label", f"step {step_idx}")
+
+            await self._emit_step_start(step_idx, repeat_idx, label, target, speed)
+
+            trajectory = trajectory_cache.get(current_angles, target, speed)
+            await self._stream_predicted(trajectory, step_start, step_idx, repeat_idx)
+
+            event = await self._bridge.wait_step_done()
+            await self._emit_telemetry(trajectory, step_idx, repeat_idx)
+            if event is None:
+                completed = False
+                break
+            _, end_angles = event
+            if hold_ms > MAX_SEQ_HOLD_MS and not self._cancel:
+                # Last step of this MOVESEQ (see _run_repeat_batched)
+                await self._clock.sleep((hold_ms - MAX_SEQ_HOLD_MS) / 1000.0)
+            step_end = self._clock.monotonic()
+
+            result.steps.append(StepResult(
+                label=label,
+                target_angles=target,
+                actual_start_angles=current_angles,
+                actual_end_angles=end_angles,
+                planned_duration_ms=trajectory.duration_ms + hold_ms,
+                actual_duration_ms=(step_end - step_start) * 1000,
+                hold_ms=hold_ms,
+            ))
+
+            await self._step_complete(step_idx, repeat_idx, result.steps[-1])
+
+            current_angles = end_angles
+            step_start = step_end
+
+            if self._cancel:
+                await self._bridge.stop_sequence()
+                completed = False
+                break
+
+        # Consume the end-of-sequence marker (and any step that was still
+        # running when a stop was requested).
+        while await self._bridge.wait_step_done() is not None:
+            pass
+        return completed
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
 
-    # Path divergence against designed_path
-    designed = test_data.get("designed_path", [])
-    actual_path = [s.target_angles for s in result.steps]
-    if designed and actual_path:
-        total_dev = 0.0
-        comparisons = min(len(designed), len(actual_path))
-        for i in range(comparisons):
-            for j in range(4):
-                total_dev += abs(designed[i][j] - actual_path[i][j])
-        max_possible = comparisons * 4 * 180
-        result.path_divergence = round(total_dev / max_possible * 100, 2) if max_possible > 0 else 0.0
-
-    # Timing drift
-    timing_drifts = []
-    for s in result.steps:
-        if s.planned_duration_ms > 0:
-            drift = abs(s.actual_duration_ms - s.planned_duration_ms) / s.planned_duration_ms
-            timing_drifts.append(drift)
-
-    # Verdict
-    if result.ergonomic_flags:
-        result.verdict = "warning"
-    if result.path_divergence > 10:
-        result.verdict = "fail"
-    if any(d > 0.2 for d in timing_drifts):
-        result.verdict = "warning" if result.verdict == "pass" else result.verdict
-
-
-def compute_repeatability(results: list[TestResult]) -> float:
-    """Variance across repeated runs (lower = more consistent)."""
-    if len(results) < 2:
-        return 0.0
-
-    # Compare final angles of each step across runs
-    deviations: list[float] = []
-    step_count = min(len(r.steps) for r in results)
-    for step_idx in range(step_count):
-        for servo_idx in range(4):
-            values = [r.steps[step_idx].actual_end_angles[servo_idx] for r in results]
-            mean = sum(values) / len(values)
-            variance = sum((v - mean) ** 2 for v in values) / len(values)
-            deviations.append(math.sqrt(variance))
-
-    return round(sum(deviations) / len(deviations), 2) if deviations else 0.0
-
-
-def _result_to_dict(result: TestResult) -> dict[str, Any]:
+def result_to_dict(result: TestResult) -> dict[str, Any]:
     """Serialize a TestResult for JSON/WebSocket transport."""
     return {
         "test_name": result.test_name,
@@ -0,0 +1,4 @@
+import os
+
+# Keep test runs out of the real result history.
+os.environ.setdefault("ACCESSWARE_RESULTS_DB", ":memory:")
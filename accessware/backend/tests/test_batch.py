@@ -0,0 +1,81 @@
+"""Tests for parallel catalog evaluation."""
+
+import json
+
+import pytest
+
+from accessware.backend.batch import evaluate_catalog, evaluate_test
+from accessware.backend.simulator import SimConfig
+from accessware.backend.test_runner import TestCatalog
+
+SIM = SimConfig(warp=50)
+
+
+def _write(directory, name, steps, **extra):
+    test = {"name": name, "speed": 2, "repeat_count": 2, "steps": steps, **extra}
+    (directory / f"{name}.json").write_text(json.dumps(test))
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    _write(tmp_path, "reach", [
+        {"angles": [120, 60, 90, 90], "hold_ms": 50, "label": "out"},
+        {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "back"},
+    ])
+    _write(tmp_path, "sweep", [
+        {"angles": [10, 170, 10, 170], "hold_ms": 0, "label": "min"},
+        {"angles": [170, 10, 170, 10], "hold_ms": 0, "label": "max"},
+    ])
+    _write(tmp_path, "broken", [{"angles": [90, 90], "label": "bad"}])
+    return TestCatalog([(tmp_path, "custom")], poll_s=3600)
+
+
+def test_parallel_sweep_matches_in_process(catalog):
+    parallel = evaluate_catalog(workers=3, sim=SIM, catalog=catalog)
+    serial = evaluate_catalog(workers=1, sim=SIM, catalog=catalog)
+
+    assert parallel.workers == 3 and serial.workers == 1
+    assert [e.test_id for e in parallel.evaluations] == ["broken", "reach", "sweep"]
+    for p, s in zip(parallel.evaluations, serial.evaluations):
+        assert p.planned_ms == s.planned_ms
+        assert [r.range_coverage for r in p.results] == [r.range_coverage for r in s.results]
+        assert [[st.actual_end_angles for st in r.steps] for r in p.results] == \
+            [[st.actual_end_angles for st in r.steps] for r in s.results]
+
+    broken, reach, sweep = parallel.evaluations
+    assert broken.verdict == "error" and not broken.results and not broken.feasible
+    assert reach.results[1].steps[0].actual_end_angles == [120, 60, 90, 90]
+    assert sweep.results[0].range_coverage["servo1"] == 88.9  # 10-170 of 0-180
+    assert len(parallel.results) == 4  # two repeats each of the runnable tests
+
+    summary = parallel.summary()
+    assert summary["tests"] == 3 and summary["verdicts"]["error"] == 1
+    assert sum(summary["verdicts"].values()) == 3
+    json.dumps(parallel.to_dict())
+
+
+def test_seeded_sweep_does_not_depend_on_workers(catalog):
+    noisy = SimConfig(warp=50, servo_error=3, seed=7)
+    names = ["reach", "sweep"]
+    parallel = evaluate_catalog(names, workers=2, sim=noisy, catalog=catalog)
+    serial = evaluate_catalog(names, workers=1, sim=noisy, catalog=catalog)
+
+    def ends(report):
+        return [[[st.actual_end_angles for st in r.steps] for r in e.results] for e in report.evaluations]
+
+    assert ends(parallel) == ends(serial)
+
+
+def test_evaluate_reports_failures_without_raising(monkeypatch):
+    async def unplugged(*args):
+        raise ConnectionError("arm unplugged")
+
+    monkeypatch.setattr("accessware.backend.batch._simulate", unplugged)
+    test = {"name": "x", "speed": 5, "steps": [{"angles": [100, 90, 90, 90]}]}
+    evaluation = evaluate_test("x", test, SIM)
+    assert evaluation.verdict == "error"
+    assert evaluation.error == "ConnectionError: arm unplugged"
+    assert evaluation.planned_ms == 30 * 5
+
+    with pytest.raises(FileNotFoundError):
+        evaluate_catalog(["missing"], workers=1)
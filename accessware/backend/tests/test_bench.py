@@ -0,0 +1,45 @@
+"""Tests for the benchmark harness (not the numbers themselves)."""
+
+import json
+
+from accessware.backend.bench import (
+    BENCHMARKS,
+    BenchResult,
+    compare,
+    load_baseline,
+    report,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def test_every_benchmark_runs():
+    results = run_benchmarks(rounds=2, round_s=0.001)
+    assert [r.name for r in results] == list(BENCHMARKS)
+    for r in results:
+        assert len(r.round_ns) == 2 and r.number >= 1
+        assert 0 < r.min_ns <= r.median_ns
+    json.dumps(report(results))
+
+
+def test_prefix_selection():
+    results = run_benchmarks(["serial.", "catalog.list"], rounds=1, round_s=0.001)
+    assert [r.name for r in results] == ["serial.parse_ack", "catalog.list_tests"]
+
+
+def test_baseline_round_trip_and_regressions(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) is None
+    save_baseline([BenchResult("a", 1, 10, [100.0]), BenchResult("b", 1, 10, [100.0])], path)
+    save_baseline([BenchResult("b", 1, 10, [200.0])], path)  # merges, keeps "a"
+    baseline = load_baseline(path)
+    assert {name: r["median_ns"] for name, r in baseline["results"].items()} == {"a": 100.0, "b": 200.0}
+
+    current = [
+        BenchResult("a", 1, 10, [120.0]),  # within 25%
+        BenchResult("b", 1, 10, [300.0]),  # 1.5x slower
+        BenchResult("c", 1, 10, [1e9]),  # not in the baseline
+    ]
+    regressions = compare(current, baseline)
+    assert [(r.name, r.ratio) for r in regressions] == [("b", 1.5)]
+    assert compare(current, baseline, tolerance=0.6) == []
@@ -0,0 +1,81 @@
+"""Tests for the multi-arm bridge pool."""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from accessware.backend.bridge_pool import BridgePool
+from accessware.backend.simulator import SimConfig
+
+MINI_TEST = {
+    "name": "pool-test",
+    "speed": 1,  # 200ms per step on the mock
+    "repeat_count": 1,
+    "steps": [{"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "step1"}],
+}
+
+
+@pytest.mark.asyncio
+async def test_run_many_spreads_tests_across_arms():
+    pool = await BridgePool.mock(3)
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    start = time.monotonic()
+    results = await pool.run_many([MINI_TEST] * 3, on_state_change=capture)
+    elapsed = time.monotonic() - start
+
+    assert len(results) == 3 and all(len(r) == 1 for r in results)
+    # Concurrent: roughly one test's duration, not three
+    assert elapsed < 0.5
+    assert {m["arm"] for m in messages} == {"mock-0", "mock-1", "mock-2"}
+    assert [a["runs"] for a in pool.status()] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_runs_queue_when_all_arms_are_busy():
+    pool = await BridgePool.mock(1)
+    first = asyncio.create_task(pool.run_test(MINI_TEST))
+    await asyncio.sleep(0.01)
+    assert pool.status()[0]["busy"]
+
+    second = asyncio.create_task(pool.run_test(MINI_TEST))
+    await asyncio.sleep(0.01)
+    assert pool.queued == 1
+
+    await asyncio.gather(first, second)
+    assert pool.queued == 0
+    assert not pool.status()[0]["busy"]
+    assert pool.default.runs == 2
+
+
+@pytest.mark.asyncio
+async def test_lease_specific_arm():
+    pool = await BridgePool.mock(2)
+    async with pool.lease("mock-1") as arm:
+        assert arm.arm_id == "mock-1"
+        async with pool.lease() as other:
+            assert other.arm_id == "mock-0"
+    with pytest.raises(KeyError):
+        pool.get("nope")
+
+
+@pytest.mark.asyncio
+async def test_fallback_pool_swaps_in_arms_found_later():
+    pool = await BridgePool.discover(ports=["/dev/nonexistent-arm"], mock_arms=2)
+    assert pool.fallback and [a.arm_id for a in pool.arms] == ["mock-0", "mock-1"]
+    port = SimConfig(warp=100).url("sim-late")
+    try:
+        async with pool.lease("mock-1"):
+            assert await pool.rediscover([port]) == [port]
+            # The busy mock stays until its run is over
+            assert [a.arm_id for a in pool.arms] == ["mock-1", port] and pool.fallback
+        assert await pool.rediscover([port]) == []
+        assert [a.arm_id for a in pool.arms] == [port] and not pool.fallback
+        assert pool.default.bridge.connected
+    finally:
+        await pool.close()
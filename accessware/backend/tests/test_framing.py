@@ -0,0 +1,81 @@
+"""Tests for the serial wire framing."""
+
+import pytest
+
+from accessware.backend.framing import (
+    FRAME_SYNC,
+    FrameDecoder,
+    FramingError,
+    LineDecoder,
+    crc8,
+    encode_ascii,
+    encode_binary,
+)
+
+MESSAGES = [
+    "MOVE,120,60,90,45,15",
+    "READ",
+    "PING",
+    "STOP",
+    "READY",
+    "ACK,90,90,90,90",
+    "DONE",
+    "DONE,3,100,80,90,90",
+    "SEQDONE,5",
+    "PONG",
+    "ERR,UNKNOWN_CMD:FOO",
+    "TELEM,20",
+    "POS,1234,100,80,90,90",
+    "MOVESEQ,10,2\n90,60,120,50,500\n90,90,90,90,3000",
+]
+
+
+def test_crc8_known_value():
+    # CRC-8/SMBUS check value
+    assert crc8(b"123456789") == 0xF4
+
+
+@pytest.mark.parametrize("msg", MESSAGES)
+def test_binary_round_trip(msg):
+    decoder = FrameDecoder()
+    decoder.feed(encode_binary(msg))
+    assert decoder.next_message() == msg
+    assert decoder.next_message() is None
+
+
+def test_binary_is_more_compact_than_ascii():
+    for msg in ("MOVE,120,60,90,45,15", "ACK,120,60,90,45", "DONE,3,100,80,90,90"):
+        assert len(encode_binary(msg)) < len(encode_ascii(msg))
+
+
+def test_frame_decoder_handles_split_input_and_resyncs_after_corruption():
+    good = encode_binary("ACK,1,2,3,4")
+    corrupt = bytearray(encode_binary("ACK,9,9,9,9"))
+    corrupt[4] ^= 0xFF
+    stream = b"\x00\x17" + bytes(corrupt) + good + encode_binary("PONG")
+
+    decoder = FrameDecoder()
+    out = []
+    for byte in stream:  # one byte at a time
+        decoder.feed(bytes([byte]))
+        while (msg := decoder.next_message()) is not None:
+            out.append(msg)
+    assert out == ["ACK,1,2,3,4", "PONG"]
+    assert decoder.bad_frames == 1
+
+
+def test_encode_binary_rejects_unframeable_messages():
+    with pytest.raises(FramingError):
+        encode_binary("MOVE,300,90,90,90,10")
+    with pytest.raises(FramingError):
+        encode_binary("BAUD,115200")
+    with pytest.raises(FramingError, match="u16"):
+        encode_binary("MOVESEQ,5,1\n90,90,90,90,70000")
+
+
+def test_line_decoder_hands_over_remaining_bytes():
+    decoder = LineDecoder()
+    decoder.feed(b"\r\nBIN\n" + bytes([FRAME_SYNC, 0x83]))
+    assert decoder.next_message() == "BIN"
+    assert decoder.next_message() is None
+    assert decoder.take_buffer() == bytes([FRAME_SYNC, 0x83])
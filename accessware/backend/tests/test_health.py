@@ -0,0 +1,75 @@
+"""Tests for the background health monitor."""
+
+import asyncio
+
+import pytest
+
+from accessware.backend.bridge_pool import BridgePool
+from accessware.backend.health import HealthMonitor
+from accessware.backend.simulator import SimConfig
+
+
+@pytest.mark.asyncio
+async def test_idle_arms_are_pinged_and_cached():
+    pool = await BridgePool.simulated(2, SimConfig(warp=50))
+    monitor = HealthMonitor(pool, interval=60)
+    try:
+        assert monitor.get().healthy is None
+        await monitor.check()
+        for arm in pool.arms:
+            health = monitor.get(arm.arm_id)
+            assert health.healthy and health.source == "ping"
+            assert health.rtt_ms is not None and health.rtt_ms > 0
+        assert [a.runs for a in pool.arms] == [0, 0]  # probes are not runs
+
+        # Reading the cache costs no serial traffic
+        commands = pool.default.bridge._serial.stats["commands"]
+        for _ in range(10):
+            assert monitor.get().to_dict()["healthy"]
+        assert pool.default.bridge._serial.stats["commands"] == commands
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_busy_arm_is_not_probed():
+    pool = await BridgePool.simulated(1, SimConfig(warp=50))
+    monitor = HealthMonitor(pool, interval=60)
+    arm = pool.default
+    try:
+        async with pool.lease() as leased:
+            move = asyncio.create_task(leased.bridge.move([120, 90, 90, 90], 20))
+            await asyncio.sleep(0.01)
+            commands = arm.bridge._serial.stats["commands"]
+            await monitor.check()
+            assert arm.bridge._serial.stats["commands"] == commands  # no PING during the move
+            await move
+        health = monitor.get()
+        assert health.skipped == 1
+        assert health.healthy and health.source == "traffic"
+
+        # Released arms are probed again, and a lease waiting on a probe is not lost
+        await monitor.check()
+        assert monitor.get().source == "ping"
+        async with pool.lease():
+            pass
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_background_task_and_disconnect():
+    pool = await BridgePool.mock(1)
+    monitor = HealthMonitor(pool, interval=0.01)
+    monitor.ensure_started()
+    monitor.ensure_started()  # idempotent
+    try:
+        await asyncio.sleep(0.05)
+        assert monitor.get().healthy is True
+        await pool.default.bridge.disconnect()
+        await asyncio.sleep(0.05)
+        health = monitor.get()
+        assert health.healthy is False and health.source == "disconnected"
+        assert health.failures >= 1
+    finally:
+        await monitor.stop()
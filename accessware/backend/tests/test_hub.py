@@ -0,0 +1,76 @@
+"""Tests for the broadcast hub."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from accessware.backend.bridge_pool import BridgePool
+from accessware.backend.hub import ALL_TOPICS, BroadcastHub, Event
+from accessware.backend.jobs import JobScheduler, JobStatus
+from accessware.backend.outbox import ClientOutbox
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+
+    def put(self, msg: Any) -> None:
+        self.events.append(msg)
+
+
+def test_publish_fans_out_one_shared_event():
+    hub = BroadcastHub()
+    a, b, everything, other = Recorder(), Recorder(), Recorder(), Recorder()
+    hub.subscribe("job-1", a)
+    hub.subscribe("job-1", b)
+    hub.subscribe(ALL_TOPICS, everything)
+    hub.subscribe(ALL_TOPICS, a)  # subscribed twice, delivered once
+    hub.subscribe("job-2", other)
+
+    event = hub.publish("job-1", {"type": "step_complete", "step": 0})
+
+    assert a.events == [event] and b.events == [event] and everything.events == [event]
+    assert other.events == []
+    assert a.events[0].text is b.events[0].text  # encoded once, shared
+    assert json.loads(event.text) == {"type": "step_complete", "step": 0}
+
+    hub.unsubscribe_all(a)
+    hub.drop_topic("job-1")
+    assert hub.subscribers("job-1") == 0 and hub.subscribers(ALL_TOPICS) == 1
+
+
+@pytest.mark.asyncio
+async def test_observers_receive_a_running_job():
+    scheduler = JobScheduler(await BridgePool.mock(1))
+    screens: list[list[str]] = [[], []]
+
+    def outbox_for(screen: list[str]) -> ClientOutbox:
+        async def send(text: str) -> None:
+            screen.append(text)
+        outbox = ClientOutbox(send)
+        outbox.start()
+        return outbox
+
+    owner, observer = outbox_for(screens[0]), outbox_for(screens[1])
+    scheduler.hub.subscribe(ALL_TOPICS, observer)
+    job = scheduler.submit({
+        "name": "observed",
+        "speed": 1,
+        "repeat_count": 1,
+        "steps": [{"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "s"}],
+    })
+    scheduler.hub.subscribe(job.job_id, owner)
+
+    while job.status != JobStatus.COMPLETE or owner.depth or observer.depth:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.01)
+
+    assert screens[0] == screens[1]
+    types = [json.loads(t)["type"] for t in screens[0]]
+    assert "predicted_angles" in types and "test_complete" in types
+    assert scheduler.hub.subscribers(job.job_id) == 0  # topic dropped when finished
+    await owner.close()
+    await observer.close()
+    await scheduler.stop()
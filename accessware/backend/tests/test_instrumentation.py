@@ -0,0 +1,88 @@
+"""Tests for the /metrics instrumentation."""
+
+import pytest
+
+from accessware.backend.clock import VirtualClock
+from accessware.backend.instrumentation import (
+    ACTIVE_RUNS,
+    REGISTRY,
+    SERIAL_RTT,
+    STEP_DRIFT,
+    Counter,
+    Gauge,
+    Histogram,
+)
+from accessware.backend.serial_bridge import MockSerialBridge, SerialBridge
+from accessware.backend.test_runner import TestRunner
+
+
+def test_text_exposition():
+    hist = Histogram("t_seconds", "A histogram.", buckets=(0.1, 1), labels=("command",))
+    for value in (0.05, 0.1, 0.5, 3):
+        hist.observe(value, command="READ")
+    assert hist.render().splitlines() == [
+        "# HELP t_seconds A histogram.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{command="READ",le="0.1"} 2',
+        't_seconds_bucket{command="READ",le="1"} 3',
+        't_seconds_bucket{command="READ",le="+Inf"} 4',
+        't_seconds_sum{command="READ"} 3.65',
+        't_seconds_count{command="READ"} 4',
+    ]
+
+    counter = Counter("t_total", "A counter.", labels=("type",))
+    counter.inc(type='say "hi"')
+    assert counter.samples() == ['t_total{type="say \\"hi\\""} 1']
+    with pytest.raises(ValueError):
+        counter.inc()
+
+    depth = [3]
+    assert Gauge("t_depth", "A gauge.", function=lambda: depth[0]).samples() == ["t_depth 3"]
+
+
+@pytest.mark.asyncio
+async def test_bridge_records_round_trips_per_command():
+    before = {c: SERIAL_RTT.count(command=c) for c in ("MOVE", "DONE", "READ", "PING")}
+    bridge = SerialBridge("sim://rtt?warp=100")
+    await bridge.connect()
+    try:
+        await bridge.move([95, 90, 90, 90], 1)
+        await bridge.read_angles()
+        assert await bridge.ping()
+    finally:
+        await bridge.disconnect()
+
+    for command, count in before.items():
+        assert SERIAL_RTT.count(command=command) == count + 1
+    assert 'accessware_serial_rtt_seconds_count{command="DONE"}' in REGISTRY.render()
+
+
+@pytest.mark.asyncio
+async def test_runner_records_drift_and_active_runs():
+    clock = VirtualClock()
+    bridge = MockSerialBridge(clock=clock)
+    await bridge.connect()
+    seen = []
+
+    async def on_state(msg):
+        if msg["type"] == "step_complete":
+            seen.append(ACTIVE_RUNS.value(bridge="mock"))
+
+    steps_before = STEP_DRIFT.count(bridge="mock")
+    test = {
+        "name": "drift",
+        "speed": 1,
+        "steps": [{"angles": [120, 90, 90, 90], "hold_ms": 0}, {"angles": [90, 90, 90, 90], "hold_ms": 0}],
+    }
+    await TestRunner(bridge, on_state, clock=clock).run_test(test)
+    assert seen == [1, 1] and ACTIVE_RUNS.value(bridge="mock") == 0
+    # Virtual durations are not bench drift
+    assert STEP_DRIFT.count(bridge="mock") == steps_before
+
+    wall = MockSerialBridge()
+    await wall.connect()
+    await TestRunner(wall, on_state).run_test({**test, "steps": test["steps"][:1]})
+    assert STEP_DRIFT.count(bridge="mock") == steps_before + 1
+    # The mock charges the worst-case 180 ticks for this 30-tick move
+    assert STEP_DRIFT.sum(bridge="mock") > 0
+    assert 'accessware_active_runs{bridge="mock"} 0' in REGISTRY.render()
@@ -1,17 +1,35 @@
 """Tests for the interpolation module."""
 
+import random
+
+import numpy as np
+
 from accessware.backend.interpolation import (
     ANGLE_MAX,
     ANGLE_MIN,
     TICK_COUNT,
+    TrajectoryCache,
+    TrajectoryTable,
     _clamp,
     _step_angle,
     interpolate_poses,
+    interpolate_poses_array,
     predict_angle_at_time,
+    predict_angles_batch,
     total_duration_ms,
 )
 
 
+def _reference_pose(current, target, speed_ms, elapsed_ms):
+    """Tick-by-tick firmware loop, used to check the closed form."""
+    tick = min(int(elapsed_ms / speed_ms), TICK_COUNT) if speed_ms > 0 else TICK_COUNT
+    s = list(current)
+    t = [_clamp(a) for a in target]
+    for _ in range(max(tick, 0)):
+        s = [_step_angle(t[i], s[i]) for i in range(4)]
+    return s
+
+
 def test_total_duration_worst_case():
     # Without current/target: worst case = speed * 200
     assert total_duration_ms(10) == 2000
@@ -114,3 +132,68 @@ def test_predict_angle_at_time_midway():
     assert result[0] == 105
     # Other servos stay at 90 (target == current, no oscillation)
     assert result[1:] == [90, 90, 90]
+
+
+def test_predict_angle_at_time_matches_tick_loop():
+    rng = random.Random(6)
+    for _ in range(500):
+        current = [rng.randint(ANGLE_MIN, ANGLE_MAX) for _ in range(4)]
+        target = [rng.randint(0, 180) for _ in range(4)]
+        speed = rng.randint(1, 50)
+        elapsed = rng.uniform(-100, speed * 220)
+        assert predict_angle_at_time(current, target, speed, elapsed) == _reference_pose(current, target, speed, elapsed)
+
+
+def test_predict_angles_batch_matches_scalar():
+    rng = np.random.default_rng(6)
+    n = 1000
+    current = rng.integers(ANGLE_MIN, ANGLE_MAX + 1, size=(n, 4))
+    target = rng.integers(0, 181, size=(n, 4))
+    speed = rng.integers(1, 51, size=n)
+    elapsed = rng.uniform(-50, 4000, size=n)
+    poses = predict_angles_batch(current, target, speed, elapsed)
+    assert poses.shape == (n, 4)
+    for i in range(n):
+        expected = predict_angle_at_time(current[i].tolist(), target[i].tolist(), int(speed[i]), float(elapsed[i]))
+        assert poses[i].tolist() == expected
+
+
+def test_predict_angles_batch_broadcasts_single_move():
+    poses = predict_angles_batch([90, 90, 90, 90], [120, 60, 90, 90], 10, [0, 50, 150, 10000])
+    assert poses.tolist() == [[90, 90, 90, 90], [95, 85, 90, 90], [105, 75, 90, 90], [120, 60, 90, 90]]
+
+
+def test_interpolate_poses_array_matches_generator():
+    for current, target in [
+        ([90, 90, 90, 90], [120, 60, 100, 80]),
+        ([90, 90, 90, 90], [90, 90, 90, 90]),
+        ([90, 90, 90, 90], [0, 180, 5, 175]),
+    ]:
+        poses, elapsed = interpolate_poses_array(current, target, 7)
+        expected = list(interpolate_poses(current, target, 7))
+        assert poses.tolist() == [a for a, _ in expected]
+        assert elapsed.tolist() == [e for _, e in expected]
+
+
+def test_trajectory_table_matches_generator():
+    table = TrajectoryTable([90, 90, 90, 90], [0, 120, 95, 80], 10)
+    expected = list(interpolate_poses([90, 90, 90, 90], [0, 120, 95, 80], 10))
+    assert list(table) == expected
+    assert len(table) == len(expected)
+    assert table.final_pose == [10, 120, 95, 80]
+    assert table.duration_ms == total_duration_ms(10, [90, 90, 90, 90], [0, 120, 95, 80])
+
+
+def test_trajectory_cache_hits_and_lru_eviction():
+    cache = TrajectoryCache(maxsize=2)
+    a = cache.get([90, 90, 90, 90], [100, 90, 90, 90], 10)
+    assert cache.get([90, 90, 90, 90], [100, 90, 90, 90], 10) is a
+    # Clamped targets share an entry
+    cache.get([90, 90, 90, 90], [0, 90, 90, 90], 10)
+    cache.get([90, 90, 90, 90], [5, 90, 90, 90], 10)
+    assert cache.stats() == {"hits": 2, "misses": 2, "size": 2, "maxsize": 2}
+
+    cache.get([90, 90, 90, 90], [100, 90, 90, 90], 5)  # evicts the oldest (a)
+    assert len(cache) == 2
+    assert cache.get([90, 90, 90, 90], [100, 90, 90, 90], 10) is not a
+    assert cache.misses == 4
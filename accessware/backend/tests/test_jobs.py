@@ -0,0 +1,158 @@
+"""Tests for the server-side job scheduler."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from accessware.backend.bridge_pool import BridgePool
+from accessware.backend.jobs import JobQueueFull, JobScheduler, JobStatus, job_to_dict
+from accessware.backend.main import app
+from accessware.backend.results_store import ResultsStore
+
+
+def _test(name: str, repeats: int = 1) -> dict[str, Any]:
+    return {
+        "name": name,
+        "speed": 1,  # 200ms per step on the mock
+        "repeat_count": repeats,
+        "steps": [{"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "step1"}],
+    }
+
+
+async def _wait_for(job, *statuses, timeout: float = 5.0) -> None:
+    async def poll():
+        while job.status not in statuses:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_job_runs_and_keeps_results():
+    scheduler = JobScheduler(await BridgePool.mock(1))
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    job = scheduler.submit(_test("kept"), on_state_change=capture)
+    await _wait_for(job, JobStatus.COMPLETE)
+    await asyncio.sleep(0)  # let the final status notification go out
+
+    assert len(job.results) == 1
+    assert job.arm == "mock-0"
+    data = job_to_dict(job)
+    assert data["status"] == "complete" and len(data["results"]) == 1
+    assert all(m["job_id"] == job.job_id for m in messages)
+    assert [m["job"]["status"] for m in messages if m["type"] == "job"] == ["running", "complete"]
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_persisted():
+    store = ResultsStore(":memory:")
+    scheduler = JobScheduler(await BridgePool.mock(1), store=store)
+    job = scheduler.submit(_test("persisted", repeats=2))
+    await _wait_for(job, JobStatus.COMPLETE)
+
+    rows = store.query(test_name="persisted")
+    assert sorted(r["repeat_index"] for r in rows) == [0, 1]
+    assert {(r["arm"], r["job_id"]) for r in rows} == {("mock-0", job.job_id)}
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first():
+    scheduler = JobScheduler(await BridgePool.mock(1))
+    blocker = scheduler.submit(_test("blocker"))
+    await _wait_for(blocker, JobStatus.RUNNING)
+
+    low = scheduler.submit(_test("low"), priority=0)
+    high = scheduler.submit(_test("high"), priority=5)
+    await _wait_for(low, JobStatus.COMPLETE)
+
+    assert high.started_at < low.started_at
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_and_stop_running():
+    scheduler = JobScheduler(await BridgePool.mock(1))
+    running = scheduler.submit(_test("long", repeats=20))
+    queued = scheduler.submit(_test("waiting"))
+    await _wait_for(running, JobStatus.RUNNING)
+
+    scheduler.cancel(queued.job_id)
+    assert queued.status == JobStatus.CANCELLED
+    scheduler.cancel(running.job_id)
+    await _wait_for(running, JobStatus.STOPPED)
+
+    assert len(running.results) < 20
+    await asyncio.sleep(0.05)
+    assert queued.started_at is None
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_while_waiting_for_an_arm():
+    pool = await BridgePool.mock(2)
+    scheduler = JobScheduler(pool)
+    async with pool.lease("mock-0"):
+        job = scheduler.submit(_test("pinned"), arm_id="mock-0")
+        while pool.queued == 0:  # its worker is now waiting in lease()
+            await asyncio.sleep(0.01)
+        scheduler.cancel(job.job_id)
+    await asyncio.sleep(0.1)
+
+    assert job.status == JobStatus.CANCELLED
+    assert job.started_at is None and not job.results
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_pinned_jobs_do_not_hold_up_free_arms():
+    pool = await BridgePool.mock(2)
+    scheduler = JobScheduler(pool)
+    async with pool.lease("mock-0"):
+        pinned = [scheduler.submit(_test(f"pinned-{i}"), arm_id="mock-0") for i in range(2)]
+        free = scheduler.submit(_test("free"))
+        await _wait_for(free, JobStatus.COMPLETE)
+        assert free.arm == "mock-1"
+        assert all(job.status == JobStatus.QUEUED for job in pinned)
+    for job in pinned:
+        await _wait_for(job, JobStatus.COMPLETE)
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded():
+    scheduler = JobScheduler(await BridgePool.mock(1), max_queued=2)
+    scheduler.submit(_test("a"))
+    scheduler.submit(_test("b"))
+    with pytest.raises(JobQueueFull):
+        scheduler.submit(_test("c"))
+    with pytest.raises(KeyError):
+        scheduler.get("nope")
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_jobs_rest_endpoints():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/jobs", json={"name": "nonexistent-test-xyz"})
+        assert resp.status_code == 404
+
+        resp = await client.post("/jobs", json={"name": "grip-and-press", "priority": 3})
+        assert resp.status_code == 200
+        job_id = resp.json()["job_id"]
+        assert resp.json()["status"] in ("queued", "running")
+
+        resp = await client.get(f"/jobs/{job_id}")
+        assert resp.status_code == 200 and "results" in resp.json()
+        resp = await client.get("/jobs", params={"status": "bogus"})
+        assert resp.status_code == 400
+
+        resp = await client.delete(f"/jobs/{job_id}")
+        assert resp.status_code == 200
+        assert (await client.get("/jobs/unknown")).status_code == 404
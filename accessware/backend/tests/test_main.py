@@ -1,9 +1,12 @@
 """Tests for the FastAPI app."""
 
+import asyncio
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from accessware.backend.main import app
+from accessware.backend.serial_bridge import MockSerialBridge
 
 
 @pytest.mark.asyncio
@@ -34,6 +37,32 @@ async def test_get_test_404():
     assert resp.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_get_test_plan():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/tests/grip-and-press/plan", params={"poses": "true"})
+        short = await client.get("/tests/grip-and-press/plan")
+        missing = await client.get("/tests/nonexistent-test-xyz/plan")
+    assert resp.status_code == 200
+    plan = resp.json()
+    assert plan["test"] == "grip-and-press" and plan["feasible"]
+    assert plan["total_ms"] == plan["steps"][-1]["end_ms"] == sum(plan["repeat_ms"])
+    assert plan["poses"] and "poses" not in short.json()
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_test_optimized():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/tests/grip-and-press/optimize", params={"min_speed": 5})
+        bad = await client.get("/tests/grip-and-press/optimize", params={"min_speed": 99})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["saved_ms"] == data["original_ms"] - data["optimized_ms"] > 0
+    assert data["test"]["name"] == "grip-and-press"
+    assert bad.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_websocket_read_angles():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -49,3 +78,81 @@ async def test_websocket_read_angles():
             data = ws.receive_json()
             assert data["type"] == "angles"
             assert len(data["angles"]) == 4
+
+
+def test_websocket_jog_does_not_block_receive_loop():
+    from starlette.testclient import TestClient
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "jog", "angles": [100, 90, 90, 90], "speed": 1})
+            ws.send_json({"type": "jog", "angles": [80, 90, 90, 90], "speed": 1})
+            ws.send_json({"type": "list_jobs"})
+            replies = [ws.receive_json() for _ in range(3)]
+    assert replies[-1] == {"type": "angles", "angles": [100, 90, 90, 90]}
+    assert {r["type"] for r in replies[:2]} == {"jobs", "error"}
+    assert any("busy" in r.get("message", "") for r in replies)
+
+
+def test_websocket_survives_failed_read_angles(monkeypatch):
+    from starlette.testclient import TestClient
+
+    async def silent(self):
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(MockSerialBridge, "read_angles", silent)
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "read_angles"})
+            assert ws.receive_json() == {"type": "error", "message": "Read failed: TimeoutError"}
+            ws.send_json({"type": "list_jobs"})
+            assert ws.receive_json()["type"] == "jobs"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bad", [
+    {"priority": "high"},
+    {"priority": 1.5},
+    {"telemetry_hz": "50"},
+    {"telemetry_hz": 5000},
+    {"stream_fps": [30]},
+    {"batched": "no"},
+    {"arm": ["mock-0"]},
+])
+async def test_create_job_rejects_bad_options(bad):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/jobs", json={"name": "grip-and-press", **bad})
+    assert resp.status_code == 400
+    assert next(iter(bad)) in resp.json()["error"]
+
+
+def test_websocket_survives_bad_run_options():
+    from starlette.testclient import TestClient
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "run_test", "name": "grip-and-press", "stream_fps": [30]})
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"type": "read_angles"})
+            assert ws.receive_json()["type"] == "angles"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE accessware_serial_rtt_seconds histogram" in resp.text
+    assert "accessware_ws_queue_depth 0" in resp.text
+
+
+@pytest.mark.asyncio
+async def test_health_answers_from_cache():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/health")
+        await asyncio.sleep(0.05)  # first background check
+        cached = (await client.get("/health")).json()
+    assert resp.status_code == 200
+    # The shared pool may have been closed by an earlier app shutdown
+    assert cached["healthy"] is cached["connected"]
+    assert cached["health"][0]["source"] in ("ping", "disconnected")
+    assert [h["arm"] for h in cached["health"]] == [a["arm"] for a in cached["arms"]]
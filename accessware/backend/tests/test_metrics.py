@@ -0,0 +1,115 @@
+"""Tests for the vectorized metrics engine."""
+
+import random
+
+import numpy as np
+
+from accessware.backend.metrics import OnlineMetrics, compute_metrics, compute_repeatability, count_reversals
+from accessware.backend.test_runner import StepResult, TestResult
+
+
+def _reference_metrics(result, test_data):
+    """The original per-step Python implementation, used to check the engine."""
+    servo_mins = [180] * 4
+    servo_maxs = [0] * 4
+    prev_angles = None
+    reversals = 0
+    for k, s in enumerate(result.steps):
+        for i in range(4):
+            servo_mins[i] = min(servo_mins[i], s.target_angles[i])
+            servo_maxs[i] = max(servo_maxs[i], s.target_angles[i])
+        if prev_angles is not None:
+            for i in range(4):
+                delta = s.target_angles[i] - prev_angles[i]
+                if prev_angles != result.steps[0].target_angles:
+                    prev_delta = prev_angles[i] - result.steps[max(0, k - 2)].target_angles[i]
+                    if delta != 0 and prev_delta != 0 and (delta > 0) != (prev_delta > 0):
+                        reversals += 1
+        prev_angles = s.target_angles
+    for i in range(4):
+        result.range_coverage[f"servo{i+1}"] = round((servo_maxs[i] - servo_mins[i]) / 180.0 * 100, 1)
+    if reversals > 4:
+        result.ergonomic_flags.append(f"sharp_reversals:{reversals}")
+    for s in result.steps:
+        if s.hold_ms >= 3000 and any(a < 20 or a > 160 for a in s.target_angles):
+            result.ergonomic_flags.append(f"extreme_hold:{s.label}")
+    designed = test_data.get("designed_path", [])
+    if designed:
+        n = min(len(designed), len(result.steps))
+        dev = sum(abs(designed[i][j] - result.steps[i].target_angles[j]) for i in range(n) for j in range(4))
+        result.path_divergence = round(dev / (n * 4 * 180) * 100, 2)
+    drifts = [abs(s.actual_duration_ms - s.planned_duration_ms) / s.planned_duration_ms
+              for s in result.steps if s.planned_duration_ms > 0]
+    if result.ergonomic_flags:
+        result.verdict = "warning"
+    if result.path_divergence > 10:
+        result.verdict = "fail"
+    if any(d > 0.2 for d in drifts):
+        result.verdict = "warning" if result.verdict == "pass" else result.verdict
+
+
+def _random_steps(rng, n):
+    steps = []
+    for k in range(n):
+        target = [rng.choice([10, 15, 90, 165, 170, rng.randint(0, 180)]) for _ in range(4)]
+        planned = rng.choice([0, 400, 1200])
+        actual = planned * rng.uniform(0.9, 1.25)
+        steps.append(StepResult(f"s{k}", target, target, target, planned, actual, rng.choice([0, 500, 3000])))
+    return steps
+
+
+def test_matches_reference_implementation():
+    rng = random.Random(11)
+    for _ in range(300):
+        steps = _random_steps(rng, rng.randint(1, 25))
+        designed = [[rng.randint(0, 180) for _ in range(4)] for _ in range(rng.randint(0, 30))]
+        test_data = {"designed_path": designed} if rng.random() < 0.7 else {}
+        fast, slow = TestResult("t", 0, steps=steps), TestResult("t", 0, steps=steps)
+        compute_metrics(fast, test_data)
+        _reference_metrics(slow, test_data)
+        assert fast == slow
+
+
+def test_reversals_skip_moves_out_of_the_start_pose():
+    start, a, b = [90] * 4, [100, 90, 90, 90], [80, 90, 90, 90]
+    assert count_reversals(np.array([start, a, b, a, b])) == 3
+    assert count_reversals(np.array([start, a, start, a])) == 1
+
+
+def test_long_session_scores():
+    steps = _random_steps(random.Random(3), 50_000)
+    result = TestResult("long", 0, steps=steps)
+    compute_metrics(result, {"designed_path": [s.target_angles for s in steps]})
+    assert result.path_divergence == 0.0
+
+
+def test_online_metrics_track_batch_results():
+    rng = random.Random(5)
+    for _ in range(50):
+        designed = [[rng.randint(0, 180) for _ in range(4)] for _ in range(rng.randint(0, 12))]
+        test_data = {"designed_path": designed}
+        online = OnlineMetrics(designed)
+        results = []
+        for repeat in range(rng.randint(1, 4)):
+            steps = _random_steps(rng, rng.randint(1, 10))
+            for s in steps:
+                s.actual_end_angles = [a + rng.randint(-2, 2) for a in s.target_angles]
+            online.start_repeat()
+            for idx, step in enumerate(steps):
+                online.add_step(idx, step)
+            result = TestResult("t", repeat, steps=steps)
+            compute_metrics(result, test_data)
+            results.append(result)
+
+            snap = online.snapshot()
+            assert snap["range_coverage"] == result.range_coverage
+            assert snap["path_divergence"] == result.path_divergence
+            assert snap["verdict"] == result.verdict
+            assert online.extreme_holds == [f[len("extreme_hold:"):] for f in result.ergonomic_flags
+                                            if f.startswith("extreme_hold:")]
+            # The runner scores repeats from the online state alone
+            scored = TestResult("t", repeat, steps=steps)
+            online.finish_repeat(scored)
+            assert scored == result
+        lengths = [len(r.steps) for r in results]
+        assert online.repeatability(lengths) == compute_repeatability(results)
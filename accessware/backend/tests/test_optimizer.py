@@ -0,0 +1,124 @@
+"""Tests for the step optimizer."""
+
+import pytest
+
+from accessware.backend.clock import VirtualClock
+from accessware.backend.interpolation import total_duration_ms
+from accessware.backend.optimizer import _travel_ms, optimize_test
+from accessware.backend.planner import plan_test
+from accessware.backend.serial_bridge import MockSerialBridge
+from accessware.backend.test_runner import TestRunner
+
+NOOPS = {
+    "name": "noops",
+    "speed": 10,
+    "repeat_count": 2,
+    "designed_path": [[120, 90, 90, 90], [120, 90, 90, 90], [90, 90, 90, 90]],
+    "steps": [
+        {"angles": [120, 90, 90, 90], "hold_ms": 100, "label": "out"},
+        {"angles": [120, 90, 90, 90], "hold_ms": 200, "label": "hold"},
+        {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "back"},
+        {"angles": [5, 90, 90, 90], "hold_ms": 0, "label": "low"},
+        {"angles": [10, 90, 90, 90], "hold_ms": 50, "label": "low again"},
+    ],
+}
+
+
+def test_merges_noop_steps():
+    result = optimize_test(NOOPS)
+    steps = result.test["steps"]
+    assert [s["label"] for s in steps] == ["out", "back", "low"]
+    assert [s["hold_ms"] for s in steps] == [300, 0, 50]
+    assert result.test["designed_path"] == [[120, 90, 90, 90], [90, 90, 90, 90]]
+    # Two no-ops (one only equal after clamping) per repeat, speed * 20 each
+    assert result.saved_ms == 2 * 2 * 10 * 20
+    assert len(result.changes) == 2
+    assert NOOPS["steps"][0]["hold_ms"] == 100  # input untouched
+
+
+def test_picks_speeds_within_limits():
+    test = {
+        "name": "speeds",
+        "speed": 20,
+        "steps": [
+            {"angles": [150, 90, 90, 90], "label": "fast"},
+            {"angles": [90, 90, 90, 90], "label": "careful", "min_speed": 12},
+            {"angles": [100, 90, 90, 90], "label": "already fast", "speed": 2},
+        ],
+    }
+    result = optimize_test(test, min_speed=5)
+    assert [s.get("speed") for s in result.test["steps"]] == [5, 12, 2]
+    assert result.test["speed"] == 20
+    assert result.changes == [
+        "sped up 1 step(s) to the 5 ms/tick limit",
+        "sped up 1 step(s) to their own 12 ms/tick min_speed",
+    ]
+    assert result.optimized_ms == plan_test(result.test).total_ms < result.original_ms
+
+    uniform = optimize_test({**test, "steps": test["steps"][:1]}, min_speed=5)
+    assert uniform.test["speed"] == 5 and "speed" not in uniform.test["steps"][0]
+
+    with pytest.raises(ValueError):
+        optimize_test(test, min_speed=0)
+    with pytest.raises(ValueError, match="cannot be planned"):
+        optimize_test({"name": "broken", "steps": []})
+
+
+def test_step_speeds_are_costed_as_the_firmware_clamps_them():
+    test = {
+        "name": "clamped",
+        "speed": 10,
+        "steps": [{"angles": [150, 90, 90, 90], "label": "slow", "speed": 100}],
+    }
+    # 100 ms/tick runs at 50: nothing to gain from a 50 ms/tick limit
+    result = optimize_test(test, min_speed=50)
+    assert result.changes == [] and result.saved_ms == 0
+    step = test["steps"][0]
+    assert _travel_ms([90] * 4, [(0, step)], None, 10) == total_duration_ms(50, [90] * 4, step["angles"])
+
+
+def test_reorders_groups_for_least_travel():
+    test = {
+        "name": "groups",
+        "speed": 10,
+        "steps": [
+            {"angles": [90, 90, 90, 90], "label": "home"},
+            {"angles": [160, 90, 90, 90], "label": "far", "group": "g"},
+            {"angles": [100, 90, 90, 90], "label": "near", "group": "g"},
+            {"angles": [130, 90, 90, 90], "label": "mid", "group": "g"},
+            {"angles": [170, 90, 90, 90], "label": "end"},
+        ],
+    }
+    assert optimize_test(test).saved_ms == 0  # groups stay put unless asked
+    result = optimize_test(test, reorder=True)
+    assert [s["label"] for s in result.test["steps"]] == ["home", "near", "mid", "far", "end"]
+    # 70 + 60 + 30 + 40 degrees of travel become 10 + 30 + 30 + 10
+    assert result.saved_ms == (200 - 80) * 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_moves", [False, True])
+async def test_optimized_test_runs_with_per_step_speeds(batch_moves):
+    result = optimize_test({
+        "name": "mixed",
+        "speed": 4,
+        "steps": [
+            {"angles": [100, 90, 90, 90], "label": "a"},
+            {"angles": [110, 90, 90, 90], "label": "b", "min_speed": 3},
+            {"angles": [100, 90, 90, 90], "label": "c"},
+        ],
+    }, min_speed=1)
+    assert [s.get("speed") for s in result.test["steps"]] == [1, 3, 1]
+
+    clock = VirtualClock()
+    bridge = MockSerialBridge(clock=clock)
+    await bridge.connect()
+    messages = []
+
+    async def capture(msg):
+        messages.append(msg)
+
+    (run,) = await TestRunner(bridge, capture, batch_moves=batch_moves, clock=clock).run_test(result.test)
+    assert [s.actual_end_angles for s in run.steps] == [[100, 90, 90, 90], [110, 90, 90, 90], [100, 90, 90, 90]]
+    assert [m["speed"] for m in messages if m["type"] == "state" and "step" in m] == [1, 3, 1]
+    assert sum(s.planned_duration_ms for s in run.steps) == result.optimized_ms
@@ -0,0 +1,84 @@
+"""Tests for per-client WebSocket send queues."""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import pytest
+
+from accessware.backend.outbox import ClientOutbox
+
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_oldest_predictions_but_keeps_order():
+    received: list[dict[str, Any]] = []
+    gate = asyncio.Event()
+
+    async def slow_send(text: str) -> None:
+        await gate.wait()
+        received.append(json.loads(text))
+
+    outbox = ClientOutbox(slow_send, maxsize=5)
+    outbox.start()
+
+    start = time.perf_counter()
+    for step in range(3):
+        for i in range(20):
+            outbox.put({"type": "predicted_angles", "elapsed_ms": i, "step": step})
+        outbox.put({"type": "step_complete", "step": step})
+    outbox.put({"type": "test_complete"})
+    assert time.perf_counter() - start < 0.05  # producers never wait on the socket
+
+    gate.set()
+    while outbox.depth:
+        await asyncio.sleep(0.001)
+
+    types = [m["type"] for m in received]
+    assert types.count("step_complete") == 3 and types[-1] == "test_complete"
+    assert types.count("predicted_angles") <= 6
+    assert outbox.dropped == 60 - types.count("predicted_angles")
+    # Survivors are the newest frames, still ahead of their step_complete
+    last = [m for m in received if m["type"] == "predicted_angles"][-1]
+    assert last == {"type": "predicted_angles", "elapsed_ms": 19, "step": 2}
+    assert types.index("test_complete") > types.index("step_complete")
+    stats = outbox.stats()
+    assert stats["max_depth"] >= 5 and stats["depth"] == 0
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_send_failure_and_backlog_close_the_outbox():
+    async def broken(text: str) -> None:
+        raise RuntimeError("socket gone")
+
+    outbox = ClientOutbox(broken)
+    outbox.start()
+    outbox.put({"type": "state"})
+    await asyncio.sleep(0.01)
+    assert outbox.closed and outbox.errors == 1
+    outbox.put({"type": "state"})  # ignored once closed
+    assert outbox.depth == 0
+    await outbox.close()
+
+    stalled = ClientOutbox(broken, backlog_limit=3)  # writer never started
+    for _ in range(4):
+        stalled.put({"type": "step_complete"})
+    assert stalled.closed and stalled.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_backlog_overflow_hands_the_stuck_client_to_on_overflow():
+    overflowed: list[str] = []
+
+    async def stuck(text: str) -> None:
+        await asyncio.Event().wait()  # socket never drains
+
+    outbox = ClientOutbox(stuck, backlog_limit=3, on_overflow=lambda: overflowed.append("close"))
+    outbox.start()
+    for _ in range(4):
+        outbox.put({"type": "step_complete"})
+    await asyncio.sleep(0.01)
+    assert overflowed == ["close"]
+    assert outbox.closed and outbox.depth == 0
+    await asyncio.wait_for(outbox.close(), 1)  # the stuck writer was cancelled
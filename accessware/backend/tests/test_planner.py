@@ -0,0 +1,98 @@
+"""Tests for the offline dry-run planner."""
+
+import json
+import os
+
+import pytest
+
+from accessware.backend.clock import VirtualClock
+from accessware.backend.interpolation import predict_angle_at_time
+from accessware.backend.planner import PlanCache, plan_test, validate_test
+from accessware.backend.serial_bridge import MockSerialBridge
+from accessware.backend.test_runner import TestCatalog, TestRunner, load_test
+
+TWO_STEPS = {
+    "name": "plan-test",
+    "speed": 10,
+    "repeat_count": 2,
+    "steps": [
+        {"angles": [120, 60, 90, 90], "hold_ms": 500, "label": "out"},
+        {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "back"},
+    ],
+}
+
+
+def test_plan_composes_moves_holds_and_repeats():
+    plan = plan_test(TWO_STEPS)
+    assert plan.feasible and not plan.issues
+    # 30 ticks + 20 settle at 10 ms, then the hold
+    assert [(s.move_ms, s.hold_ms) for s in plan.steps] == [(500, 500), (500, 0)] * 2
+    assert [s.start_ms for s in plan.steps] == [0, 1000, 1500, 2500]
+    assert plan.total_ms == 3000 and plan.repeat_ms() == [1500, 1500]
+    assert plan.steps[1].start_angles == [120, 60, 90, 90]
+
+    # The pose stream follows the closed form, offset by each step's start
+    for t_ms, *angles in plan.poses[:30]:
+        assert angles == predict_angle_at_time([90] * 4, [120, 60, 90, 90], 10, t_ms)
+    assert plan.poses[-1] == [3000, 90, 90, 90, 90]
+    assert [row[0] for row in plan.poses] == sorted(row[0] for row in plan.poses)
+    # Both repeats start from [90]*4, so their poses are stored once
+    assert plan.repeat_cycles == [0, 0] and len(plan.poses) == 2 * len(plan.cycles[0])
+
+    summary = plan.to_dict()
+    assert "poses" not in summary and summary["steps"][0]["end_ms"] == 1000
+    assert plan.to_dict(include_poses=True)["poses"] == plan.poses
+
+
+@pytest.mark.asyncio
+async def test_plan_matches_runner_planned_durations():
+    test_data = load_test("grip-and-press")
+    clock = VirtualClock()
+    bridge = MockSerialBridge(clock=clock)
+    await bridge.connect()
+    results = await TestRunner(bridge, clock=clock).run_test(test_data)
+
+    plan = plan_test(test_data)
+    planned = [s.planned_duration_ms for r in results for s in r.steps]
+    assert [s.duration_ms for s in plan.steps] == planned
+    assert [s.end_angles for s in plan.steps] == [s.actual_end_angles for r in results for s in r.steps]
+
+
+def test_validation_flags_clamps_and_broken_steps():
+    issues = validate_test({
+        "speed": 80,
+        "steps": [
+            {"angles": [0, 90, 90, 175], "hold_ms": -5},
+            {"angles": [90, 90, 90], "hold_ms": 0},
+            {"angles": [90, 90, 90, 90], "hold_ms": 70000},
+        ],
+    })
+    assert [(i.level, i.step) for i in issues] == [
+        ("warning", None), ("warning", 0), ("warning", 0), ("error", 1), ("warning", 2),
+    ]
+    assert "servo1, servo4" in issues[1].message
+
+    plan = plan_test({"name": "empty", "steps": []})
+    assert not plan.feasible and plan.steps == [] and plan.to_dict()["repeat_ms"] == []
+
+    clamped = plan_test({"name": "fast", "speed": 0, "steps": [{"angles": [100, 90, 90, 90]}]})
+    assert clamped.feasible and clamped.speed == 1 and clamped.total_ms == 30
+
+
+def test_plan_cache_follows_file_version(tmp_path):
+    path = tmp_path / "t.json"
+    path.write_text(json.dumps({**TWO_STEPS, "repeat_count": 1}))
+    catalog = TestCatalog([(tmp_path, "custom")], poll_s=3600)
+    cache = PlanCache(catalog)
+
+    first = cache.get("plan-test")
+    assert cache.get("t") is not first  # cached per name as requested
+    assert cache.get("plan-test") is first
+    assert cache.stats()["hits"] == 1
+
+    path.write_text(json.dumps({**TWO_STEPS, "repeat_count": 3}))
+    os.utime(path, ns=(0, 0))
+    catalog.invalidate()
+    assert cache.get("plan-test").repeat_count == 3
+    with pytest.raises(FileNotFoundError):
+        cache.get("missing")
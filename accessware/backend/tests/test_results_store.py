@@ -0,0 +1,69 @@
+"""Tests for the persistent results store."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from accessware.backend.main import app, get_results_store
+from accessware.backend.results_store import ResultsStore
+from accessware.backend.test_runner import StepResult, TestResult
+
+
+def _result(name: str, repeat: int = 0, verdict: str = "pass") -> TestResult:
+    step = StepResult("s", [90, 90, 90, 90], [90, 90, 90, 90], [90, 90, 90, 90], 400, 410.0, 0)
+    return TestResult(name, repeat, steps=[step], total_time_ms=410.0, verdict=verdict)
+
+
+def test_append_and_filter():
+    store = ResultsStore(":memory:")
+    store.append([_result("a", 0), _result("a", 1, "fail")], arm="arm-1", job_id="j1", recorded_at=100.0)
+    store.append([_result("b")], arm="arm-2", recorded_at=200.0)
+
+    assert store.count() == 3
+    assert [r["test_name"] for r in store.query()] == ["b", "a", "a"]  # newest first
+    assert [r["repeat_index"] for r in store.query(test_name="a", verdict="fail")] == [1]
+    assert [r["test_name"] for r in store.query(arm="arm-2")] == ["b"]
+    assert store.count(since=150.0) == 1 and store.count(until=150.0) == 2
+    assert "result" not in store.query()[0]
+
+    full = store.query(test_name="b", include_steps=True)[0]
+    assert full["result"]["steps"][0]["planned_duration_ms"] == 400
+    assert store.get(full["id"])["result"]["test_name"] == "b"
+    with pytest.raises(KeyError):
+        store.get(999)
+
+
+def test_summary_and_paging():
+    store = ResultsStore(":memory:")
+    for i in range(10):
+        store.append([_result("a", verdict="fail" if i % 2 else "pass")], recorded_at=float(i))
+
+    (summary,) = store.summary()
+    assert summary["runs"] == 10 and summary["passed"] == 5 and summary["failed"] == 5
+    assert summary["first_at"] == 0.0 and summary["last_at"] == 9.0
+
+    page = store.query(limit=3, offset=3)
+    assert [r["recorded_at"] for r in page] == [6.0, 5.0, 4.0]
+
+
+def test_store_persists_to_disk(tmp_path):
+    path = tmp_path / "sub" / "results.db"
+    store = ResultsStore(path)
+    store.append([_result("a")])
+    store.close()
+    assert ResultsStore(path).count(test_name="a") == 1
+
+
+@pytest.mark.asyncio
+async def test_results_endpoints():
+    store = get_results_store()
+    (result_id,) = store.append([_result("endpoint-test")], arm="mock-0")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/results", params={"test": "endpoint-test"})
+        assert resp.status_code == 200 and resp.json()[0]["id"] == result_id
+
+        resp = await client.get("/results/summary", params={"test": "endpoint-test"})
+        assert resp.json()[0]["runs"] == 1
+
+        resp = await client.get(f"/results/{result_id}")
+        assert resp.json()["result"]["test_name"] == "endpoint-test"
+        assert (await client.get("/results/123456")).status_code == 404
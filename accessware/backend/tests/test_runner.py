@@ -1,12 +1,17 @@
 """Tests for the test runner."""
 
 import asyncio
+import json
+import os
+import time
 from typing import Any
 
 import pytest
 
+from accessware.backend.clock import VirtualClock
+from accessware.backend.interpolation import total_duration_ms, trajectory_cache
 from accessware.backend.serial_bridge import MockSerialBridge
-from accessware.backend.test_runner import TestRunner, list_tests, load_test
+from accessware.backend.test_runner import TestCatalog, TestRunner, list_tests, load_test
 
 
 @pytest.mark.asyncio
@@ -36,6 +41,37 @@ def test_load_test_not_found():
         load_test("nonexistent-test-xyz")
 
 
+def test_catalog_indexes_and_invalidates(tmp_path):
+    bundled, custom = tmp_path / "bundled", tmp_path / "custom"
+    bundled.mkdir()
+    custom.mkdir()
+    (bundled / "a.json").write_text(json.dumps({"name": "alpha", "steps": []}))
+    (custom / "b.json").write_text("{not json")
+    catalog = TestCatalog([(bundled, "bundled"), (custom, "custom")], poll_s=3600)
+
+    assert [t["id"] for t in catalog.list()] == ["a"]
+    assert catalog.get("alpha") == catalog.get("a")
+    catalog.get("a")["steps"].append("mutated")
+    assert catalog.get("a")["steps"] == []
+
+    # Within the poll interval nothing is rescanned...
+    (custom / "c.json").write_text(json.dumps({"name": "gamma"}))
+    with pytest.raises(FileNotFoundError):
+        catalog.get("gamma")
+    # ...until invalidated; changed files (by mtime/size) are re-parsed
+    (bundled / "a.json").write_text(json.dumps({"name": "alpha2", "steps": [1]}))
+    os.utime(bundled / "a.json", ns=(0, 0))
+    catalog.invalidate()
+    assert catalog.get("gamma")["name"] == "gamma"
+    assert catalog.get("alpha2")["steps"] == [1]
+    with pytest.raises(FileNotFoundError):
+        catalog.get("alpha")
+
+    (custom / "c.json").unlink()
+    catalog.refresh(force=True)
+    assert [t["id"] for t in catalog.list()] == ["a"]
+
+
 @pytest.mark.asyncio
 async def test_runner_completes_with_mock_bridge():
     bridge = MockSerialBridge()
@@ -91,3 +127,235 @@ async def test_predicted_angles_arrive_before_step_complete():
     assert len(step_complete_indices) > 0, "Should have step_complete messages"
     # All predicted_angles must come before the first step_complete
     assert max(predicted_indices) < min(step_complete_indices)
+
+
+@pytest.mark.asyncio
+async def test_repeats_reuse_cached_trajectories():
+    """After the first repeat every step is served from the trajectory cache."""
+    bridge = MockSerialBridge()
+    await bridge.connect()
+    trajectory_cache.clear()
+
+    runner = TestRunner(bridge)
+    test_data = {
+        "name": "cache-test",
+        "speed": 1,
+        "repeat_count": 3,
+        "steps": [
+            {"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "out"},
+            {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "back"},
+        ],
+    }
+    await runner.run_test(test_data)
+    assert trajectory_cache.misses == 2
+    assert trajectory_cache.hits == 4
+
+
+@pytest.mark.asyncio
+async def test_batched_runner_matches_step_results():
+    bridge = MockSerialBridge()
+    await bridge.connect()
+
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    runner = TestRunner(bridge, on_state_change=capture, batch_moves=True)
+    test_data = {
+        "name": "batched-test",
+        "speed": 1,
+        "repeat_count": 2,
+        "steps": [
+            {"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "out"},
+            {"angles": [90, 90, 90, 90], "hold_ms": 10, "label": "back"},
+        ],
+    }
+    results = await runner.run_test(test_data)
+    assert len(results) == 2
+    assert [s.actual_end_angles for s in results[0].steps] == [[100, 80, 90, 90], [90, 90, 90, 90]]
+    assert results[0].steps[1].actual_start_angles == [100, 80, 90, 90]
+    types = [m["type"] for m in messages]
+    assert types.count("step_complete") == 4
+    assert types[-1] == "test_complete"
+
+    # Partial metrics ride along with every step_complete
+    completes = [m for m in messages if m["type"] == "step_complete"]
+    assert [m["metrics"]["steps"] for m in completes] == [1, 2, 1, 2]
+    assert completes[-1]["metrics"]["range_coverage"] == results[1].range_coverage
+    assert completes[-1]["metrics"]["repeatability"] == results[1].repeatability == 0.0
+
+
+@pytest.mark.asyncio
+async def test_runner_streams_measured_vs_predicted_telemetry():
+    bridge = MockSerialBridge()
+    await bridge.connect()
+
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    runner = TestRunner(bridge, on_state_change=capture, telemetry_ms=5)
+    test_data = {
+        "name": "telemetry-test",
+        "speed": 1,
+        "repeat_count": 1,
+        "steps": [{"angles": [130, 90, 90, 90], "hold_ms": 0, "label": "out"}],
+    }
+    await runner.run_test(test_data)
+
+    telemetry = [m for m in messages if m["type"] == "telemetry"]
+    assert telemetry
+    assert all(m["measured"] == m["predicted"] and not m["diverged"] for m in telemetry)
+    types = [m["type"] for m in messages]
+    assert types.index("step_complete") > max(i for i, t in enumerate(types) if t == "telemetry")
+
+
+@pytest.mark.asyncio
+async def test_runner_runs_without_telemetry_when_firmware_is_silent():
+    class SilentTelemetryBridge(MockSerialBridge):
+        async def set_telemetry(self, period_ms: int) -> None:
+            raise asyncio.TimeoutError
+
+    bridge = SilentTelemetryBridge()
+    await bridge.connect()
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    test_data = {
+        "name": "silent-telemetry",
+        "speed": 1,
+        "steps": [{"angles": [100, 90, 90, 90], "hold_ms": 0, "label": "out"}],
+    }
+    [result] = await TestRunner(bridge, on_state_change=capture, telemetry_ms=5).run_test(test_data)
+
+    assert len(result.steps) == 1
+    assert not [m for m in messages if m["type"] == "telemetry"]
+    assert messages[-1]["type"] == "test_complete"
+
+
+@pytest.mark.asyncio
+async def test_stream_fps_coalesces_predicted_frames():
+    bridge = MockSerialBridge()
+    await bridge.connect()
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    runner = TestRunner(bridge, on_state_change=capture, stream_fps=20)
+    test_data = {
+        "name": "fps-test",
+        "speed": 3,  # 70 ticks * 3ms, settled at (70+20)*3 = 270ms
+        "repeat_count": 1,
+        "steps": [{"angles": [160, 90, 90, 90], "hold_ms": 0, "label": "out"}],
+    }
+    await runner.run_test(test_data)
+
+    frames = [m for m in messages if m["type"] == "predicted_angles"]
+    assert 2 <= len(frames) <= 7  # vs 71 per-tick messages
+    assert frames[-1]["angles"] == [160, 90, 90, 90] and frames[-1]["elapsed_ms"] == 270
+    # Frames sit on the 50ms grid (the last one is clamped to the end)
+    assert all(f["elapsed_ms"] % 50 == 0 for f in frames[:-1])
+
+
+@pytest.mark.asyncio
+async def test_trajectory_stream_mode_sends_descriptor():
+    bridge = MockSerialBridge()
+    await bridge.connect()
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    runner = TestRunner(bridge, on_state_change=capture, stream_mode="trajectory")
+    test_data = {
+        "name": "descriptor-test",
+        "speed": 1,
+        "repeat_count": 1,
+        "steps": [{"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "out"}],
+    }
+    await runner.run_test(test_data)
+
+    types = [m["type"] for m in messages]
+    assert "predicted_angles" not in types
+    (desc,) = [m for m in messages if m["type"] == "trajectory"]
+    assert desc["start"] == [90, 90, 90, 90] and desc["target"] == [100, 80, 90, 90]
+    assert desc["speed"] == 1 and desc["end_ms"] == 30
+    assert types.index("trajectory") < types.index("step_complete")
+
+    with pytest.raises(ValueError):
+        TestRunner(bridge, stream_mode="bogus")
+
+
+async def _run_with_clock(test_data: dict[str, Any], clock=None, **kwargs: Any):
+    bridge = MockSerialBridge(clock=clock)
+    await bridge.connect()
+    messages: list[dict[str, Any]] = []
+
+    async def capture(msg: dict[str, Any]) -> None:
+        messages.append(msg)
+
+    runner = TestRunner(bridge, on_state_change=capture, clock=clock, **kwargs)
+    return await runner.run_test(test_data), messages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_moves", [False, True])
+async def test_virtual_clock_fast_forwards_long_tests(batch_moves):
+    steps = [
+        {"angles": [170, 10, 90, 90], "hold_ms": 3000, "label": "reach"},
+        {"angles": [10, 170, 90, 90], "hold_ms": 3000, "label": "sweep"},
+    ]
+    test_data = {"name": "fatigue", "speed": 50, "repeat_count": 5, "steps": steps}
+    clock = VirtualClock()
+
+    start = time.perf_counter()
+    results, messages = await _run_with_clock(test_data, clock, batch_moves=batch_moves)
+    assert time.perf_counter() - start < 2.0
+
+    # ~2 minutes of bench time, measured in virtual milliseconds
+    step_ms = total_duration_ms(50) + 3000
+    assert clock.monotonic() == pytest.approx(10 * step_ms / 1000, abs=0.5)
+    assert all(s.actual_duration_ms == pytest.approx(step_ms) for r in results for s in r.steps)
+    assert [len(r.steps) for r in results] == [2] * 5
+    assert messages[-1]["type"] == "test_complete"
+
+
+@pytest.mark.asyncio
+async def test_batched_hold_longer_than_a_waypoint_finishes_on_host():
+    steps = [
+        {"angles": [100, 90, 90, 90], "hold_ms": 100_000, "label": "long"},
+        {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "back"},
+    ]
+    test_data = {"name": "long-hold", "speed": 1, "steps": steps}
+    clock = VirtualClock()
+    [result], _ = await _run_with_clock(test_data, clock, batch_moves=True)
+
+    assert [s.actual_end_angles for s in result.steps] == [s["angles"] for s in steps]
+    assert result.steps[0].actual_duration_ms == pytest.approx(total_duration_ms(1) + 100_000)
+
+
+@pytest.mark.asyncio
+async def test_virtual_clock_run_matches_real_time_run():
+    test_data = {
+        "name": "same-run",
+        "speed": 1,
+        "repeat_count": 2,
+        "steps": [
+            {"angles": [100, 80, 90, 90], "hold_ms": 10, "label": "out"},
+            {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "back"},
+        ],
+    }
+    real, real_msgs = await _run_with_clock(test_data)
+    fast, fast_msgs = await _run_with_clock(test_data, VirtualClock())
+
+    assert [m["type"] for m in fast_msgs] == [m["type"] for m in real_msgs]
+    assert [m for m in fast_msgs if m["type"] == "predicted_angles"] == \
+        [m for m in real_msgs if m["type"] == "predicted_angles"]
+    for r, f in zip(real, fast):
+        assert [s.actual_end_angles for s in f.steps] == [s.actual_end_angles for s in r.steps]
+        assert [s.planned_duration_ms for s in f.steps] == [s.planned_duration_ms for s in r.steps]
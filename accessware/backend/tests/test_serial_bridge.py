@@ -1,11 +1,136 @@
-"""Tests for serial bridge (MockSerialBridge)."""
+"""Tests for serial bridge (MockSerialBridge, SerialBridge over a fake port)."""
 
 import asyncio
+import queue
+import threading
 import time
 
 import pytest
 
-from accessware.backend.serial_bridge import MockSerialBridge
+from accessware.backend.clock import VirtualClock
+from accessware.backend.framing import FrameDecoder, LineDecoder, encode_ascii, encode_binary
+from accessware.backend.interpolation import predict_angle_at_time, total_duration_ms
+from accessware.backend.serial_bridge import MAX_SEQ_STEPS, MockSerialBridge, SerialBridge
+
+
+class FakeArduino:
+    """pyserial-like port running the serial_control.ino command loop.
+
+    Commands are handled one at a time on a worker thread, like the
+    firmware's blocking ``loop()``. *time_scale* shrinks MOVE durations.
+    Supports the BAUD/BIN negotiation unless *legacy* is set.
+    """
+
+    def __init__(self, time_scale: float = 0.01, noise: list[str] | None = None, legacy: bool = False) -> None:
+        self.timeout = 1.0
+        self.baudrate = 9600
+        self.angles = [90, 90, 90, 90]
+        self.commands: list[str] = []
+        self._time_scale = time_scale
+        self._noise = list(noise or [])
+        self._legacy = legacy
+        self._telem_ms = 0
+        self._rx: queue.Queue[str] = queue.Queue()
+        self._decoder = LineDecoder()
+        self._encode = encode_ascii
+        self._tx = bytearray()
+        self._tx_ready = threading.Condition()
+        self._reply("READY")
+        threading.Thread(target=self._firmware, daemon=True).start()
+
+    # -- pyserial surface --
+    def write(self, data: bytes) -> int:
+        self._decoder.feed(data)
+        while (msg := self._decoder.next_message()) is not None:
+            for line in msg.split("\n"):
+                self._rx.put(line)
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._tx)
+
+    def read(self, size: int = 1) -> bytes:
+        with self._tx_ready:
+            self._tx_ready.wait_for(lambda: self._tx, timeout=self.timeout)
+            data = bytes(self._tx[:size])
+            del self._tx[:size]
+            return data
+
+    def readline(self) -> bytes:
+        with self._tx_ready:
+            self._tx_ready.wait_for(lambda: b"\n" in self._tx, timeout=self.timeout)
+            idx = self._tx.find(b"\n") + 1
+            data = bytes(self._tx[:idx]) if idx else b""
+            del self._tx[:idx]
+            return data
+
+    def close(self) -> None:
+        self._rx.put("")
+
+    # -- firmware --
+    def _reply(self, line: str) -> None:
+        with self._tx_ready:
+            self._tx += self._encode(line)
+            self._tx_ready.notify_all()
+
+    def _firmware(self) -> None:
+        while True:
+            line = self._rx.get()
+            if not line:
+                return
+            self.commands.append(line)
+            while self._noise:
+                self._reply(self._noise.pop(0))
+            if line.startswith("MOVE,"):
+                *target, speed = [int(v) for v in line[5:].split(",")]
+                self._reply("ACK," + ",".join(map(str, self.angles)))
+                if self._telem_ms:
+                    for t_ms in range(0, speed * 10, self._telem_ms):
+                        pose = predict_angle_at_time(self.angles, target, speed, t_ms)
+                        self._reply("POS," + ",".join(map(str, [t_ms, *pose])))
+                time.sleep(total_duration_ms(speed, self.angles, target) / 1000.0 * self._time_scale)
+                self.angles = [max(10, min(170, a)) for a in target]
+                self._reply("DONE")
+            elif line.startswith("TELEM,") and not self._legacy:
+                self._telem_ms = int(line[6:])
+                self._reply(line)
+            elif line.startswith("MOVESEQ,"):
+                speed, n = [int(v) for v in line[8:].split(",")]
+                waypoints = [[int(v) for v in self._rx.get().split(",")] for _ in range(n)]
+                self._reply("ACK," + ",".join(map(str, self.angles)))
+                executed = 0
+                for i, (*target, hold) in enumerate(waypoints):
+                    duration = total_duration_ms(speed, self.angles, target) + hold
+                    time.sleep(duration / 1000.0 * self._time_scale)
+                    self.angles = [max(10, min(170, a)) for a in target]
+                    self._reply(f"DONE,{i}," + ",".join(map(str, self.angles)))
+                    executed += 1
+                    if not self._rx.empty() and self._rx.queue[0] == "STOP":
+                        self._rx.get()
+                        break
+                self._reply(f"SEQDONE,{executed}")
+            elif line == "STOP":
+                pass
+            elif line.startswith("BAUD,") and not self._legacy:
+                self._reply(line)
+            elif line == "BIN" and not self._legacy:
+                self._reply("BIN")
+                self._encode = encode_binary
+                self._decoder = FrameDecoder()
+            elif line == "READ":
+                self._reply("ACK," + ",".join(map(str, self.angles)))
+            elif line == "PING":
+                self._reply("PONG")
+            else:
+                self._reply("ERR,UNKNOWN_CMD:" + line)
+
+
+async def _connect_fake(port: FakeArduino, **kwargs) -> SerialBridge:
+    bridge = SerialBridge(port="fake", **kwargs)
+    bridge._open = lambda: setattr(bridge, "_serial", port)  # type: ignore[method-assign]
+    await bridge.connect()
+    return bridge
 
 
 @pytest.fixture
@@ -59,3 +184,242 @@ async def test_move_convenience_blocks_full_duration():
     elapsed = time.monotonic() - start
     assert elapsed >= 1.5
     assert await bridge.read_angles() == [120, 60, 90, 45]
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_move_round_trip():
+    port = FakeArduino()
+    bridge = await _connect_fake(port)
+    try:
+        assert await bridge.move([120, 60, 90, 45], 10) == [90, 90, 90, 90]
+        assert await bridge.read_angles() == [120, 60, 90, 45]
+        assert await bridge.ping()
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_pipelines_read_and_ping_during_move():
+    """READ/PING sent mid-MOVE are answered after DONE without stealing it."""
+    port = FakeArduino(time_scale=0.1)
+    bridge = await _connect_fake(port)
+    try:
+        await bridge.send_move([100, 80, 90, 90], 10)
+        angles, healthy, _ = await asyncio.gather(
+            bridge.read_angles(), bridge.ping(), bridge.wait_move_done(),
+        )
+        assert angles == [100, 80, 90, 90]
+        assert healthy
+        assert port.commands == ["MOVE,100,80,90,90,10", "READ", "PING"]
+        assert not bridge._pending
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_waits_out_move_and_discards_late_replies(monkeypatch):
+    """A READ that outlives the MOVE gets extra time; one given up on
+    leaves its late ACK to a placeholder instead of the next command."""
+    monkeypatch.setattr("accessware.backend.serial_bridge.READ_TIMEOUT", 0.1)
+    port = FakeArduino(time_scale=1.0)
+    bridge = await _connect_fake(port)
+    try:
+        await bridge.send_move([100, 90, 90, 90], 10)  # ~300 ms
+        with pytest.raises(RuntimeError, match="in flight"):
+            await bridge.send_move([80, 90, 90, 90], 10)
+        assert await bridge.read_angles() == [100, 90, 90, 90]
+        await bridge.wait_move_done()
+
+        await bridge.send_move([110, 90, 90, 90], 10)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(bridge.read_angles(), 0.02)
+        await bridge.wait_move_done()
+        assert await bridge.send_move([120, 90, 90, 90], 10) == [110, 90, 90, 90]
+        await bridge.wait_move_done()
+        assert await bridge.read_angles() == [120, 90, 90, 90]
+        assert not bridge._pending
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_ignores_line_noise_and_reports_err():
+    port = FakeArduino(noise=["\x00garbage"])
+    bridge = await _connect_fake(port)
+    try:
+        assert await bridge.read_angles() == [90, 90, 90, 90]
+        with pytest.raises(ValueError, match="UNKNOWN_CMD"):
+            await bridge._request("BOGUS", "ACK", 1.0)
+        assert await bridge.ping()
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_move_sequence_chunks_upload():
+    port = FakeArduino(time_scale=0.001)
+    bridge = await _connect_fake(port)
+    steps = [([90 + (i % 2) * 10, 90, 90, 90], 0) for i in range(MAX_SEQ_STEPS + 3)]
+    try:
+        assert await bridge.send_sequence(steps, 5) == [90, 90, 90, 90]
+        events = []
+        while (event := await bridge.wait_step_done()) is not None:
+            events.append(event)
+        assert [i for i, _ in events] == list(range(len(steps)))
+        assert events[-1][1] == steps[-1][0]
+        assert sum(c.startswith("MOVESEQ,") for c in port.commands) == 2
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_stop_sequence():
+    port = FakeArduino(time_scale=0.05)
+    bridge = await _connect_fake(port)
+    try:
+        await bridge.send_sequence([([100, 90, 90, 90], 0), ([80, 90, 90, 90], 0), ([90, 90, 90, 90], 0)], 10)
+        assert await bridge.wait_step_done() == (0, [100, 90, 90, 90])
+        await bridge.stop_sequence()
+        remaining = []
+        while (event := await bridge.wait_step_done()) is not None:
+            remaining.append(event)
+        assert len(remaining) <= 1
+        assert await bridge.read_angles() != [90, 90, 90, 90]
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_move_sequence_rejects_hold_out_of_range():
+    bridge = MockSerialBridge()
+    await bridge.connect()
+    with pytest.raises(ValueError, match="hold_ms 70000"):
+        await bridge.send_sequence([([90, 90, 90, 90], 0), ([100, 90, 90, 90], 70000)], 1)
+
+
+@pytest.mark.asyncio
+async def test_mock_move_sequence_reports_each_step():
+    bridge = MockSerialBridge()
+    await bridge.connect()
+    start = await bridge.send_sequence([([100, 90, 90, 90], 0), ([80, 90, 90, 90], 50)], 1)
+    assert start == [90, 90, 90, 90]
+    assert await bridge.wait_step_done() == (0, [100, 90, 90, 90])
+    assert await bridge.wait_step_done() == (1, [80, 90, 90, 90])
+    assert await bridge.wait_step_done() is None
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_negotiates_baud_and_binary_framing():
+    port = FakeArduino()
+    bridge = await _connect_fake(port, fast_baud=115200, binary=True)
+    try:
+        assert port.baudrate == 115200
+        assert bridge.framing == "binary"
+        assert await bridge.move([120, 60, 90, 45], 10) == [90, 90, 90, 90]
+        assert await bridge.read_angles() == [120, 60, 90, 45]
+        assert await bridge.ping()
+        await bridge.send_sequence([([100, 90, 90, 90], 250), ([80, 90, 90, 90], 0)], 5)
+        assert await bridge.wait_step_done() == (0, [100, 90, 90, 90])
+        assert await bridge.wait_step_done() == (1, [80, 90, 90, 90])
+        assert await bridge.wait_step_done() is None
+        assert port.commands[:2] == ["BAUD,115200", "PING"]
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_falls_back_to_ascii_on_legacy_firmware():
+    port = FakeArduino(legacy=True)
+    bridge = await _connect_fake(port, fast_baud=115200, binary=True)
+    try:
+        assert port.baudrate == 9600
+        assert bridge.framing == "ascii"
+        assert await bridge.read_angles() == [90, 90, 90, 90]
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_mock_binary_framing_round_trips_protocol():
+    ascii_bridge = MockSerialBridge()
+    binary_bridge = MockSerialBridge(binary=True)
+    for bridge in (ascii_bridge, binary_bridge):
+        await bridge.connect()
+        assert await bridge.move([120, 60, 90, 45], 1) == [90, 90, 90, 90]
+        assert await bridge.read_angles() == [120, 60, 90, 45]
+        assert await bridge.ping()
+    assert binary_bridge.framing == "binary"
+    assert binary_bridge.bytes_tx + binary_bridge.bytes_rx < ascii_bridge.bytes_tx + ascii_bridge.bytes_rx
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_buffers_telemetry():
+    port = FakeArduino()
+    bridge = await _connect_fake(port, binary=True, fast_baud=115200)
+    try:
+        await bridge.set_telemetry(20)
+        await bridge.move([120, 90, 90, 90], 10)
+        samples = bridge.drain_telemetry()
+        assert [s.t_ms for s in samples] == [0, 20, 40, 60, 80]
+        assert samples[2].angles == [94, 90, 90, 90]
+        assert bridge.drain_telemetry() == []
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_caps_telemetry_to_the_link():
+    port = FakeArduino()
+    bridge = await _connect_fake(port)
+    try:
+        # A 26-byte POS line at 9600 baud ASCII, kept to half the link
+        await bridge.set_telemetry(10)
+        assert port.commands[-1] == "TELEM,55"
+        await bridge.set_telemetry(0)
+        assert port.commands[-1] == "TELEM,0"
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_bridge_unframeable_command_is_a_value_error():
+    port = FakeArduino()
+    bridge = await _connect_fake(port, binary=True)
+    try:
+        with pytest.raises(ValueError, match="u8"):
+            await bridge.send_move([300, 90, 90, 90], 10)
+        assert not bridge._pending  # nothing was sent, so no reply is awaited
+        assert await bridge.read_angles() == [90, 90, 90, 90]
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_mock_telemetry_follows_prediction():
+    bridge = MockSerialBridge(binary=True)
+    await bridge.connect()
+    await bridge.set_telemetry(10)
+    await bridge.move([100, 90, 90, 90], 1)
+    samples = bridge.drain_telemetry()
+    assert samples[0].t_ms == 0
+    assert samples[-1].angles == [100, 90, 90, 90]
+    assert all(s.angles == predict_angle_at_time([90, 90, 90, 90], [100, 90, 90, 90], 1, s.t_ms) for s in samples)
+
+
+@pytest.mark.asyncio
+async def test_mock_sequence_telemetry_follows_each_step():
+    clock = VirtualClock()
+    bridge = MockSerialBridge(clock=clock)
+    await bridge.connect()
+    await bridge.set_telemetry(100)
+    await bridge.send_sequence([([120, 90, 90, 90], 0), ([60, 90, 90, 90], 0)], 10)
+    while await bridge.wait_step_done() is not None:
+        pass
+    # Each step's samples restart at t=0 and run toward that step's own target
+    steps: list[list[int]] = []
+    for sample in bridge.drain_telemetry():
+        if sample.t_ms == 0:
+            steps.append([])
+        steps[-1].append(sample.angles[0])
+    assert [(s[0], s[-1]) for s in steps] == [(90, 120), (120, 60)]
+    assert steps[0] == sorted(steps[0]) and steps[1] == sorted(steps[1], reverse=True)
@@ -0,0 +1,164 @@
+"""Tests for the tick-accurate simulated arm."""
+
+import time
+
+import pytest
+
+from accessware.backend.bridge_pool import BridgePool
+from accessware.backend.framing import encode_ascii
+from accessware.backend.interpolation import total_duration_ms
+from accessware.backend.serial_bridge import SerialBridge
+from accessware.backend.simulator import SimConfig, SimulatedArm
+
+
+def _open(**config) -> SimulatedArm:
+    arm = SimulatedArm(SimConfig(**config))
+    assert arm.readline() == b"READY\n"
+    return arm
+
+
+def _command(arm: SimulatedArm, cmd: str, until: str) -> list[str]:
+    """Send *cmd* and collect reply lines up to one starting with *until*."""
+    arm.write(encode_ascii(cmd))
+    lines = []
+    while True:
+        line = arm.readline().decode().strip()
+        assert line, f"timed out waiting for {until} after {cmd}"
+        lines.append(line)
+        if line.startswith(until):
+            return lines
+
+
+def test_move_runs_firmware_ticks():
+    arm = _open(warp=1000)
+    _command(arm, "TELEM,1", "TELEM")
+    lines = _command(arm, "MOVE,120,60,90,180,5", "DONE")
+
+    assert lines[0] == "ACK,90,90,90,90"
+    for line in lines[1:-1]:
+        t, *angles = [int(v) for v in line[4:].split(",")]
+        ticks = t // 5 + 1  # POS is sent after the tick's write, before its delay
+        assert angles == [min(90 + ticks, 120), max(90 - ticks, 60), 90, min(90 + ticks, 170)]
+    # 80 degrees on the longest servo, plus the tick that sees all servos done
+    assert arm.stats["ticks"] == 81
+    assert _command(arm, "READ", "ACK") == ["ACK,120,60,90,170"]
+    assert arm.millis() >= 81 * 5 + 20 * 5
+
+
+def test_err_replies_match_sketch():
+    arm = _open(warp=1000)
+    assert _command(arm, "MOVE,1,2", "ERR") == ["ERR,BAD_MOVE_FORMAT"]
+    assert _command(arm, "\n".join(["MOVESEQ,5,40"] + ["90,90,90,90,0"] * 40), "ERR") == ["ERR,BAD_SEQ_LENGTH"]
+    assert _command(arm, "BAUD,1200", "ERR") == ["ERR,BAD_BAUD"]
+    assert _command(arm, "WAVE", "ERR") == ["ERR,UNKNOWN_CMD:WAVE"]
+
+
+def test_bad_sequence_upload_keeps_link_in_step():
+    arm = _open(warp=1000)
+    upload = "\n".join(["MOVESEQ,5,3", "100,90,90,90,0", "oops", "110,90,90,90,0"])
+    assert _command(arm, upload, "ERR") == ["ERR,BAD_SEQ_FORMAT"]
+    # The waypoint after the bad one was skipped, not run as a command
+    assert _command(arm, "PING", "PONG") == ["PONG"]
+
+
+def test_sequence_hold_beyond_int16():
+    arm = _open(warp=1000)
+    start = arm.millis()
+    lines = _command(arm, "\n".join(["MOVESEQ,1,2", "90,90,90,90,40000", "90,90,90,90,70000"]), "SEQDONE")
+    assert lines[-1] == "SEQDONE,2"
+    # 40000 is kept whole; 70000 is clamped to the u16 slot
+    assert arm.millis() - start >= 40000 + 0xFFFF
+
+
+def test_dropped_done():
+    arm = _open(warp=1000, drop_done=1.0)
+    arm.write(encode_ascii("MOVE,100,90,90,90,1"))
+    arm.write(encode_ascii("READ"))
+    assert arm.readline() == b"ACK,90,90,90,90\n"
+    assert arm.readline() == b"ACK,100,90,90,90\n"  # no DONE in between
+    assert arm.stats["dropped_dones"] == 1
+
+
+def test_line_noise_corrupts_messages():
+    arm = SimulatedArm(SimConfig(line_noise=1.0, seed=3))
+    assert arm.readline() != b"READY\n"
+    arm.write(encode_ascii("PING"))
+    assert arm.readline() != b"PONG\n"
+    assert arm.stats["corrupted"] == 3  # READY, the command and its reply
+
+
+def test_backlash_and_servo_error():
+    arm = _open(warp=1000, backlash_deg=3)
+    _command(arm, "MOVE,120,90,90,90,1", "DONE")
+    assert _command(arm, "READ", "ACK") == ["ACK,117,90,90,90"]
+    _command(arm, "MOVE,90,90,90,90,1", "DONE")
+    assert _command(arm, "READ", "ACK") == ["ACK,93,90,90,90"]
+
+    arm = _open(servo_error=(0, 0, 0, 2), seed=1)
+    reads = [_command(arm, "READ", "ACK")[0] for _ in range(30)]
+    fourth = {int(r.split(",")[4]) for r in reads}
+    assert {r.rsplit(",", 1)[0] for r in reads} == {"ACK,90,90,90"}
+    assert len(fourth) > 1 and fourth <= set(range(88, 93))
+
+
+def test_config_url_round_trip():
+    config = SimConfig(latency_ms=2, servo_error=(0, 1, 0, 2), warp=50, seed=7)
+    url = config.url("arm-a")
+    assert url.startswith("sim://arm-a?")
+    assert SimConfig.from_url(url) == config
+    assert SimConfig.from_url("sim://x?error=2").servo_error == (2, 2, 2, 2)
+    with pytest.raises(ValueError, match="Unknown simulator option"):
+        SimConfig.from_url("sim://x?speed=3")
+
+
+@pytest.mark.asyncio
+async def test_bridge_negotiates_baud_and_binary():
+    bridge = SerialBridge("sim://arm?warp=100", fast_baud=115200, binary=True)
+    await bridge.connect()
+    try:
+        assert bridge.framing == "binary"
+        assert bridge.bridge_type == "simulated"
+        assert bridge._serial.baudrate == 115200
+        assert await bridge.move([100, 80, 90, 90], 2) == [90, 90, 90, 90]
+        assert await bridge.read_angles() == [100, 80, 90, 90]
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_time_warp_compresses_fatigue_runs():
+    bridge = SerialBridge("sim://fatigue?warp=2000")
+    await bridge.connect()
+    try:
+        start = time.monotonic()
+        steps = [([10, 170, 10, 170], 0), ([170, 10, 170, 10], 0)] * 10
+        await bridge.send_sequence(steps, 50)
+        ends = [await bridge.wait_step_done() for _ in steps]
+        assert await bridge.wait_step_done() is None
+        elapsed = time.monotonic() - start
+    finally:
+        await bridge.disconnect()
+
+    assert ends[-1] == (19, [170, 10, 170, 10])
+    virtual_ms = bridge._serial.millis()
+    assert virtual_ms >= (len(steps) - 1) * total_duration_ms(50, [10] * 4, [170] * 4)  # ~3 minutes
+    assert elapsed < virtual_ms / 1000 / 20
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_tests_on_simulated_arms():
+    pool = await BridgePool.simulated(2, SimConfig(warp=20))
+    test = {
+        "name": "sim-test",
+        "speed": 1,
+        "repeat_count": 2,
+        "steps": [{"angles": [100, 80, 90, 90], "hold_ms": 0, "label": "step1"}],
+    }
+    try:
+        results = await pool.run_many([test, test])
+    finally:
+        await pool.close()
+
+    assert [a["bridge_type"] for a in pool.status()] == ["simulated", "simulated"]
+    for runs in results:
+        assert [r.steps[0].actual_end_angles for r in runs] == [[100, 80, 90, 90]] * 2
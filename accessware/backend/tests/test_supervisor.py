@@ -0,0 +1,247 @@
+"""Tests for the reconnecting SupervisedBridge, against a pty stand-in."""
+
+import asyncio
+import os
+import select
+import threading
+import time
+
+import pytest
+
+from accessware.backend.bridge_pool import BridgePool
+from accessware.backend.interpolation import total_duration_ms
+from accessware.backend.serial_bridge import SerialBridge
+from accessware.backend.supervisor import SupervisedBridge
+from accessware.backend.test_runner import TestRunner
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs a pseudo-terminal")
+
+
+class _Link:
+    """One pty pair running the firmware loop on its master side."""
+
+    def __init__(self, arm: "PtyArduino") -> None:
+        self.arm = arm
+        self.master, slave = os.openpty()
+        self.path = os.ttyname(slave)
+        os.close(slave)  # the master sees a hangup until the host opens the port
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _write(self, line: str) -> None:
+        os.write(self.master, (line + "\n").encode())
+
+    def _run(self) -> None:
+        try:
+            # Like the Nano, boot (and send READY) once the host opens the port;
+            # wait out pyserial's input flush on open.
+            poller = select.poll()
+            poller.register(self.master, select.POLLHUP)
+            while not self.stop.is_set() and poller.poll(0):
+                time.sleep(0.005)
+            if self.stop.wait(0.05):
+                return
+            self._write("READY")
+            buffer = b""
+            while not self.stop.is_set():
+                if not select.select([self.master], [], [], 0.01)[0]:
+                    continue
+                buffer += os.read(self.master, 1024)
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    self.arm.handle(self, line.decode().strip())
+        except OSError:
+            pass
+        finally:
+            os.close(self.master)
+
+
+class PtyArduino:
+    """serial_control.ino stand-in on a pseudo-terminal.
+
+    :meth:`hiccup` drops the link mid-command, like a CH340 falling off the
+    bus, and re-enumerates it as a new pty with the firmware freshly booted
+    (servos back at 90).
+    """
+
+    def __init__(self, time_scale: float = 1.0) -> None:
+        self.angles = [90, 90, 90, 90]
+        self.time_scale = time_scale
+        self.commands: list[list[str]] = []  # per link
+        self._seq_lines: list[str] = []
+        self.link = self._boot()
+
+    def _boot(self) -> _Link:
+        self.angles = [90, 90, 90, 90]
+        self.commands.append([])
+        return _Link(self)
+
+    @property
+    def path(self) -> str:
+        return self.link.path
+
+    def hiccup(self) -> None:
+        old, self.link = self.link, self._boot()
+        old.stop.set()
+        old.thread.join()
+
+    def close(self) -> None:
+        self.link.stop.set()
+        self.link.thread.join()
+
+    def _move(self, link: _Link, target: list[int], speed: int, hold: int = 0) -> bool:
+        """Run a move; False if the link died during it."""
+        duration = (total_duration_ms(speed, self.angles, target) + hold) / 1000.0
+        if link.stop.wait(duration * self.time_scale):
+            return False
+        self.angles = [max(10, min(170, a)) for a in target]
+        return True
+
+    def handle(self, link: _Link, line: str) -> None:
+        if self._seq_lines:
+            self._seq_lines.append(line)
+            header, *waypoints = self._seq_lines
+            speed, n = [int(v) for v in header[8:].split(",")]
+            if len(waypoints) < n:
+                return
+            self._seq_lines = []
+            self.commands[-1].append(header)
+            link._write("ACK," + ",".join(map(str, self.angles)))
+            for i, waypoint in enumerate(waypoints):
+                *target, hold = [int(v) for v in waypoint.split(",")]
+                if not self._move(link, target, speed, hold):
+                    return
+                link._write(f"DONE,{i}," + ",".join(map(str, self.angles)))
+            link._write(f"SEQDONE,{n}")
+            return
+        if line.startswith("MOVESEQ,"):
+            self._seq_lines = [line]
+            return
+        self.commands[-1].append(line)
+        if line.startswith("MOVE,"):
+            *target, speed = [int(v) for v in line[5:].split(",")]
+            link._write("ACK," + ",".join(map(str, self.angles)))
+            if self._move(link, target, speed):
+                link._write("DONE")
+        elif line == "READ":
+            link._write("ACK," + ",".join(map(str, self.angles)))
+        elif line == "PING":
+            link._write("PONG")
+        else:
+            link._write("ERR,UNKNOWN_CMD:" + line)
+
+
+@pytest.fixture
+def arm():
+    stand_in = PtyArduino()
+    yield stand_in
+    stand_in.close()
+
+
+async def _supervised(arm: PtyArduino) -> SupervisedBridge:
+    # The stand-in re-enumerates under a new name, so build each bridge on the current one.
+    bridge = SupervisedBridge(lambda: SerialBridge(arm.path), backoff_s=0.05, recover_timeout_s=10)
+    await bridge.connect()
+    return bridge
+
+
+def _hiccup_after(arm: PtyArduino, delay: float) -> None:
+    threading.Timer(delay, arm.hiccup).start()
+
+
+TEST = {
+    "name": "hiccup",
+    "speed": 2,
+    "steps": [
+        {"angles": [130, 90, 90, 90], "hold_ms": 0, "label": "a"},
+        {"angles": [130, 50, 90, 90], "hold_ms": 0, "label": "b"},
+        {"angles": [130, 50, 130, 90], "hold_ms": 0, "label": "c"},
+        {"angles": [90, 90, 90, 90], "hold_ms": 0, "label": "d"},
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_runner_resumes_move_after_link_drop(arm):
+    bridge = await _supervised(arm)
+    interrupted = asyncio.Event()
+
+    async def on_state(msg):
+        if msg.get("step") == 1 and msg["type"] == "state" and not interrupted.is_set():
+            interrupted.set()
+            _hiccup_after(arm, 0.02)  # during step b's move
+
+    try:
+        [result] = await TestRunner(bridge, on_state).run_test(TEST)
+    finally:
+        await bridge.disconnect()
+
+    assert bridge.reconnects == 1
+    assert bridge.resynced_angles == [90, 90, 90, 90]  # the Nano rebooted
+    assert [s.actual_end_angles for s in result.steps] == [s["angles"] for s in TEST["steps"]]
+    # After the resync READ, the arm was put back on step b's target
+    assert arm.commands[1][:2] == ["READ", "MOVE,130,50,90,90,2"]
+
+
+@pytest.mark.asyncio
+async def test_sequence_resumes_after_first_unfinished_step(arm):
+    bridge = await _supervised(arm)
+    steps = [(s["angles"], 0) for s in TEST["steps"]]
+    try:
+        await bridge.send_sequence(steps, 2)
+        first = await bridge.wait_step_done()
+        arm.hiccup()
+        rest = []
+        while (event := await bridge.wait_step_done()) is not None:
+            rest.append(event)
+    finally:
+        await bridge.disconnect()
+
+    assert first == (0, [130, 90, 90, 90])
+    assert rest == [(i, s["angles"]) for i, s in enumerate(TEST["steps"]) if i > 0]
+    # Resync, restore step a's pose, then upload steps b-d only
+    assert arm.commands[1] == ["READ", "MOVE,130,90,90,90,2", "MOVESEQ,2,3"]
+
+
+@pytest.mark.asyncio
+async def test_ping_does_not_wait_for_reconnect(arm):
+    bridge = await _supervised(arm)
+    try:
+        assert await bridge.ping()
+        arm.hiccup()
+        await asyncio.sleep(0.05)  # reader notices the hangup
+        start = time.monotonic()
+        assert not await bridge.ping()
+        assert time.monotonic() - start < 0.5
+        for _ in range(100):
+            if bridge.connected:
+                break
+            await asyncio.sleep(0.05)
+        assert bridge.connected and await bridge.ping()
+        assert await bridge.read_angles() == [90, 90, 90, 90]
+    finally:
+        await bridge.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pool_waiter_is_woken_when_the_arm_is_back(arm):
+    bridge = await _supervised(arm)
+    pool = BridgePool({"arm": bridge})
+    try:
+        arm.hiccup()
+        for _ in range(100):  # the reader notices the hangup and reconnecting starts
+            if bridge.reconnecting:
+                break
+            await asyncio.sleep(0.01)
+        assert not bridge.connected
+
+        async def lease() -> str:
+            async with pool.lease() as leased:
+                return leased.arm_id
+
+        # Nothing else releases an arm: only the reconnect can wake the waiter.
+        assert await asyncio.wait_for(lease(), 5) == "arm"
+        assert bridge.reconnects == 1
+    finally:
+        await bridge.disconnect()
@@ -0,0 +1,63 @@
+"""Tests for WebSocket wire formats."""
+
+import json
+import logging
+
+from starlette.testclient import TestClient
+
+from accessware.backend import wire
+from accessware.backend.hub import Event
+from accessware.backend.main import app
+
+PREDICTED = {
+    "type": "predicted_angles",
+    "angles": [90, 100, 10, 170],
+    "elapsed_ms": 150.0,
+    "step": 3,
+    "repeat": 1,
+    "job_id": "3f2a9c0e1b7d",
+}
+
+
+def test_binary_predicted_frame_round_trip():
+    frame = wire.pack_predicted(PREDICTED)
+    assert len(frame) == 15 + 12
+    assert wire.unpack_predicted(frame) == {**PREDICTED, "elapsed_ms": 150}
+
+
+def test_event_encodes_once_per_format():
+    binary = wire.FORMATS["binary"]
+    event = Event(PREDICTED)
+    assert event.encoded(binary) is event.encoded(binary)
+    assert event.encoded(wire.JSON) is event.text
+    assert json.loads(event.text) == PREDICTED
+    # Only predicted_angles are packed; everything else stays JSON text
+    assert Event({"type": "step_complete"}).encoded(binary) == '{"type":"step_complete"}'
+
+
+def test_stdlib_fallback_matches(monkeypatch):
+    fast = wire.dumps(PREDICTED)
+    monkeypatch.setattr(wire, "orjson", None)
+    assert wire.dumps(PREDICTED) == fast
+    assert wire.loads(fast) == PREDICTED
+
+
+def test_sampled_log(caplog):
+    log = wire.SampledLog(logging.getLogger("accessware.wire.test"), every=10)
+    with caplog.at_level(logging.INFO, logger="accessware.wire.test"):
+        for i in range(25):
+            log("msg %d", i)
+    assert not caplog.records  # debug off: nothing formatted or counted
+    with caplog.at_level(logging.DEBUG, logger="accessware.wire.test"):
+        for i in range(25):
+            log("msg %d", i)
+    assert [r.getMessage() for r in caplog.records] == ["msg 0", "msg 10", "msg 20"]
+
+
+def test_websocket_format_selection():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws?format=binary") as ws:
+            ws.send_json({"type": "read_angles"})
+            assert ws.receive_json()["type"] == "angles"  # non-stream messages stay JSON
+        with client.websocket_connect("/ws?format=bogus") as ws:
+            assert ws.receive_json()["type"] == "error"
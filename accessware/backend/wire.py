@@ -0,0 +1,118 @@
+"""WebSocket wire formats and serialization.
+
+JSON goes through orjson when it is installed (falling back to the
+stdlib). A client can additionally pick a per-connection format (``/ws?
+format=...``) in which the high-rate ``predicted_angles`` messages are
+sent as binary WebSocket frames instead of JSON text:
+
+- ``binary``: fixed struct frame, no dependency (see :func:`pack_predicted`).
+- ``msgpack``: MessagePack of the full message, if ``msgpack`` is installed.
+
+All other messages stay JSON text in every format.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+except ImportError:
+    msgpack = None
+
+WIRE_LOG_EVERY = int(os.environ.get("ACCESSWARE_WIRE_LOG_EVERY", "100"))
+"""Log one in this many WebSocket messages on the ``accessware.wire`` debug channel."""
+
+
+def dumps(msg: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(msg, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(msg, separators=(",", ":"))
+
+
+def loads(raw: str | bytes) -> Any:
+    """Parse JSON; raises ``ValueError`` (like ``json.JSONDecodeError``) on bad input."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# ---------------------------------------------------------------------------
+# Binary predicted_angles frame
+# ---------------------------------------------------------------------------
+
+PREDICTED_FRAME = 0x01
+# type, 4 angles, elapsed ms, step, repeat; followed by the ASCII job id
+_PREDICTED = struct.Struct("<B4BIIH")
+
+
+def pack_predicted(msg: dict[str, Any]) -> bytes:
+    return _PREDICTED.pack(
+        PREDICTED_FRAME, *msg["angles"], round(msg["elapsed_ms"]), msg["step"], msg["repeat"],
+    ) + msg.get("job_id", "").encode("ascii")
+
+
+def unpack_predicted(data: bytes) -> dict[str, Any]:
+    """Inverse of :func:`pack_predicted` (reference for clients and tests)."""
+    type_, a1, a2, a3, a4, elapsed, step, repeat = _PREDICTED.unpack_from(data)
+    if type_ != PREDICTED_FRAME:
+        raise ValueError(f"Not a predicted_angles frame: 0x{type_:02x}")
+    msg: dict[str, Any] = {
+        "type": "predicted_angles",
+        "angles": [a1, a2, a3, a4],
+        "elapsed_ms": elapsed,
+        "step": step,
+        "repeat": repeat,
+    }
+    job_id = data[_PREDICTED.size:].decode("ascii")
+    if job_id:
+        msg["job_id"] = job_id
+    return msg
+
+
+@dataclass(frozen=True)
+class WireFormat:
+    """Which message types a format sends as binary frames, and how."""
+
+    name: str
+    binary_types: frozenset[str] = frozenset()
+    pack: Callable[[dict[str, Any]], bytes] | None = None
+
+
+FORMATS: dict[str, WireFormat] = {
+    "json": WireFormat("json"),
+    "binary": WireFormat("binary", frozenset({"predicted_angles"}), pack_predicted),
+}
+if msgpack is not None:
+    FORMATS["msgpack"] = WireFormat("msgpack", frozenset({"predicted_angles"}), msgpack.packb)
+
+JSON = FORMATS["json"]
+
+
+class SampledLog:
+    """Debug logging of every *every*-th call, free when debug is off."""
+
+    def __init__(self, logger: logging.Logger, every: int = WIRE_LOG_EVERY) -> None:
+        self._logger = logger
+        self._every = max(1, every)
+        self._count = 0
+
+    def __call__(self, fmt: str, *args: Any) -> None:
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        self._count += 1
+        if self._count % self._every == 1 or self._every == 1:
+            self._logger.debug(fmt, *args)
+
+
+wire_log = SampledLog(logging.getLogger("accessware.wire"))